@@ -2,9 +2,11 @@ import logging
 import asyncio
 import os
 import json
-from typing import List, Dict, Any, Union
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Tuple, Union
 
-import librosa
+import numpy as np
 try:
     import openvino_genai
 except ImportError:
@@ -14,20 +16,31 @@ from langchain_core.messages import BaseMessage
 
 # App imports
 from .base_llm import BaseLLMWrapper
-from .config import get_model_path
+from .config import get_model_path, ASR_NUM_WORKERS, ASR_WINDOW_SECONDS
 from .utils.ffmpeg_utils import ensure_ffmpeg_in_path
+from .utils.audio_source import decode_audio, SAMPLE_RATE
+from .utils.audio_features import split_on_silence
 
 class ASRWrapper(BaseLLMWrapper):
     """
     Automatic Speech Recognition wrapper using OpenVINO GenAI.
+
+    Long recordings are split into windows at silence boundaries and
+    transcribed on a pool of WhisperPipeline instances, one per worker,
+    each pinned to its share of the CPU cores.
     """
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, num_workers: int = ASR_NUM_WORKERS, window_seconds: float = ASR_WINDOW_SECONDS, **kwargs):
         self.logger = logging.getLogger(self.__class__.__name__)
 
         self.model_path = get_model_path("audio")
         self.device = "CPU"
         self.pipeline = None
 
+        # Parallel transcription settings (0 workers = size to available cores)
+        self.num_workers = num_workers if num_workers > 0 else self._default_num_workers()
+        self.window_seconds = window_seconds
+        self._pipelines: "queue.Queue" = queue.Queue()
+
         if openvino_genai is None:
             raise ImportError("openvino-genai is not installed. Please install it to use ASRWrapper.")
 
@@ -54,10 +67,21 @@ class ASRWrapper(BaseLLMWrapper):
                  self.logger.error(f"Failed to validate config.json: {e}")
                  raise
 
-        # Load Pipeline
+        # Load Pipeline(s)
+        # With several workers, split the cores between pipelines to avoid oversubscription
+        properties = {}
+        if self.num_workers > 1:
+            properties["INFERENCE_NUM_THREADS"] = max(1, (os.cpu_count() or 1) // self.num_workers)
+
         try:
-            self.pipeline = openvino_genai.WhisperPipeline(self.model_path, device=self.device)
-            self.logger.info(f"ASR model loaded from {self.model_path}.")
+            pipelines = [
+                openvino_genai.WhisperPipeline(self.model_path, device=self.device, **properties)
+                for _ in range(self.num_workers)
+            ]
+            for pipeline in pipelines:
+                self._pipelines.put(pipeline)
+            self.pipeline = pipelines[0]
+            self.logger.info(f"ASR model loaded from {self.model_path} ({self.num_workers} pipeline(s)).")
         except Exception as e:
             self.logger.error(f"Failed to load OpenVINO GenAI WhisperPipeline: {e}")
             raise
@@ -65,6 +89,12 @@ class ASRWrapper(BaseLLMWrapper):
     def unload_model(self):
         self.logger.info("Unloading ASR model")
         self.pipeline = None
+        self._pipelines = queue.Queue()
+
+    @staticmethod
+    def _default_num_workers() -> int:
+        """One pipeline per 4 cores, capped at 4 (each Whisper instance holds its own weights)."""
+        return max(1, min(4, (os.cpu_count() or 1) // 4))
 
     def generate(self, messages: List[BaseMessage]) -> str:
         """
@@ -72,9 +102,15 @@ class ASRWrapper(BaseLLMWrapper):
         """
         raise NotImplementedError("ASRWrapper does not support generate(). Use transcribe() instead.")
 
-    def transcribe(self, audio_path: str) -> Dict[str, Any]:
+    def transcribe(self, audio: Union[str, np.ndarray], parallel: bool = True) -> Dict[str, Any]:
         """
-        Transcribe audio file using OpenVINO GenAI.
+        Transcribe audio using OpenVINO GenAI.
+
+        Args:
+            audio: Path to an audio/video file, or 16 kHz mono float32 samples
+                   (as returned by utils.audio_source.decode_audio)
+            parallel: Split into silence-bounded windows and transcribe them on the
+                      pipeline pool. False sends the whole signal to one generate() call.
         
         Returns:
             dict with "full_transcription" (str) and "chunks" (list of {start, end, text}).
@@ -86,39 +122,110 @@ class ASRWrapper(BaseLLMWrapper):
         if self.pipeline is None:
             raise RuntimeError("ASR pipeline not initialized.")
 
-        self.logger.info(f"Transcribing {audio_path}...")
+        if isinstance(audio, str):
+            self.logger.info(f"Transcribing {audio}...")
+            # Decode via ffmpeg pipe (OpenVINO GenAI expects raw 16 kHz samples)
+            try:
+                raw_speech = decode_audio(audio, sample_rate=SAMPLE_RATE)
+            except Exception as e:
+                self.logger.error(f"Failed to load audio file {audio}: {e}")
+                raise ValueError(f"Failed to load audio file {audio}: {e}")
+        else:
+            raw_speech = audio
+            self.logger.info(f"Transcribing {len(raw_speech) / SAMPLE_RATE:.2f}s of decoded audio...")
+
+        if not parallel or len(raw_speech) <= self.window_seconds * SAMPLE_RATE:
+            text, chunks = self._transcribe_window(raw_speech, 0.0)
+            return {"full_transcription": text, "chunks": chunks}
+
+        texts = []
+        chunks = []
+        for window in self.iter_windows(raw_speech):
+            if window["text"]:
+                texts.append(window["text"])
+            chunks.extend(window["chunks"])
+        return {"full_transcription": " ".join(texts), "chunks": chunks}
+
+    def iter_windows(self, raw_speech: np.ndarray, offset: float = 0.0) -> Iterator[Dict[str, Any]]:
+        """
+        Transcribe silence-bounded windows on the pipeline pool, yielding each
+        window as soon as it and all earlier windows are done.
+
+        Windows are yielded strictly in time order, so a caller can commit
+        them incrementally and use the last window's end as a resume point.
+
+        Args:
+            raw_speech: 16 kHz mono float32 samples
+            offset: Time in seconds of raw_speech[0] within the full media
+                    (used when resuming part-way through a file)
 
-        # Load audio using librosa (OpenVINO GenAI expects raw audio samples)
+        Yields:
+            {"start", "end", "text", "chunks"} per window, in absolute time
+        """
+        if self.pipeline is None:
+            raise RuntimeError("ASR pipeline not initialized.")
+
+        windows = split_on_silence(raw_speech, SAMPLE_RATE, window_seconds=self.window_seconds)
+        self.logger.info(f"Transcribing {len(windows)} window(s) on {self.num_workers} pipeline(s)...")
+
+        # Results are collected in window order, so output does not depend on scheduling
+        pool = ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="asr-window")
         try:
-            raw_speech, _ = librosa.load(audio_path, sr=16000)
-        except Exception as e:
-            self.logger.error(f"Failed to load audio file {audio_path}: {e}")
-            raise ValueError(f"Failed to load audio file {audio_path}: {e}")
+            futures = [
+                pool.submit(self._transcribe_window, raw_speech[start:end], offset + start / SAMPLE_RATE)
+                for start, end in windows
+            ]
+            for (start, end), future in zip(windows, futures):
+                text, chunks = future.result()
+                yield {
+                    "start": offset + start / SAMPLE_RATE,
+                    "end": offset + end / SAMPLE_RATE,
+                    "text": text,
+                    "chunks": chunks,
+                }
+        finally:
+            # Stop queued windows if the caller stops early (error / cancellation)
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _transcribe_window(self, samples: np.ndarray, offset: float) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Transcribe one window on a pooled pipeline.
+
+        Args:
+            samples: 16 kHz mono float32 samples for this window
+            offset: Window start in seconds, added to every chunk timestamp
 
+        Returns:
+            (window text, list of {start, end, text} in absolute time)
+        """
+        pipeline = self._pipelines.get()
         try:
-            result = self.pipeline.generate(
-                raw_speech,
+            result = pipeline.generate(
+                samples,
                 task="transcribe",
                 return_timestamps=True
             )
-
-            formatted_chunks = []
-            for chunk in result.chunks:
-                c_start = getattr(chunk, "start_ts", 0.0)
-                c_end = getattr(chunk, "end_ts", 0.0)
-                c_text = getattr(chunk, "text", "")
-
-                formatted_chunks.append({
-                    "start": c_start,
-                    "end": c_end,
-                    "text": c_text
-                })
-
-            return {
-                "full_transcription": " ".join(result.texts),
-                "chunks": formatted_chunks
-            }
-
         except Exception as e:
             self.logger.error(f"Transcription failed: {e}")
             raise
+        finally:
+            self._pipelines.put(pipeline)
+
+        window_end = offset + len(samples) / SAMPLE_RATE
+        formatted_chunks = []
+        for chunk in result.chunks:
+            c_start = getattr(chunk, "start_ts", 0.0)
+            c_end = getattr(chunk, "end_ts", 0.0)
+            c_text = getattr(chunk, "text", "")
+
+            # Unterminated final chunk: close it at the window boundary
+            start = offset + c_start
+            end = offset + c_end if c_end >= c_start else window_end
+
+            formatted_chunks.append({
+                "start": start,
+                "end": end,
+                "text": c_text
+            })
+
+        return " ".join(result.texts).strip(), formatted_chunks
@@ -26,6 +26,24 @@ DEFAULT_CHAT_DB_DIR = os.path.join(os.path.expanduser("~"), ".cache", "obsidian"
 CHAT_DB_DIR = os.getenv("OBSIDIAN_CHAT_DB_DIR", DEFAULT_CHAT_DB_DIR)
 CHAT_DB_PATH = os.path.join(CHAT_DB_DIR, "chat_history.db")
 
+# Media fingerprint index (avoids re-hashing uploads on every turn)
+MEDIA_INDEX_DB_PATH = os.path.join(CHAT_DB_DIR, "media_index.db")
+
+# Per-media ingestion progress (ASR/VLM high-water marks for resumable ingestion)
+INGEST_DB_PATH = os.path.join(CHAT_DB_DIR, "ingest_progress.db")
+
+# Perceptual-hash index of VLM descriptions (reused across visually identical chunks)
+VISUAL_INDEX_DB_PATH = os.path.join(CHAT_DB_DIR, "visual_index.db")
+
+# Exact-match cache of VLM descriptions (frames, prompt, ASR context, model, token budget)
+VLM_DESCRIPTION_CACHE_DB_PATH = os.path.join(CHAT_DB_DIR, "vlm_descriptions.db")
+
+# Fingerprint mode used to derive media_id:
+# - "sha256": full-file SHA-256 (default, compatible with existing caches)
+# - "tree":   parallel chunked tree hash (faster first pass on very large files)
+# - "quick":  size + sampled blocks, full digest verified in the background
+MEDIA_ID_MODE = os.getenv("OBSIDIAN_MEDIA_ID_MODE", "sha256")
+
 # Ensure chat db directory exists
 if CHAT_DB_DIR:
     try:
@@ -33,6 +51,74 @@ if CHAT_DB_DIR:
     except Exception as e:
         logger.warning(f"Could not create CHAT_DB_DIR at {CHAT_DB_DIR}: {e}")
 
+# Parallel ASR: number of WhisperPipeline instances (0 = size to available cores)
+# and target window length; windows are cut at the quietest point near each boundary
+ASR_NUM_WORKERS = int(os.getenv("OBSIDIAN_ASR_WORKERS", "0"))
+ASR_WINDOW_SECONDS = float(os.getenv("OBSIDIAN_ASR_WINDOW_SECONDS", "60"))
+
+# Energy/flatness VAD before Whisper: skips long silences (set to 0 to disable)
+ASR_VAD_ENABLED = os.getenv("OBSIDIAN_ASR_VAD", "1") != "0"
+
+# Signal-level pre-classifier: skip Whisper on clearly silent / music / noise audio
+ASR_PRECLASSIFIER_ENABLED = os.getenv("OBSIDIAN_ASR_PRECLASSIFIER", "1") != "0"
+
+# Derived-artifact cache (decoded audio, sampled frames), keyed by media_id + stage
+# parameters; least-recently-used artifacts are evicted beyond the byte budget
+DEFAULT_ARTIFACT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "obsidian", "artifacts")
+ARTIFACT_CACHE_DIR = os.getenv("OBSIDIAN_ARTIFACT_CACHE_DIR", DEFAULT_ARTIFACT_CACHE_DIR)
+ARTIFACT_CACHE_MAX_BYTES = int(float(os.getenv("OBSIDIAN_ARTIFACT_CACHE_MAX_GB", "4")) * 1024 ** 3)
+
+# Persist sampled frames as JPEG in the artifact store (frames are otherwise
+# handed to the VLM in memory; set to 1 to reuse them across runs)
+FRAME_CACHE_ENABLED = os.getenv("OBSIDIAN_FRAME_CACHE", "0") == "1"
+
+# Keep only visually distinct keyframes per VLM chunk (set to 0 to send every sampled frame)
+VLM_KEYFRAMES_ENABLED = os.getenv("OBSIDIAN_VLM_KEYFRAMES", "1") != "0"
+
+# Reuse VLM descriptions for chunks whose frames match an earlier chunk (any media)
+# within this many bits of a 256-bit dHash (0-31); set OBSIDIAN_VLM_REUSE=0 to disable
+VLM_REUSE_ENABLED = os.getenv("OBSIDIAN_VLM_REUSE", "1") != "0"
+VLM_REUSE_MAX_DISTANCE = int(os.getenv("OBSIDIAN_VLM_REUSE_DISTANCE", "1"))
+# Indexed chunk descriptions kept for reuse; least-recently-used ones are evicted beyond this
+VLM_REUSE_MAX_ENTRIES = int(os.getenv("OBSIDIAN_VLM_REUSE_MAX_ENTRIES", "50000"))
+
+# Persist generated descriptions so re-ingesting unchanged chunks skips the
+# model entirely (set OBSIDIAN_VLM_DESCRIPTION_CACHE=0 to disable)
+VLM_DESCRIPTION_CACHE_ENABLED = os.getenv("OBSIDIAN_VLM_DESCRIPTION_CACHE", "1") != "0"
+
+# Chunks decoded / prepared ahead of VLM inference (bounded queue per stage);
+# 0 runs decoding, preparation and inference strictly one after another
+VLM_PREFETCH_CHUNKS = int(os.getenv("OBSIDIAN_VLM_PREFETCH", "2"))
+
+# Chunks described per VLM generate() call (padded batch, one prompt per chunk);
+# larger batches raise throughput on many-core CPUs at the cost of peak memory
+VLM_BATCH_SIZE = int(os.getenv("OBSIDIAN_VLM_BATCH_SIZE", "1"))
+
+# Send each chunk's frames through SmolVLM2's video input path (one tile per
+# frame) instead of as independent images; set OBSIDIAN_VLM_CLIP=1 to enable
+VLM_CLIP_INPUT_ENABLED = os.getenv("OBSIDIAN_VLM_CLIP", "0") == "1"
+
+# VLM runtime: "optimum" (optimum-intel + transformers processor) or "genai"
+# (openvino_genai.VLMPipeline, needs a local OpenVINO export; falls back to optimum)
+VLM_BACKEND = os.getenv("OBSIDIAN_VLM_BACKEND", "optimum")
+
+# Default VLM profile (detail vs throughput): "quality" (processor defaults),
+# "balanced" (fewer image tiles) or "fast" (one tile per frame, shorter descriptions);
+# a request can pick a different profile per ingestion
+VLM_PROFILE = os.getenv("OBSIDIAN_VLM_PROFILE", "quality")
+
+# Fused VLM chunks are committed to the vector store every N described chunks,
+# so an interrupted ingestion resumes with only the missing chunks
+VLM_COMMIT_EVERY = int(os.getenv("OBSIDIAN_VLM_COMMIT_EVERY", "1"))
+
+# A chunk that fails this many ingestion runs is given up on (recorded in the
+# VLM progress), so the stage can complete without it instead of re-running
+VLM_MAX_CHUNK_ATTEMPTS = int(os.getenv("OBSIDIAN_VLM_MAX_CHUNK_ATTEMPTS", "3"))
+
+# Vision-encoder outputs kept per ingestion (image tiles) so overlapping chunks
+# skip re-encoding shared frames; 0 disables the cache
+VLM_ENCODER_CACHE_TILES = int(os.getenv("OBSIDIAN_VLM_ENCODER_CACHE_TILES", "128"))
+
 # Cross-Platform Note:
 # To make this fully cross-platform (Linux/Windows), we rely on os.path.join and os.path.expanduser.
 # Path separators are handled automatically by Python.
@@ -6,7 +6,7 @@ from langchain_core.runnables import RunnableConfig
 
 from .base_node import BaseNode
 from ..state import AgentState
-from ..vector_store import VectorStore
+from ..vector_store import get_vector_store
 from ..tools import audio_tools
 
 # Intent configuration - defines actions for each intent
@@ -59,8 +59,8 @@ class ActionExecutorNode(BaseNode):
     def __init__(self):
         super().__init__(model=None, name="action_executor")
         # Priority: multimodal (audio+visual) > asr-only
-        self.multimodal_store = VectorStore(collection_name="multimodal_chunks")
-        self.asr_store = VectorStore(collection_name="asr_segments")
+        self.multimodal_store = get_vector_store("multimodal_chunks")
+        self.asr_store = get_vector_store("asr_segments")
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def _fetch_full_transcript(self, media_id: str) -> Optional[str]:
@@ -177,7 +177,7 @@ class ActionExecutorNode(BaseNode):
 
         if context_source == "full_transcript":
             self.logger.info("Fetching full transcript...")
-            prepared_context = self._fetch_full_transcript(media_id)
+            prepared_context = await self.run_blocking("vector_store", self._fetch_full_transcript, media_id)
             if not prepared_context:
                 message = "I don't have a transcript for this file. Was it processed correctly?"
                 if stream_callback:
@@ -198,7 +198,7 @@ class ActionExecutorNode(BaseNode):
                     break
 
             self.logger.info(f"Running RAG search for: '{query[:50]}...'")
-            prepared_context = self._fetch_rag_context(query, media_id)
+            prepared_context = await self.run_blocking("vector_store", self._fetch_rag_context, query, media_id)
             self.logger.info(f"RAG context: {len(prepared_context)} chars")
 
         # Execute output tool if needed
@@ -208,7 +208,7 @@ class ActionExecutorNode(BaseNode):
         if output_tool:
             self.logger.info(f"Executing tool: {output_tool}")
             try:
-                tool_result = self._execute_tool(output_tool, media_id)
+                tool_result = await self.run_blocking("vector_store", self._execute_tool, output_tool, media_id)
                 self.logger.info(f"Tool result: {len(tool_result)} chars")
             except Exception as e:
                 self.logger.error(f"Tool execution failed: {e}")
@@ -1,28 +1,57 @@
 import logging
 import os
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
 
 from langchain_core.messages import HumanMessage
 from langchain_core.runnables import RunnableConfig
 
 from .base_node import BaseNode
 from ..state import AgentState
-from ..vector_store import VectorStore
+from ..vector_store import get_vector_store
 from ..asr import ASRWrapper
-from ..utils.file_utils import compute_sha256
+from ..config import ASR_VAD_ENABLED, ASR_PRECLASSIFIER_ENABLED
+from ..utils.media_index import MediaIdRevokedError, is_media_id_revoked, media_commit, resolve_media_id
+from ..utils.audio_source import decode_audio, SAMPLE_RATE
+from ..utils.ingest_progress import get_progress_store
+from ..utils.vad import compress_silence
+from ..utils.audio_classifier import preclassify_audio
+from ..utils.repetition import detect_repeated_phrases
+from ..utils.artifact_store import get_artifact_store
 
 logger = logging.getLogger(__name__)
 
 
 class ASRNode(BaseNode):
-    def __init__(self, model: ASRWrapper, collection_name: str = "asr_segments"):
+    # Segments are committed per transcribed window with this placeholder
+    # classification, then relabelled once the whole file has been analysed
+    PENDING_CLASSIFICATION = "pending"
+    PROGRESS_STAGE = "asr"
+    AUDIO_ARTIFACT_STAGE = "audio_pcm"
+
+    def __init__(
+        self,
+        model: ASRWrapper,
+        collection_name: str = "asr_segments",
+        vad_enabled: bool = ASR_VAD_ENABLED,
+        preclassifier_enabled: bool = ASR_PRECLASSIFIER_ENABLED
+    ):
         super().__init__(model=model, name="asr_node")
         self.logger = logging.getLogger(self.__class__.__name__)
         self.model = model
-
-        # Initialize VectorStore for caching
-        self.vector_store = VectorStore(collection_name=collection_name)
+        # Drop silent / non-speech stretches before Whisper (timestamps are remapped)
+        self.vad_enabled = vad_enabled
+        # Skip Whisper entirely for media the signal pre-classifier deems clearly non-speech
+        self.preclassifier_enabled = preclassifier_enabled
+
+        # Shared VectorStore for caching
+        self.vector_store = get_vector_store(collection_name)
+        # Per-media high-water mark for incremental commits
+        self.progress = get_progress_store()
+        # Decoded audio cache (derived artifacts keyed by media_id)
+        self.artifacts = get_artifact_store()
 
     def _analyze_audio_usability(self, text: str, segments: list, duration: float) -> Dict[str, Any]:
         """
@@ -128,33 +157,12 @@ class ASRNode(BaseNode):
         Example:
         - Partial sentence loops
 
+        See utils.repetition for the suffix-array implementation.
+
         Returns:
             dict mapping repeated phrases to their occurrence count
         """
-        words = text.lower().split()
-        phrase_counts = {}
-
-        # Check phrases of various lengths (3-6 words)
-        for phrase_len in range(min_phrase_words, min(7, len(words) + 1)):
-            for i in range(len(words) - phrase_len + 1):
-                phrase = " ".join(words[i:i + phrase_len])
-                phrase_counts[phrase] = phrase_counts.get(phrase, 0) + 1
-
-        # Filter to only phrases that repeat min_repeats times
-        repeated = {phrase: count for phrase, count in phrase_counts.items() if count >= min_repeats}
-
-        # Remove subphrases if a longer phrase contains them with same count
-        filtered = {}
-        for phrase, count in sorted(repeated.items(), key=lambda x: -len(x[0])):
-            is_subphrase = False
-            for longer_phrase in filtered:
-                if phrase in longer_phrase and filtered[longer_phrase] >= count:
-                    is_subphrase = True
-                    break
-            if not is_subphrase:
-                filtered[phrase] = count
-
-        return filtered
+        return detect_repeated_phrases(text, min_phrase_words=min_phrase_words, min_repeats=min_repeats)
 
     def _analyze_segments_quality(self, segments: List[Dict]) -> List[Dict]:
         """
@@ -212,6 +220,7 @@ class ASRNode(BaseNode):
 
         for i, meta in enumerate(metadatas):
             segments.append({
+                "id": ids[i],
                 "start": meta.get("start"),
                 "end": meta.get("end"),
                 "text": documents[i],
@@ -223,8 +232,8 @@ class ASRNode(BaseNode):
         segments.sort(key=lambda x: x["start"])
         return segments
 
-    def _cache_segments(self, media_id: str, segments: List[Dict], global_metadata: Dict[str, Any]):
-        """Save segments to VectorStore"""
+    def _cache_segments(self, media_id: str, segments: List[Dict], global_metadata: Dict[str, Any]) -> List[str]:
+        """Save segments to VectorStore, returning their ids"""
         texts = []
         metadatas = []
 
@@ -244,84 +253,179 @@ class ASRNode(BaseNode):
 
             metadatas.append(meta)
 
-        self.vector_store.add_texts(texts=texts, metadatas=metadatas)
+        return self.vector_store.add_texts(texts=texts, metadatas=metadatas)
 
-    def _extract_audio_from_video(self, video_path: str) -> str:
+    def _discard_uncommitted_segments(self, media_id: str, committed_until: float):
+        """Delete segments past the high-water mark (added before a crash but never acknowledged)."""
+        self.vector_store.delete_by_metadata(where={
+            "$and": [{"media_id": media_id}, {"start": {"$gte": committed_until}}]
+        })
+
+    def _transcribe_incremental(self, media_id: str, audio: np.ndarray, resume_from: float) -> Tuple[List[Dict], Optional[Dict[str, Any]]]:
         """
-        Extract audio from video file using ffmpeg.
+        Transcribe from `resume_from` seconds, committing each window's segments
+        to ChromaDB and advancing the high-water mark as soon as it is decoded.
 
-        Args:
-            video_path: Path to video file
+        When VAD is enabled, non-speech stretches are compressed out first and
+        segment times are mapped back to the original timeline before commit.
+
+        Runs on the ASR executor (blocking).
 
         Returns:
-            Path to extracted audio file, or None if extraction fails
+            (newly transcribed segments ({start, end, text}), VAD stats or None)
         """
-        import subprocess
-        import tempfile
-        from ..utils.ffmpeg_utils import ensure_ffmpeg_in_path
+        total_duration = len(audio) / SAMPLE_RATE
+        speech_map = None
+        start = resume_from
+        if self.vad_enabled:
+            audio, speech_map = compress_silence(audio, SAMPLE_RATE)
+            start = speech_map.to_compressed(resume_from)
+        vad_stats = speech_map.stats() if speech_map else None
+
+        start_sample = int(start * SAMPLE_RATE)
+        if start_sample >= len(audio):
+            return [], vad_stats
+
+        new_segments = []
+        for window in self.model.iter_windows(audio[start_sample:], offset=start):
+            chunks = window["chunks"]
+            committed_until = window["end"]
+            if speech_map is not None:
+                chunks = speech_map.remap_chunks(chunks)
+                committed_until = speech_map.to_original(committed_until)
+            if window["end"] * SAMPLE_RATE >= len(audio) - 1:
+                # Last window: any trailing non-speech is covered too
+                committed_until = total_duration
+
+            with media_commit(media_id):
+                self._cache_segments(media_id, chunks, {"classification": self.PENDING_CLASSIFICATION})
+                self.progress.advance(media_id, self.PROGRESS_STAGE, committed_until)
+            new_segments.extend(chunks)
+            self.logger.info(
+                f"Committed {len(chunks)} segments up to {committed_until:.1f}s "
+                f"(Media ID: {media_id[:16]}...)"
+            )
+        return new_segments, vad_stats
+
+    def _finalize_segments(self, media_id: str, usability: Dict[str, Any], duration: float):
+        """Replace the pending classification of all segments with the final analysis and mark the stage complete."""
+        with media_commit(media_id):
+            results = self.vector_store.get_by_metadata(where={"media_id": media_id})
+            if results and results["ids"]:
+                metadatas = [
+                    {
+                        **meta,
+                        "classification": usability.get("classification", "unknown"),
+                        "audio_usable": usability.get("audio_usable", False),
+                    }
+                    for meta in results["metadatas"]
+                ]
+                self.vector_store.update_metadatas(results["ids"], metadatas)
+            self.progress.complete(
+                media_id, self.PROGRESS_STAGE, duration,
+                {
+                    "classification": usability.get("classification", "unknown"),
+                    "speech_ratio": usability.get("speech_ratio"),
+                }
+            )
 
-        ensure_ffmpeg_in_path()
+    def _complete_preclassified(self, media_id: str, duration: float, verdict: str):
+        """Record a pre-classifier verdict as the completed ASR stage."""
+        with media_commit(media_id):
+            self.progress.complete(
+                media_id, self.PROGRESS_STAGE, duration, {"classification": verdict, "preclassified": True}
+            )
 
-        # Create output path in temp directory
-        video_basename = os.path.splitext(os.path.basename(video_path))[0]
-        audio_path = os.path.join(tempfile.gettempdir(), f"{video_basename}_audio.wav")
+    def _load_audio(self, media_path: str, media_id: str) -> Optional[np.ndarray]:
+        """
+        Decode audio from an audio or video file straight into memory.
 
-        # Skip if already extracted
-        if os.path.exists(audio_path):
-            self.logger.info(f"Using cached extracted audio: {audio_path}")
-            return audio_path
+        Decoded PCM is kept in the artifact store, so resumed or repeated
+        ingestion of the same media skips the ffmpeg decode.
 
-        self.logger.info(f"Extracting audio from video: {video_path} -> {audio_path}")
+        Args:
+            media_path: Path to audio or video file
+            media_id: Content-derived media ID (artifact key)
 
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", video_path,        # Input video file
-            "-vn",                   # No video
-            "-acodec", "pcm_s16le",  # WAV format
-            "-ar", "16000",          # 16kHz for Whisper
-            "-ac", "1",              # Mono audio (for Whisper)
-            audio_path               # Output audio file
-        ]
+        Returns:
+            16 kHz mono float32 samples, or None if decoding fails
+        """
+        params = {"sample_rate": SAMPLE_RATE, "channels": 1, "format": "f32le"}
+        cached_path = self.artifacts.lookup(media_id, self.AUDIO_ARTIFACT_STAGE, params, ".f32")
+        if cached_path:
+            try:
+                audio = np.fromfile(cached_path, dtype=np.float32)
+                self.logger.info(f"Loaded decoded audio from artifact cache ({len(audio) / SAMPLE_RATE:.1f}s)")
+                return audio
+            except OSError as e:
+                self.logger.warning(f"Cached audio unreadable, decoding again: {e}")
 
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                check=True,
-                timeout=300  # 5 minute timeout
-            )
-            self.logger.info(f"Audio extraction complete: {audio_path}")
-            return audio_path
-        except subprocess.CalledProcessError as e:
-            self.logger.error(f"ffmpeg audio extraction failed: {e.stderr.decode() if e.stderr else e}")
-            return None
-        except subprocess.TimeoutExpired:
-            self.logger.error("ffmpeg audio extraction timed out")
-            return None
+            audio = decode_audio(media_path)
         except Exception as e:
-            self.logger.error(f"Audio extraction failed: {e}")
+            self.logger.error(f"Audio decode failed for {media_path}: {e}")
+            return None
+
+        try:
+            with self.artifacts.writer(media_id, self.AUDIO_ARTIFACT_STAGE, params, ".f32") as tmp_path:
+                audio.tofile(tmp_path)
+        except OSError as e:
+            self.logger.warning(f"Could not cache decoded audio: {e}")
+        return audio
+
+    async def _preclassify(self, media_id: str, audio: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Run the signal pre-classifier on decoded audio.
+
+        Returns:
+            audio_usability dict (and records it as a completed ASR stage) if the
+            audio is clearly non-speech, or None if Whisper should run
+        """
+        result = await self.run_blocking("cpu", preclassify_audio, audio, SAMPLE_RATE)
+        if result["verdict"] == "speech":
             return None
 
+        duration = len(audio) / SAMPLE_RATE
+        usability = {
+            "audio_usable": False,
+            "classification": result["verdict"],
+            "segment_count": 0,
+            "duration": duration,
+            "diagnostics": {"reason": "signal_preclassifier", **result["features"]}
+        }
+        self.logger.info(f"Skipping Whisper, pre-classifier verdict: {usability}")
+
+        await self.run_blocking("io", self._complete_preclassified, media_id, duration, result["verdict"])
+        return usability
+
     async def __call__(self, state: AgentState, config: RunnableConfig = None) -> Dict[str, Any]:
         self.logger.info(f"--- Node {self.name} processing ---")
-
+        try:
+            updates = await self._process(state)
+        except MediaIdRevokedError as e:
+            # The quick ID was purged mid-ingestion: start over under the
+            # full SHA-256 (_process drops the revoked id from the state)
+            self.logger.warning(f"{e}; restarting ingestion")
+            updates = await self._process(state)
+        if state.get("media_id") and updates.get("media_id") not in (None, state["media_id"]):
+            # The session's VLM results belong to the replaced media_id
+            updates["vlm_processed"] = False
+        return updates
+
+    async def _process(self, state: AgentState) -> Dict[str, Any]:
+        """Transcribe the media in state, or load its transcript from the cache."""
         audio_path = state.get("audio_path")
         video_path = state.get("video_path")
 
-        # If no audio_path but video_path exists, extract audio from video
-        if not audio_path and video_path:
-            self.logger.info(f"No audio_path, extracting audio from video: {video_path}")
-            audio_path = self._extract_audio_from_video(video_path)
-            if not audio_path:
-                self.logger.warning("Failed to extract audio from video. Skipping ASRNode.")
-                return {"audio_usability": {"audio_usable": False, "classification": "extraction_failed"}}
+        # Audio is decoded directly from whichever file was provided (audio or video)
+        source_path = audio_path or video_path
 
-        if not audio_path:
-            self.logger.warning("No audio_path found in state. Skipping ASRNode.")
+        if not source_path:
+            self.logger.warning("No audio_path or video_path found in state. Skipping ASRNode.")
             return {}
 
-        if not os.path.exists(audio_path):
-            error_msg = f"Audio file not found at: {audio_path}"
+        if not os.path.exists(source_path):
+            error_msg = f"Media file not found at: {source_path}"
             self.logger.error(error_msg)
             return {"messages": [HumanMessage(content=f"Error: {error_msg}")]}
 
@@ -329,20 +433,26 @@ class ASRNode(BaseNode):
         # Priority: existing state > video_path > audio_path
         # Use video hash when available so audio and video share the same ID
         media_id = state.get("media_id")
+        if media_id and await self.run_blocking("io", is_media_id_revoked, media_id):
+            # The session cached a quick ID later found to be shared by two files
+            self.logger.warning(f"Media ID {media_id[:16]}... was revoked, resolving the file again")
+            media_id = None
         if not media_id:
             if video_path and os.path.exists(video_path):
                 self.logger.info("Computing media_id from video_path...")
-                media_id = compute_sha256(video_path)
+                media_id = await self.run_blocking("io", resolve_media_id, video_path)
             else:
                 self.logger.info("Computing media_id from audio_path...")
-                media_id = compute_sha256(audio_path)
+                media_id = await self.run_blocking("io", resolve_media_id, source_path)
 
-        self.logger.info(f"Processing audio: {audio_path} (Media ID: {media_id})")
+        self.logger.info(f"Processing audio: {source_path} (Media ID: {media_id})")
 
         # 2. Check Cache
-        cached_segments = self._get_cached_segments(media_id)
+        # Segments without a progress record predate incremental commits and are complete
+        progress = await self.run_blocking("io", self.progress.get, media_id, self.PROGRESS_STAGE)
+        cached_segments = await self.run_blocking("vector_store", self._get_cached_segments, media_id)
 
-        if cached_segments:
+        if cached_segments and (progress is None or progress["completed"]):
             self.logger.info(f"Found {len(cached_segments)} cached transcription segments.")
             # Reconstruct usability metadata from cache
             # Read actual values from cached metadata - do NOT assume usable
@@ -355,15 +465,67 @@ class ASRNode(BaseNode):
                 "duration": duration,
                 "diagnostics": {"source": "cache"}
             }
+            speech_ratio = (progress or {}).get("details", {}).get("speech_ratio")
+            if speech_ratio is not None:
+                usability["speech_ratio"] = speech_ratio
+        elif self.preclassifier_enabled and progress and progress["completed"] and progress["details"].get("preclassified"):
+            # Previously rejected by the signal pre-classifier: no transcript to load
+            details = progress["details"]
+            self.logger.info(f"Audio previously pre-classified as {details.get('classification')}, skipping ASR.")
+            usability = {
+                "audio_usable": False,
+                "classification": details.get("classification", "unknown"),
+                "segment_count": 0,
+                "duration": progress["committed_until"],
+                "diagnostics": {"source": "cache", "reason": "signal_preclassifier"}
+            }
         else:
-            self.logger.info("No cache found. Running ASR transcription...")
-            # 3. Run ASR Wrapper
-            result = self.model.transcribe(audio_path)
+            if progress and progress["details"].get("preclassified"):
+                # Verdict from the pre-classifier, now disabled: transcribe and replace it
+                self.logger.info("Ignoring cached pre-classifier verdict (pre-classifier disabled)")
+                await self.run_blocking("io", self.progress.reset, media_id, self.PROGRESS_STAGE)
+                progress = None
+
+            # Resume an interrupted transcription from its high-water mark
+            resume_from = 0.0
+            committed_segments = []
+            if progress and cached_segments:
+                resume_from = progress["committed_until"]
+                await self.run_blocking("vector_store", self._discard_uncommitted_segments, media_id, resume_from)
+                committed_segments = [seg for seg in cached_segments if seg["start"] < resume_from]
+                self.logger.info(
+                    f"Resuming transcription at {resume_from:.1f}s "
+                    f"({len(committed_segments)} segments already committed)"
+                )
+
+            self.logger.info("No complete cache found. Decoding audio...")
+            audio = await self.run_blocking("ffmpeg", self._load_audio, source_path, media_id)
+            if audio is None:
+                self.logger.warning("Failed to decode audio. Skipping ASRNode.")
+                return {
+                    "media_id": media_id,
+                    "audio_usability": {"audio_usable": False, "classification": "extraction_failed"}
+                }
+
+            # 3. Signal-level pre-classification (fresh runs only)
+            if self.preclassifier_enabled and resume_from == 0.0:
+                usability = await self._preclassify(media_id, audio)
+                if usability is not None:
+                    return {"media_id": media_id, "audio_usability": usability}
+
+            # 4. Run ASR Wrapper (segments are committed to ChromaDB window by window)
+            self.logger.info("Running ASR transcription...")
+            new_segments, vad_stats = await self.run_blocking(
+                "asr", self._transcribe_incremental, media_id, audio, resume_from
+            )
 
-            full_text = result.get("full_transcription", "")
-            transcription_segments = result.get("chunks", [])
+            transcription_segments = [
+                {"start": seg["start"], "end": seg["end"], "text": seg["text"]}
+                for seg in committed_segments + new_segments
+            ]
+            full_text = " ".join(seg["text"].strip() for seg in transcription_segments)
 
-            # 4. Analyze Usability
+            # 5. Analyze Usability
             # Estimate duration from last segment
             duration = transcription_segments[-1]["end"] if transcription_segments else 0.0
             self.logger.info(f"Duration: {duration}")
@@ -372,11 +534,14 @@ class ASRNode(BaseNode):
             # Add segment_count and duration to usability for state metadata
             usability["segment_count"] = len(transcription_segments)
             usability["duration"] = duration
+            if vad_stats:
+                usability["speech_ratio"] = vad_stats["speech_ratio"]
+                usability.setdefault("diagnostics", {}).update(vad_stats)
 
             self.logger.info(f"Audio Usability Analysis: {usability}")
 
-            # 5. Save to Cache (ChromaDB)
-            self._cache_segments(media_id, transcription_segments, usability)
+            # 6. Finalize cached segments (ChromaDB) and mark the stage complete
+            await self.run_blocking("vector_store", self._finalize_segments, media_id, usability, duration)
 
         # Return lightweight state updates only
         # Segments are stored in ChromaDB, accessed via media_id
@@ -1,17 +1,84 @@
+import asyncio
+import functools
+import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, TypeVar
 
 from ..base_llm import BaseLLMWrapper
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bounded thread pools per blocking resource.
+# Async nodes must never call these resources inline: a blocking call on the
+# event loop freezes every other session (including /health and ListSessions).
+EXECUTOR_POOL_SIZES = {
+    "asr": 1,           # Whisper inference (one pipeline, not re-entrant)
+    "vlm": 1,           # SmolVLM2 inference
+    "ffmpeg": 2,        # ffmpeg decoding subprocesses (long-running)
+    "probe": 2,         # Short ffprobe / header reads, never queued behind decodes
+    "vector_store": 4,  # ChromaDB get/add/query (includes embedding)
+    "io": 2,            # File hashing and other disk-bound work
+    "cpu": 2,           # NumPy signal analysis, kept off the single model workers
+}
+DEFAULT_POOL_SIZE = 1
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(resource: str) -> ThreadPoolExecutor:
+    """Return the shared executor for a resource, creating it on first use."""
+    with _executors_lock:
+        executor = _executors.get(resource)
+        if executor is None:
+            max_workers = EXECUTOR_POOL_SIZES.get(resource, DEFAULT_POOL_SIZE)
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"node-{resource}")
+            _executors[resource] = executor
+            logger.debug(f"Created '{resource}' executor with {max_workers} worker(s)")
+        return executor
+
+
+async def run_blocking(resource: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking call on the resource's executor and await the result.
+
+    Args:
+        resource: Pool name (see EXECUTOR_POOL_SIZES), e.g. "asr", "ffmpeg", "vector_store"
+        func: Blocking callable
+        *args, **kwargs: Passed to func
+
+    Returns:
+        The return value of func
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(resource), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executors(wait: bool = False):
+    """Shut down all resource executors (called on server shutdown)."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        _executors.clear()
+
+
 class BaseNode(ABC):
     """
     Abstract base class for LangGraph nodes.
-    """    
+    """
     def __init__(self, model: BaseLLMWrapper = None, name: str = "node"):
         self.model = model
         self.name = name
 
+    async def run_blocking(self, resource: str, func: Callable[..., T], *args, **kwargs) -> T:
+        """Offload a blocking model / ffmpeg / vector-store call from an async node."""
+        return await run_blocking(resource, func, *args, **kwargs)
+
     @abstractmethod
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Entry point for LangGraph execution"""
-        pass
\ No newline at end of file
+        pass
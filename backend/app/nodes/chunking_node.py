@@ -5,7 +5,8 @@ from langchain_core.runnables import RunnableConfig
 
 from .base_node import BaseNode
 from ..state import AgentState
-from ..vector_store import VectorStore
+from ..vector_store import get_vector_store
+from ..utils.ingest_progress import get_progress_store
 
 
 class ChunkingNode(BaseNode):
@@ -16,9 +17,15 @@ class ChunkingNode(BaseNode):
     - Audio-aligned: Merge adjacent Whisper segments (gap ≤ 0.5s, duration ≤ 10s)
     - Vision-driven: Dense temporal chunks (4s with 1s overlap)
     
+    Interrupted VLM ingestion (progress stage "vlm" not completed) resumes:
+    chunks whose time range is already stored in multimodal_chunks, or that
+    VLMNode gave up on after repeated failures, are skipped.
+    
     Output:
         processing_chunks: List of {start, end, asr_text (optional)}
     """
+    # Progress stage written by VLMNode
+    VLM_PROGRESS_STAGE = "vlm"
     # Chunking parameters
     AUDIO_MAX_GAP = 0.5         # Max gap between segments to merge (seconds)
     AUDIO_MAX_DURATION = 10.0   # Max merged chunk duration (seconds)
@@ -28,9 +35,10 @@ class ChunkingNode(BaseNode):
     def __init__(self, collection_name: str = "asr_segments"):
         super().__init__(model=None, name="chunking_node")
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.vector_store = VectorStore(collection_name=collection_name)
+        self.vector_store = get_vector_store(collection_name)
         # Also need access to multimodal_chunks for cache checking
-        self.multimodal_store = VectorStore(collection_name="multimodal_chunks")
+        self.multimodal_store = get_vector_store("multimodal_chunks")
+        self.progress = get_progress_store()
     
     def __call__(self, state: AgentState, config: RunnableConfig = None) -> Dict[str, Any]:
         audio_usability = state.get("audio_usability", {})
@@ -42,24 +50,75 @@ class ChunkingNode(BaseNode):
             return {"processing_chunks": []}
         
         # Check if VLM chunks already exist in ChromaDB (cross-session cache)
+        # Chunks without a progress record predate incremental commits and are complete
+        skip_ranges = set()
+        progress = None
         if media_id:
+            progress = self.progress.get(media_id, self.VLM_PROGRESS_STAGE)
+            given_up = self._given_up_ranges(progress)
             existing_chunks = self.multimodal_store.get_by_metadata({"media_id": media_id})
             if existing_chunks and existing_chunks.get("documents"):
                 chunk_count = len(existing_chunks["documents"])
-                self.logger.info(f"Found {chunk_count} existing multimodal chunks for media_id: {media_id[:16]}... (using cache)")
-                # Return empty chunks to skip VLM processing, but mark as processed
+                if progress is None or progress["completed"]:
+                    self.logger.info(f"Found {chunk_count} existing multimodal chunks for media_id: {media_id[:16]}... (using cache)")
+                    # Return empty chunks to skip VLM processing, but mark as processed
+                    return {"processing_chunks": [], "vlm_processed": True}
+                skip_ranges = {
+                    self.range_key(meta.get("start_time", 0), meta.get("end_time", 0))
+                    for meta in existing_chunks["metadatas"]
+                }
+                self.logger.info(
+                    f"Resuming interrupted VLM ingestion: {chunk_count} chunks already committed "
+                    f"(up to {progress['committed_until']:.1f}s)"
+                )
+            elif progress is not None and progress["completed"] and given_up:
+                self.logger.info(f"VLM stage finished for media_id: {media_id[:16]}... (every chunk was given up on)")
                 return {"processing_chunks": [], "vlm_processed": True}
+            if given_up:
+                self.logger.info(f"Skipping {len(given_up)} chunks given up on after repeated VLM failures")
+                skip_ranges |= given_up
         
         if audio_usability.get("audio_usable"):
             self.logger.info("Audio usable - using audio-aligned chunking")
             chunks = self._create_audio_aligned_chunks(media_id)
         else:
             self.logger.info(f"Audio not usable (classification: {audio_usability.get('classification', 'unknown')}) - using vision-driven chunking")
-            chunks = self._create_vision_driven_chunks(video_path)
+            chunks = self._create_vision_driven_chunks(video_path, media_id)
+        
+        if skip_ranges:
+            # Only the time ranges that are neither stored nor given up on
+            total = len(chunks)
+            chunks = [
+                chunk for chunk in chunks
+                if self.range_key(chunk["start"], chunk["end"]) not in skip_ranges
+            ]
+            self.logger.info(f"{total - len(chunks)}/{total} chunks already committed or given up on")
+            if not chunks and total:
+                self.progress.complete(
+                    media_id, self.VLM_PROGRESS_STAGE, max(end for _, end in skip_ranges),
+                    progress["details"] if progress else None
+                )
+                return {"processing_chunks": [], "vlm_processed": True}
         
         self.logger.info(f"Created {len(chunks)} chunks for VLM processing")
         return {"processing_chunks": chunks}
     
+    @staticmethod
+    def range_key(start: float, end: float) -> tuple:
+        """Chunk identity for resume matching (millisecond precision)."""
+        return (round(float(start), 3), round(float(end), 3))
+    
+    @classmethod
+    def _given_up_ranges(cls, progress: Optional[Dict[str, Any]]) -> set:
+        """Ranges of chunks VLMNode stopped retrying (see VLMNode failed_chunks)."""
+        if not progress:
+            return set()
+        return {
+            cls.range_key(failure["start"], failure["end"])
+            for failure in progress["details"].get("failed_chunks", [])
+            if failure.get("given_up")
+        }
+    
     def _create_audio_aligned_chunks(self, media_id: str) -> List[Dict[str, Any]]:
         """
         Create chunks aligned with ASR segments.
@@ -131,7 +190,7 @@ class ChunkingNode(BaseNode):
         self.logger.info(f"Merged {len(segments)} segments into {len(merged)} audio-aligned chunks")
         return merged
     
-    def _create_vision_driven_chunks(self, video_path: str) -> List[Dict[str, Any]]:
+    def _create_vision_driven_chunks(self, video_path: str, media_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Create fixed-interval chunks for videos without usable audio.
         
@@ -144,7 +203,7 @@ class ChunkingNode(BaseNode):
         from ..utils.frame_sampler import get_video_duration
         
         try:
-            duration = get_video_duration(video_path)
+            duration = get_video_duration(video_path, media_id)
         except Exception as e:
             self.logger.error(f"Failed to get video duration: {e}")
             return []
@@ -1,11 +1,12 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from langchain_core.runnables import RunnableConfig
 
 from .base_node import BaseNode
 from ..state import AgentState
-from ..vector_store import VectorStore
+from ..vector_store import get_vector_store
+from ..utils.media_index import media_commit
 
 
 class FusionNode(BaseNode):
@@ -22,7 +23,7 @@ class FusionNode(BaseNode):
         The user presses and holds the reset button.
 
     Input state:
-        vlm_results: List[{start, end, visual_description, asr_text, frame_count}]
+        vlm_results: List[{start, end, visual_description, asr_text, frame_count, vlm_profile, committed (optional)}]
         media_id: str
         audio_usability: Dict
 
@@ -39,7 +40,7 @@ class FusionNode(BaseNode):
         """
         super().__init__(model=None, name="fusion_node")
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.vector_store = VectorStore(collection_name=collection_name)
+        self.vector_store = get_vector_store(collection_name)
 
     def __call__(self, state: AgentState, config: RunnableConfig = None) -> Dict[str, Any]:
         vlm_results = state.get("vlm_results", [])
@@ -48,12 +49,53 @@ class FusionNode(BaseNode):
 
         if not vlm_results:
             self.logger.warning("No VLM results to fuse")
-            return {"vlm_processed": False}
+            # Nothing new to store; keep the flag set by chunking / VLM (e.g. fully
+            # cached, or every remaining chunk given up on after repeated failures)
+            return {"vlm_processed": bool(state.get("vlm_processed"))}
 
         if not media_id:
             self.logger.warning("No media_id in state, cannot store fused chunks")
             return {"vlm_processed": False}
 
+        # Results already committed chunk by chunk during VLM processing
+        pending = [result for result in vlm_results if not result.get("committed")]
+        if not pending:
+            self.logger.info(f"All {len(vlm_results)} fused chunks were committed during VLM processing")
+            # Set by VLMNode: True once every chunk is committed or given up on
+            return {"vlm_processed": bool(state.get("vlm_processed"))}
+
+        # Store in ChromaDB
+        try:
+            self.store_results(pending, media_id, audio_usability)
+            return {"vlm_processed": True}
+        except Exception as e:
+            self.logger.error(f"Failed to store fused chunks: {e}")
+            return {"vlm_processed": False}
+
+    def store_results(
+        self,
+        vlm_results: List[Dict[str, Any]],
+        media_id: str,
+        audio_usability: Dict[str, Any]
+    ) -> int:
+        """
+        Fuse VLM results and add them to the multimodal collection.
+
+        Used by __call__ and by VLMNode to commit chunks as soon as they are
+        described.
+
+        Args:
+            vlm_results: VLM result dicts (start, end, visual_description, asr_text, frame_count)
+            media_id: Media identifier
+            audio_usability: Audio usability analysis dict
+
+        Returns:
+            Number of chunks stored
+
+        Raises:
+            MediaIdRevokedError: If media_id was revoked (quick ID collision)
+            Exception: If the vector store write fails
+        """
         fused_texts = []
         fused_metadatas = []
 
@@ -64,14 +106,12 @@ class FusionNode(BaseNode):
             fused_texts.append(fused_text)
             fused_metadatas.append(metadata)
 
-        # Store in ChromaDB
-        try:
+        if not fused_texts:
+            return 0
+        with media_commit(media_id):
             self.vector_store.add_texts(texts=fused_texts, metadatas=fused_metadatas)
-            self.logger.info(f"Stored {len(fused_texts)} fused multimodal chunks in ChromaDB")
-            return {"vlm_processed": True}
-        except Exception as e:
-            self.logger.error(f"Failed to store fused chunks: {e}")
-            return {"vlm_processed": False}
+        self.logger.info(f"Stored {len(fused_texts)} fused multimodal chunks in ChromaDB")
+        return len(fused_texts)
 
     def _format_fused_chunk(self, result: Dict[str, Any]) -> str:
         """
@@ -147,4 +187,5 @@ class FusionNode(BaseNode):
             "audio_classification": audio_usability.get("classification", "unknown"),
             "source_models": source_models,
             "frame_count": result.get("frame_count", 0),
+            "vlm_profile": result.get("vlm_profile", "unknown"),
         }
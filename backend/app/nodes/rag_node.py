@@ -5,7 +5,7 @@ from langchain_core.runnables import RunnableConfig
 
 from .base_node import BaseNode
 from ..state import AgentState
-from ..vector_store import VectorStore
+from ..vector_store import VectorStore, get_vector_store
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +22,8 @@ class RAGNode(BaseNode):
     def __init__(self):
         super().__init__(model=None, name="rag_node")
         # Priority: multimodal (audio+visual) > asr-only
-        self.multimodal_store = VectorStore(collection_name="multimodal_chunks")
-        self.asr_store = VectorStore(collection_name="asr_segments")
+        self.multimodal_store = get_vector_store("multimodal_chunks")
+        self.asr_store = get_vector_store("asr_segments")
         self.logger = logger
 
     async def __call__(self, state: AgentState, config: RunnableConfig = None) -> Dict[str, Any]:
@@ -46,7 +46,9 @@ class RAGNode(BaseNode):
         self.logger.info(f"RAG query: '{query[:100]}...' (media_id: {media_id})")
 
         # Try multimodal chunks first (has audio+visual descriptions)
-        results = self._search_collection(
+        results = await self.run_blocking(
+            "vector_store",
+            self._search_collection,
             self.multimodal_store,
             query,
             media_id,
@@ -56,7 +58,9 @@ class RAGNode(BaseNode):
         # Fall back to ASR segments if no multimodal results
         if not results or not results.get("documents") or not results["documents"][0]:
             self.logger.info("No multimodal chunks found, falling back to ASR segments")
-            results = self._search_collection(
+            results = await self.run_blocking(
+                "vector_store",
+                self._search_collection,
                 self.asr_store,
                 query,
                 media_id,
@@ -1,12 +1,25 @@
+import hashlib
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from langchain_core.runnables import RunnableConfig
 
 from .base_node import BaseNode
 from ..state import AgentState
-from ..vlm import VLMWrapper
-from ..utils.frame_sampler import sample_frames
+from ..vlm import VLMWrapper, VLMProfile, get_vlm_profile
+from ..utils.frame_sampler import iter_frames_for_chunks
+from ..utils.artifact_store import get_artifact_store
+from ..utils.keyframes import select_keyframes
+from ..utils.phash import dhash, get_phash_index
+from ..utils.pipeline import StagePipeline, batched
+from ..utils.ingest_progress import get_progress_store
+from ..utils.media_index import media_commit
+from ..config import (
+    VLM_KEYFRAMES_ENABLED, VLM_REUSE_ENABLED, VLM_PREFETCH_CHUNKS, VLM_BATCH_SIZE, VLM_COMMIT_EVERY,
+    VLM_CLIP_INPUT_ENABLED, VLM_MAX_CHUNK_ATTEMPTS
+)
+from .chunking_node import ChunkingNode
+from .fusion_node import FusionNode
 
 
 class VLMNode(BaseNode):
@@ -14,37 +27,99 @@ class VLMNode(BaseNode):
     Process video chunks through SmolVLM2 for visual descriptions.
     
     Features:
-    - Sequential processing (memory-constrained)
+    - One model call at a time (memory-constrained); frame decoding and
+      keyframe / reuse preparation of the next chunks overlap with inference
+    - Batch mode: several chunks per generate() call, each with its own prompt
+    - Clip mode: a chunk's frames go through the model's video input path
     - Audio-aligned prompts when ASR context available
     - Vision-only prompts for silent sequences
+    - Profiles (quality / balanced / fast) chosen per ingestion: image splitting,
+      input resolution and description length; recorded with each result
+    - Decode-time downscaling to the VLM processor's input resolution
+    - Vision-encoder outputs of frames shared by overlapping chunks are reused
+    - Keyframe selection: near-duplicate frames are dropped before the VLM
+    - Description reuse: chunks visually identical to an earlier chunk (this or
+      any previously ingested media) reuse its description via perceptual hashes
+    - Incremental commits: with a FusionNode attached, fused chunks are stored
+      every `commit_every` chunks and VLM progress is tracked per media, so an
+      interrupted ingestion only redoes the missing chunks
+    - Failed chunks are recorded in the VLM progress (attempts + reason) and
+      given up on after `max_chunk_attempts` runs; the stage completes once
+      every chunk is committed or given up on
     
     Input state:
         processing_chunks: List[{start, end, asr_text}]
         video_path: str
+        media_id: str
+        audio_usability: Dict
+        vlm_profile: Optional[str] (None = the model's default profile)
         
     Output state:
-        vlm_results: List[{start, end, visual_description, asr_text, frame_count}]
+        vlm_results: List[{start, end, visual_description, asr_text, frame_count, frames_sampled,
+                           description_reused, vlm_profile, committed}]
+        vlm_processed: bool (only when results are committed here; True once
+            every chunk is committed or given up on)
     """
     
+    # Ingestion progress stage name (see IngestProgressStore)
+    PROGRESS_STAGE = "vlm"
+    
     # Frame sampling parameters (tweak as necessary to avoid overflowing VLM context)
     FRAMES_PER_SECOND = 1.0
     MAX_FRAMES_PER_CHUNK = 8
+    # Keyframes kept per chunk after dropping near-duplicates
+    MIN_KEYFRAMES_PER_CHUNK = 1
     
-    def __init__(self, model: VLMWrapper, frames_output_dir: str = None):
+    def __init__(
+        self,
+        model: VLMWrapper,
+        frames_output_dir: str = None,
+        keyframes_enabled: bool = VLM_KEYFRAMES_ENABLED,
+        reuse_enabled: bool = VLM_REUSE_ENABLED,
+        prefetch_chunks: int = VLM_PREFETCH_CHUNKS,
+        batch_size: int = VLM_BATCH_SIZE,
+        fusion: Optional[FusionNode] = None,
+        commit_every: int = VLM_COMMIT_EVERY,
+        clip_input: bool = VLM_CLIP_INPUT_ENABLED,
+        max_chunk_attempts: int = VLM_MAX_CHUNK_ATTEMPTS
+    ):
         """
         Initialize VLM Node.
         
         Args:
-            frames_output_dir: Optional directory to store extracted frames
+            frames_output_dir: Optional debug directory; extracted frames are
+                also written there as JPEG (they are always passed in memory)
+            keyframes_enabled: Drop visually near-identical frames before the VLM
+            reuse_enabled: Reuse descriptions of perceptually identical chunks
+            prefetch_chunks: Chunks decoded / prepared ahead of inference (0 = sequential)
+            batch_size: Chunks described per model call (1 = one chunk at a time)
+            fusion: FusionNode used to commit fused chunks during processing
+                (None leaves all storing to the fusion step)
+            commit_every: Commit after this many described chunks
+            clip_input: Describe each chunk as one video clip (describe_clip);
+                not combined with batch mode
+            max_chunk_attempts: Ingestion runs a chunk may fail before it is
+                given up on (only tracked when committing)
         """
         super().__init__(model=None, name="vlm_node")
         self.model = model
         self.frames_output_dir = frames_output_dir
+        self.keyframes_enabled = keyframes_enabled
+        self.reuse_enabled = reuse_enabled
+        self.prefetch_chunks = prefetch_chunks
+        self.batch_size = max(1, batch_size)
+        self.fusion = fusion
+        self.commit_every = max(1, commit_every)
+        self.clip_input = clip_input
+        self.max_chunk_attempts = max(1, max_chunk_attempts)
+        self.progress = get_progress_store()
+        self.phash_index = get_phash_index() if reuse_enabled else None
         self.logger = logging.getLogger(self.__class__.__name__)
     
     def __call__(self, state: AgentState, config: RunnableConfig = None) -> Dict[str, Any]:
         chunks = state.get("processing_chunks", [])
         video_path = state.get("video_path")
+        media_id = state.get("media_id")
         
         if not chunks:
             self.logger.warning("No chunks to process, skipping VLM")
@@ -54,84 +129,423 @@ class VLMNode(BaseNode):
             self.logger.warning("No video_path in state, skipping VLM")
             return {"vlm_results": []}
 
-        vlm_results = []
+        results_by_index: Dict[int, Dict[str, Any]] = {}
+        uncommitted: List[Dict[str, Any]] = []
+        attempted = set()
+        commit = self.fusion is not None and bool(media_id)
+        previous = self.progress.get(media_id, self.PROGRESS_STAGE) if commit else None
+        failed_chunks = self._load_failed_chunks(previous)
+        audio_usability = state.get("audio_usability", {})
         total_chunks = len(chunks)
+        profile = self._resolve_profile(state.get("vlm_profile"))
+        mode = f"profile {profile.name}, "
+        mode += f"prefetch {self.prefetch_chunks}" if self.prefetch_chunks else "sequential mode"
+        if self.clip_input:
+            mode += ", clip input"
+        elif self.batch_size > 1:
+            mode += f", batch size {self.batch_size}"
+        
+        self.logger.info(f"Starting VLM processing for {total_chunks} chunks ({mode})")
+        # Vision-encoder outputs are only shared within one ingestion
+        self._reset_encoder_cache()
+        
+        # Frames for all chunks come from one decoding pass. Decoding and
+        # keyframe / reuse preparation of the next chunks run ahead on worker
+        # threads while the model describes the current one. Chunks travel
+        # through the pipeline in groups of batch_size
+        frame_batches = iter_frames_for_chunks(
+            video_path,
+            [(chunk.get("start", 0), chunk.get("end", 0)) for chunk in chunks],
+            fps=self.FRAMES_PER_SECOND,
+            max_frames=self.MAX_FRAMES_PER_CHUNK,
+            output_dir=self.frames_output_dir,
+            media_id=media_id,
+            max_edge=self._frame_max_edge(profile)
+        )
+        pipeline = StagePipeline(
+            [
+                ("prepare", lambda group: [self._prepare_chunk(chunks, item, media_id, profile) for item in group]),
+                ("describe", self._describe_group),
+            ],
+            prefetch=self.prefetch_chunks,
+            source_name="decode"
+        )
         
-        self.logger.info(f"Starting VLM processing for {total_chunks} chunks (sequential mode)")
+        # Only errors raised by the pipeline (decoding; preparation and model
+        # errors are caught per chunk) count as failed attempts. Commits run
+        # outside it: a storage error leaves chunks uncommitted, not failed
+        groups = pipeline.run(batched(frame_batches, self.batch_size))
+        try:
+            while True:
+                try:
+                    group_results = next(groups)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    self.logger.error(f"Frame extraction failed for {video_path}: {e}")
+                    for i in range(total_chunks):
+                        if i not in attempted:
+                            self._record_failure(failed_chunks, chunks[i], f"frame extraction failed: {e}")
+                    break
+                for i, result, error in group_results:
+                    attempted.add(i)
+                    if result:
+                        results_by_index[i] = result
+                        uncommitted.append(result)
+                        failed_chunks.pop(ChunkingNode.range_key(result["start"], result["end"]), None)
+                        self.logger.debug(f"Chunk {i + 1} description: {result['visual_description'][:80]}...")
+                    else:
+                        self._record_failure(failed_chunks, chunks[i], error)
+                if commit and len(uncommitted) >= self.commit_every:
+                    self._commit(media_id, audio_usability, uncommitted, results_by_index, total_chunks, failed_chunks)
+                    uncommitted = []
+        finally:
+            groups.close()
+        if commit and uncommitted:
+            self._commit(media_id, audio_usability, uncommitted, results_by_index, total_chunks, failed_chunks)
+        
+        vlm_results = [results_by_index[i] for i in sorted(results_by_index)]
+        self.logger.info(f"VLM processing complete: {len(vlm_results)}/{total_chunks} chunks processed")
+        self.logger.info(f"VLM pipeline utilization: {pipeline.format_stats()}")
+        sampled = sum(result["frames_sampled"] for result in vlm_results)
+        kept = sum(result["frame_count"] for result in vlm_results)
+        if sampled:
+            self.logger.info(f"Keyframes: kept {kept}/{sampled} sampled frames ({sampled - kept} dropped)")
+        if self.phash_index is not None:
+            reused = sum(1 for result in vlm_results if result["description_reused"])
+            self.logger.info(
+                f"Description reuse: {reused}/{len(vlm_results)} chunks this run, "
+                f"index {self.phash_index.stats()}"
+            )
+        description_cache = getattr(self.model, "description_cache", None)
+        if description_cache is not None:
+            self.logger.info(f"Description cache: {description_cache.stats()}")
+        encoder_cache = getattr(self.model, "encoder_cache", None)
+        if encoder_cache is not None:
+            self.logger.info(f"Vision encoder cache: {encoder_cache.stats()}")
+        self._reset_encoder_cache()
+        self.logger.info(f"Artifact store: {get_artifact_store().stats()}")
+        
+        if not commit:
+            return {"vlm_results": vlm_results}
+        
+        # The stage completes once every chunk is committed or given up on;
+        # otherwise the next run picks up the missing chunks
+        given_up = [failure for failure in failed_chunks.values() if failure["given_up"]]
+        if given_up:
+            self.logger.warning(
+                f"Gave up on {len(given_up)} chunks after {self.max_chunk_attempts} failed attempts: "
+                + ", ".join(f"[{f['start']:.2f}-{f['end']:.2f}s] {f['reason']}" for f in given_up[:5])
+            )
+        completed = all(
+            (i in results_by_index and results_by_index[i]["committed"])
+            or failed_chunks.get(ChunkingNode.range_key(chunk.get("start", 0), chunk.get("end", 0)), {}).get("given_up")
+            for i, chunk in enumerate(chunks)
+        )
+        committed_until = max(
+            [result["end"] for result in vlm_results if result["committed"]]
+            + [previous["committed_until"] if previous else 0.0]
+        )
+        if completed or failed_chunks:
+            # Keep the attempt counts for the next run
+            self._save_progress(
+                media_id, committed_until, self._progress_details(results_by_index, total_chunks, failed_chunks),
+                completed
+            )
+        return {"vlm_results": vlm_results, "vlm_processed": completed}
+    
+    def _commit(
+        self,
+        media_id: str,
+        audio_usability: Dict[str, Any],
+        results: List[Dict[str, Any]],
+        results_by_index: Dict[int, Dict[str, Any]],
+        total_chunks: int,
+        failed_chunks: Dict[tuple, Dict[str, Any]]
+    ):
+        """Store fused results through the FusionNode and advance VLM progress."""
+        try:
+            self.fusion.store_results(results, media_id, audio_usability)
+        except Exception as e:
+            # Left uncommitted: the fusion step retries them after the run
+            self.logger.error(f"Failed to commit {len(results)} fused chunks: {e}")
+            return
+        for result in results:
+            result["committed"] = True
+        committed = [result for result in results_by_index.values() if result["committed"]]
+        self._save_progress(
+            media_id, max(result["end"] for result in committed),
+            self._progress_details(results_by_index, total_chunks, failed_chunks)
+        )
+    
+    def _save_progress(self, media_id: str, committed_until: float, details: Dict[str, Any], completed: bool = False):
+        """Record VLM progress; a failed write is logged (the next run redoes more work) and never fails the node."""
+        try:
+            with media_commit(media_id):
+                if completed:
+                    self.progress.complete(media_id, self.PROGRESS_STAGE, committed_until, details)
+                else:
+                    self.progress.advance(media_id, self.PROGRESS_STAGE, committed_until, details)
+        except Exception as e:
+            self.logger.error(f"Failed to record VLM progress for {media_id[:16]}...: {e}")
+    
+    @staticmethod
+    def _progress_details(
+        results_by_index: Dict[int, Dict[str, Any]],
+        total_chunks: int,
+        failed_chunks: Dict[tuple, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Progress details: commit counts and the failed chunks still being tracked."""
+        return {
+            "chunks_committed": sum(1 for result in results_by_index.values() if result["committed"]),
+            "chunks_total": total_chunks,
+            "failed_chunks": list(failed_chunks.values()),
+        }
+    
+    @staticmethod
+    def _load_failed_chunks(progress: Optional[Dict[str, Any]]) -> Dict[tuple, Dict[str, Any]]:
+        """Failed chunks recorded by earlier runs, keyed by ChunkingNode.range_key."""
+        if not progress:
+            return {}
+        return {
+            ChunkingNode.range_key(failure["start"], failure["end"]): dict(failure)
+            for failure in progress["details"].get("failed_chunks", [])
+        }
+    
+    def _record_failure(self, failed_chunks: Dict[tuple, Dict[str, Any]], chunk: Dict[str, Any], reason: Optional[str]):
+        """Count a failed attempt at a chunk; it is given up on after max_chunk_attempts."""
+        start, end = chunk.get("start", 0), chunk.get("end", 0)
+        failure = failed_chunks.setdefault(
+            ChunkingNode.range_key(start, end),
+            {"start": start, "end": end, "attempts": 0, "reason": None, "given_up": False}
+        )
+        failure["attempts"] += 1
+        failure["reason"] = reason or "unknown error"
+        failure["given_up"] = failure["attempts"] >= self.max_chunk_attempts
+    
+    def _resolve_profile(self, name: Optional[str]) -> VLMProfile:
+        """Profile requested for this ingestion, falling back to the model's default."""
+        default = getattr(self.model, "profile", None) or get_vlm_profile()
+        if not name:
+            return default
+        try:
+            return get_vlm_profile(name)
+        except ValueError as e:
+            self.logger.warning(f"{e}; using profile '{default.name}'")
+            return default
+    
+    def _frame_max_edge(self, profile: VLMProfile) -> Optional[int]:
+        """Decode-time downscale target: the processor's input size under this profile."""
+        target_long_edge = getattr(self.model, "target_long_edge", None)
+        return target_long_edge(profile) if target_long_edge is not None else None
+    
+    def _reset_encoder_cache(self):
+        reset = getattr(self.model, "reset_encoder_cache", None)
+        if reset is not None:
+            reset()
+    
+    def _prepare_chunk(
+        self,
+        chunks: List[Dict[str, Any]],
+        item: Tuple[int, List[Dict[str, Any]]],
+        media_id: str = None,
+        profile: VLMProfile = None
+    ) -> Dict[str, Any]:
+        """
+        Pipeline stage: keyframe selection and description-reuse lookup (no model call).
         
-        for i, chunk in enumerate(chunks):
-            chunk_num = i + 1
-            start = chunk.get("start", 0)
-            end = chunk.get("end", 0)
-            asr_text = chunk.get("asr_text")
+        Args:
+            chunks: All processing chunks ({start, end, asr_text})
+            item: (chunk index, sampled frames) from the frame sampler
+            media_id: Media ID recorded with indexed descriptions
+            profile: VLM profile of this ingestion
             
-            self.logger.info(f"Processing chunk {chunk_num}/{total_chunks}: [{start:.2f}-{end:.2f}s]")
+        Returns:
+            Prepared chunk for _describe_chunk; "error" is set if preparation failed
+        """
+        i, frames = item
+        chunk = chunks[i]
+        prepared = {
+            "index": i,
+            "total": len(chunks),
+            "start": chunk.get("start", 0),
+            "end": chunk.get("end", 0),
+            "asr_text": chunk.get("asr_text"),
+            "media_id": media_id,
+            "profile": profile or self._resolve_profile(None),
+            "frames": frames,
+            "frames_sampled": len(frames),
+            "hashes": [],
+            "context_key": None,
+            "description": None,
+            "generated": None,
+            "error": None,
+        }
+        if not frames:
+            return prepared
+        
+        try:
+            if self.keyframes_enabled:
+                frames, stats = select_keyframes(
+                    frames,
+                    min_frames=self.MIN_KEYFRAMES_PER_CHUNK,
+                    max_frames=self.MAX_FRAMES_PER_CHUNK
+                )
+                prepared["frames"] = frames
+                if stats["dropped"]:
+                    self.logger.debug(f"Dropped {stats['dropped']}/{stats['sampled']} near-duplicate frames")
             
+            # Reuse the description of a visually identical chunk if one was indexed
+            if self.phash_index is not None:
+                prepared["hashes"] = [dhash(f["image"]) for f in frames]
+                prepared["context_key"] = self._context_key(prepared["asr_text"], prepared["profile"])
+                match = self.phash_index.lookup(prepared["context_key"], prepared["hashes"], prepared["asr_text"])
+                if match:
+                    prepared["description"] = match["description"]
+                    self.logger.debug(
+                        f"Reusing description from {str(match['media_id'])[:16]} "
+                        f"[{match['start_time']:.2f}-{match['end_time']:.2f}s]"
+                    )
+        except Exception as e:
+            prepared["error"] = e
+        return prepared
+    
+    def _describe_group(self, group: List[Dict[str, Any]]) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Pipeline stage: describe a group of prepared chunks.
+        
+        Chunks that still need a description are sent to the model in one
+        padded batch (when batch_size > 1); if the batched call fails they are
+        described one at a time instead.
+        
+        Returns:
+            (chunk index, result dict or None, failure reason or None) per chunk
+        """
+        pending = [
+            prepared for prepared in group
+            if prepared["error"] is None and prepared["frames"] and prepared["description"] is None
+        ]
+        if self.batch_size > 1 and len(pending) > 1 and not self.clip_input:
             try:
-                result = self._process_chunk(
-                    video_path=video_path,
-                    start=start,
-                    end=end,
-                    asr_text=asr_text
+                descriptions = self.model.describe_frames_batch(
+                    frame_sets=[[f["image"] for f in prepared["frames"]] for prepared in pending],
+                    asr_contexts=[prepared["asr_text"] for prepared in pending],
+                    profile=pending[0]["profile"]
                 )
-                
-                if result:
-                    vlm_results.append(result)
-                    self.logger.debug(f"Chunk {chunk_num} description: {result['visual_description'][:80]}...")
-                    
+                for prepared, description in zip(pending, descriptions):
+                    prepared["generated"] = description
             except Exception as e:
-                self.logger.error(f"Failed to process chunk {chunk_num}: {e}")
-                # Continue with next chunk instead of failing entirely
-                continue
+                self.logger.warning(f"Batched VLM call failed ({e}), describing {len(pending)} chunks one at a time")
+        return [self._describe_chunk(prepared) for prepared in group]
+    
+    def _describe_chunk(self, prepared: Dict[str, Any]) -> Tuple[int, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Pipeline stage: describe a prepared chunk (model inference on the calling thread).
         
-        self.logger.info(f"VLM processing complete: {len(vlm_results)}/{total_chunks} chunks processed")
-        return {"vlm_results": vlm_results}
+        Returns:
+            (chunk index, result dict or None if the chunk failed / had no frames,
+            failure reason or None)
+        """
+        i = prepared["index"]
+        start, end = prepared["start"], prepared["end"]
+        self.logger.info(f"Processing chunk {i + 1}/{prepared['total']}: [{start:.2f}-{end:.2f}s]")
+        
+        if prepared["error"] is not None:
+            self.logger.error(f"Failed to process chunk {i + 1}: {prepared['error']}")
+            return i, None, f"preparation failed: {prepared['error']}"
+        try:
+            result = self._process_chunk(
+                start=start,
+                end=end,
+                frames=prepared["frames"],
+                asr_text=prepared["asr_text"],
+                media_id=prepared["media_id"],
+                frames_sampled=prepared["frames_sampled"],
+                hashes=prepared["hashes"],
+                context_key=prepared["context_key"],
+                description=prepared["description"],
+                generated=prepared["generated"],
+                profile=prepared["profile"]
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to process chunk {i + 1}: {e}")
+            # Continue with next chunk instead of failing entirely
+            return i, None, f"description failed: {e}"
+        return i, result, None if result else "no frames extracted"
     
     def _process_chunk(
         self,
-        video_path: str,
         start: float,
         end: float,
-        asr_text: str = None
+        frames: List[Dict[str, Any]],
+        asr_text: str = None,
+        media_id: str = None,
+        frames_sampled: int = None,
+        hashes: List[int] = None,
+        context_key: str = None,
+        description: str = None,
+        generated: str = None,
+        profile: VLMProfile = None
     ) -> Dict[str, Any]:
         """
-        Process a single chunk through VLM.
+        Process a single prepared chunk through VLM.
         
         Args:
-            video_path: Path to video file
             start: Chunk start time (seconds)
             end: Chunk end time (seconds)
+            frames: Keyframes for this chunk ({timestamp, image, path (if persisted)})
             asr_text: Optional ASR context
+            media_id: Media ID recorded with indexed descriptions
+            frames_sampled: Frames sampled before keyframe selection
+            hashes: Frame dHashes (empty if description reuse is disabled)
+            context_key: Reuse context key the hashes are indexed under
+            description: Reused description, if the chunk matched an indexed one
+            generated: Description already generated by a batched model call
+            profile: VLM profile (None = the model's default profile)
             
         Returns:
-            Dict with start, end, visual_description, asr_text, frame_count
+            Dict with start, end, visual_description, asr_text, frame_count,
+            frames_sampled, description_reused, vlm_profile
         """
-        # Sample frames for this chunk
-        frames = sample_frames(
-            video_path=video_path,
-            start_time=start,
-            end_time=end,
-            fps=self.FRAMES_PER_SECOND,
-            max_frames=self.MAX_FRAMES_PER_CHUNK,
-            output_dir=self.frames_output_dir
-        )
-        
         if not frames:
             self.logger.warning(f"No frames extracted for chunk [{start:.2f}-{end:.2f}s]")
             return None
         
-        frame_paths = [f["path"] for f in frames]
-        
-        # Generate visual description
-        description = self.model.describe_frames(
-            frame_paths=frame_paths,
-            asr_context=asr_text
-        )
+        profile = profile or self._resolve_profile(None)
+        description_reused = description is not None
+        if description is None:
+            # Generate visual description (frames are handed over in memory)
+            describe = self.model.describe_clip if self.clip_input else self.model.describe_frames
+            description = generated if generated is not None else describe(
+                frames=[f["image"] for f in frames],
+                asr_context=asr_text,
+                profile=profile
+            )
+            if hashes:
+                self.phash_index.store(context_key, hashes, description, media_id, start, end, asr_text=asr_text)
         
         return {
             "start": start,
             "end": end,
             "visual_description": description,
             "asr_text": asr_text,
-            "frame_count": len(frames)
+            "frame_count": len(frames),
+            "frames_sampled": frames_sampled if frames_sampled is not None else len(frames),
+            "description_reused": description_reused,
+            "vlm_profile": profile.name,
+            "committed": False
         }
+    
+    def _context_key(self, asr_text: str = None, profile: VLMProfile = None) -> str:
+        """
+        Key under which descriptions are reusable: model + profile + prompt template.
+
+        The ASR text itself is matched separately by the index (see phash.speech_key).
+        """
+        model_id = getattr(self.model, "model_path", type(self.model).__name__)
+        profile = profile or self._resolve_profile(None)
+        prompt = self.model.prompt_template(asr_text)
+        if self.clip_input:
+            prompt = f"[clip]\n{prompt}"
+        return hashlib.sha256(f"{model_id}\n{profile.name}\n{prompt}".encode("utf-8")).hexdigest()
+
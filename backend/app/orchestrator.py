@@ -5,7 +5,7 @@ from .state import AgentState
 
 from .llm import SLMWrapper
 from .asr import ASRWrapper
-from .vlm import VLMWrapper
+from .vlm import create_vlm
 from .nodes.chat_node import ChatNode
 from .nodes.asr_node import ASRNode
 from .nodes.intent_classifier_node import IntentClassifierNode
@@ -43,16 +43,17 @@ class AgentOrchestrator:
         # Instantiate models
         chat_model = SLMWrapper()
         asr_model = ASRWrapper()
-        vlm_model = VLMWrapper()
+        vlm_model = create_vlm()
 
         # Instantiate nodes
         chat_node = ChatNode(model=chat_model, name="chat_node")
         asr_node = ASRNode(model=asr_model)
         intent_classifier = IntentClassifierNode(model=chat_model)
         action_executor = ActionExecutorNode()
-        vlm_node = VLMNode(model=vlm_model)
         chunking_node = ChunkingNode()
         fusion_node = FusionNode()
+        # VLM commits fused chunks as it goes (resumable ingestion)
+        vlm_node = VLMNode(model=vlm_model, fusion=fusion_node)
 
         # Build graph
         graph = StateGraph(AgentState)
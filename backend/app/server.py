@@ -8,7 +8,6 @@ Hybrid FastAPI + ConnectRPC server.
 
 import asyncio
 import logging
-import os
 import sys
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -42,6 +41,7 @@ if not hasattr(aiosqlite.Connection, 'is_alive'):
 from .orchestrator import AgentOrchestrator
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from .config import CHAT_DB_PATH
+from .nodes.base_node import run_blocking, shutdown_executors
 
 # ConnectRPC imports - now using the gen folder in PYTHONPATH
 from obsidian.v1.obsidian_connect import (
@@ -76,6 +76,7 @@ async def lifespan(app: FastAPI):
         yield
 
     logger.info("Shutting down...")
+    shutdown_executors()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -91,6 +92,7 @@ class ChatRequest(BaseModel):
     message: str
     session_id: Optional[str] = None
     file_path: Optional[str] = None
+    vlm_profile: Optional[str] = None  # quality / balanced / fast (None = server default)
 
 
 class ChatResponse(BaseModel):
@@ -126,26 +128,34 @@ async def chat_endpoint(request: ChatRequest):
             inputs = {"messages": [HumanMessage(content=request.message)]}
 
             if request.file_path:
-                from .utils.file_utils import compute_sha256
-                ext = os.path.splitext(request.file_path)[1].lower()
+                from .utils.media_index import resolve_media_id
+                from .utils.media_probe import probe_media
 
-                new_media_id = compute_sha256(request.file_path)
+                new_media_id = await run_blocking("io", resolve_media_id, request.file_path)
                 logger.info(f"New file media_id: {new_media_id[:16]}...")
 
-                if ext in ['.wav', '.mp3', '.m4a', '.flac']:
+                # Media type from magic bytes + container streams (memoized by media_id)
+                try:
+                    media_type = (await run_blocking("probe", probe_media, request.file_path, new_media_id)).type
+                except RuntimeError as e:
+                    logger.warning(f"Could not probe {request.file_path}: {e}")
+                    media_type = "unknown"
+
+                if media_type == "audio":
                     logger.info(f"Injecting audio path: {request.file_path}")
                     inputs["audio_path"] = request.file_path
                     inputs["video_path"] = ""
                     inputs["media_id"] = new_media_id
                     inputs["vlm_processed"] = False
-                elif ext in ['.mp4', '.mkv', '.mov', '.avi']:
+                elif media_type == "video":
                     logger.info(f"Injecting video path: {request.file_path}")
                     inputs["video_path"] = request.file_path
                     inputs["audio_path"] = ""
                     inputs["media_id"] = new_media_id
                     inputs["vlm_processed"] = False
+                    inputs["vlm_profile"] = request.vlm_profile
                 else:
-                    logger.warning(f"Unsupported file type: {ext}")
+                    logger.warning(f"Unsupported file type: {media_type}")
 
             await orchestrator.graph.ainvoke(inputs, config=config)
         except Exception as e:
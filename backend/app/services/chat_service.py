@@ -5,7 +5,6 @@ Handles streaming chat responses from the LangGraph orchestrator.
 
 import asyncio
 import logging
-import os
 import sys
 from collections.abc import AsyncIterator
 from pathlib import Path
@@ -21,7 +20,9 @@ from connectrpc.request import RequestContext
 from obsidian.v1.obsidian_pb2 import ChatRequest, ChatResponse
 from obsidian.v1.obsidian_connect import ChatService
 from ..orchestrator import AgentOrchestrator
-from ..utils.file_utils import compute_sha256
+from ..nodes.base_node import run_blocking
+from ..utils.media_index import resolve_media_id
+from ..utils.media_probe import probe_media
 from langchain_core.messages import HumanMessage
 
 logger = logging.getLogger(__name__)
@@ -44,7 +45,7 @@ class ObsidianChatService(ChatService):
         Send a message and receive streaming AI response.
         
         Args:
-            request: ChatRequest with message, session_id, and optional file_path
+            request: ChatRequest with message, session_id, and optional file_path / vlm_profile
             ctx: Request context
             
         Yields:
@@ -69,26 +70,32 @@ class ObsidianChatService(ChatService):
                 # Check for file attachments
                 file_path = request.file_path if request.HasField("file_path") else None
                 if file_path:
-                    ext = os.path.splitext(file_path)[1].lower()
-
-                    # Compute new media_id from file hash
-                    new_media_id = compute_sha256(file_path)
+                    # Resolve media_id from the fingerprint index (hashes only on a miss)
+                    new_media_id = await run_blocking("io", resolve_media_id, file_path)
                     logger.info(f"New file media_id: {new_media_id[:16]}...")
 
-                    if ext in ['.wav', '.mp3', '.m4a', '.flac']:
+                    # Media type from magic bytes + container streams (memoized by media_id)
+                    try:
+                        media_type = (await run_blocking("probe", probe_media, file_path, new_media_id)).type
+                    except RuntimeError as e:
+                        logger.warning(f"Could not probe {file_path}: {e}")
+                        media_type = "unknown"
+
+                    if media_type == "audio":
                         logger.info(f"Injecting audio path: {file_path}")
                         inputs["audio_path"] = file_path
                         inputs["video_path"] = ""
                         inputs["media_id"] = new_media_id
                         inputs["vlm_processed"] = False
-                    elif ext in ['.mp4', '.mkv', '.mov', '.avi']:
+                    elif media_type == "video":
                         logger.info(f"Injecting video path: {file_path}")
                         inputs["video_path"] = file_path
                         inputs["audio_path"] = ""
                         inputs["media_id"] = new_media_id
                         inputs["vlm_processed"] = False
+                        inputs["vlm_profile"] = request.vlm_profile if request.HasField("vlm_profile") else None
                     else:
-                        logger.warning(f"Unsupported file type: {ext}")
+                        logger.warning(f"Unsupported file type: {media_type}")
 
                 if self.session_manager:
                     # Update session timestamp
@@ -26,6 +26,7 @@ class AgentState(TypedDict):
     processing_chunks: Optional[List[Dict[str, Any]]]  # Chunks pending VLM processing
     vlm_results: Optional[List[Dict[str, Any]]]        # VLM output per chunk
     vlm_processed: Optional[bool]                      # Flag indicating VLM stage complete
+    vlm_profile: Optional[str]                         # VLM profile for this ingestion (None = default)
 
     # Intent routing
     intent: Optional[str]            # "SUMMARIZE", "QUESTION", "EXPORT_SRT", "UNCLEAR"
@@ -1,13 +1,11 @@
 from langchain_core.tools import tool
-from ..vector_store import VectorStore
+from ..vector_store import get_vector_store
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Initialize VectorStore lazily or globally? 
-# Better to initialize inside or pass it. But tools usually need to be standalone.
-# We'll initialize a new client instance for simplicity or rely on a singleton if we had one.
-# For now, let's instantiate.
+# Tools stay standalone: they fetch the process-wide store (shared client and
+# embedding model) instead of opening a new one per call
 
 @tool
 def get_whole_transcript(media_id: str) -> str:
@@ -16,7 +14,7 @@ def get_whole_transcript(media_id: str) -> str:
     Useful when you need the complete text to summarize or answer questions about the whole file.
     """
     logger.info(f"Tool execution: get_whole_transcript for {media_id}")
-    store = VectorStore(collection_name="asr_segments")
+    store = get_vector_store("asr_segments")
     
     # Fetch all segments for this media_id
     # We can't easily "get all", but we can query by metadata
@@ -50,7 +48,7 @@ def export_transcript_srt(media_id: str) -> str:
     Useful when the user asks to export or see the SRT file.
     """
     logger.info(f"Tool execution: export_transcript_srt for {media_id}")
-    store = VectorStore(collection_name="asr_segments")
+    store = get_vector_store("asr_segments")
     
     results = store.get_by_metadata(where={"media_id": media_id})
     
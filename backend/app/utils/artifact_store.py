@@ -0,0 +1,238 @@
+"""
+Derived Artifact Store
+
+Content-addressed disk cache for artifacts derived from media (decoded audio,
+sampled frames). Artifacts are keyed by media_id + stage + stage parameters,
+so two different files with the same basename never collide, and re-running
+a stage with the same parameters reuses its output.
+
+Layout: {root}/{stage}/{media_id}/{params_hash}{suffix}
+
+Writes are atomic (temp file in the same directory, then os.replace), reads
+refresh the file's mtime, and the total size is kept under a byte budget by
+evicting least-recently-used artifacts. An in-memory index of (size, last
+use) is built once at startup, so eviction never rescans the cache tree; it
+trims to a low-water mark below the budget so the next writes do not
+immediately trigger another eviction.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_BYTES
+from .stores import LazySingleton
+
+logger = logging.getLogger(__name__)
+
+# Marker in temp file names (in-progress writes are never evicted or served)
+TMP_MARKER = ".tmp-"
+
+# Eviction trims the store to this fraction of its byte budget
+EVICT_LOW_WATER = 0.9
+
+
+class ArtifactStore:
+    """
+    Disk cache for derived media artifacts with an LRU byte budget.
+
+    Counters (see stats()): hits, misses, writes, evictions.
+    """
+
+    def __init__(self, root: str = ARTIFACT_CACHE_DIR, max_bytes: int = ARTIFACT_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(self.root, exist_ok=True)
+        # path -> (size, last use); the only full scan of the tree
+        self._index: Dict[str, Tuple[int, float]] = {path: (size, mtime) for path, size, mtime in self._scan()}
+        self._total_bytes = sum(size for size, _ in self._index.values())
+
+    @staticmethod
+    def params_key(params: Optional[Dict[str, Any]]) -> str:
+        """Stable hash of stage parameters."""
+        canonical = json.dumps(params or {}, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:24]
+
+    def path_for(self, media_id: str, stage: str, params: Optional[Dict[str, Any]] = None, suffix: str = "") -> str:
+        """Final path of an artifact (whether or not it exists)."""
+        return os.path.join(self.root, stage, media_id, f"{self.params_key(params)}{suffix}")
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def lookup(self, media_id: str, stage: str, params: Optional[Dict[str, Any]] = None, suffix: str = "") -> Optional[str]:
+        """
+        Return the artifact path on a hit (refreshing its LRU position), or None.
+        """
+        path = self.path_for(media_id, stage, params, suffix)
+        try:
+            os.utime(path)
+            size = os.path.getsize(path)
+        except OSError:
+            self._count("misses")
+            return None
+        with self._lock:
+            self._counters["hits"] += 1
+            self._track(path, size)
+        return path
+
+    def _track(self, path: str, size: int):
+        """Add or refresh an index entry (caller holds the lock)."""
+        previous = self._index.get(path)
+        if previous is not None:
+            self._total_bytes -= previous[0]
+        self._index[path] = (size, time.time())
+        self._total_bytes += size
+
+    def _untrack(self, path: str) -> int:
+        """Remove an index entry, returning its size (caller holds the lock)."""
+        size, _ = self._index.pop(path, (0, 0.0))
+        self._total_bytes -= size
+        return size
+
+    @contextmanager
+    def writer(self, media_id: str, stage: str, params: Optional[Dict[str, Any]] = None, suffix: str = "") -> Iterator[str]:
+        """
+        Yield a temp path to write the artifact to; it is published atomically
+        on success and discarded on error.
+
+        The temp path keeps `suffix` as its extension, so tools that infer the
+        output format from the file name (ffmpeg) can write to it directly.
+        """
+        final_path = self.path_for(media_id, stage, params, suffix)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        base = final_path[:-len(suffix)] if suffix else final_path
+        tmp_path = f"{base}{TMP_MARKER}{uuid.uuid4().hex[:8]}{suffix}"
+        try:
+            yield tmp_path
+            os.replace(tmp_path, final_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        size = os.path.getsize(final_path)
+        with self._lock:
+            self._counters["writes"] += 1
+            self._track(final_path, size)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def put_bytes(self, media_id: str, stage: str, data: bytes, params: Optional[Dict[str, Any]] = None, suffix: str = "") -> str:
+        """Store raw bytes as an artifact and return its path."""
+        with self.writer(media_id, stage, params, suffix) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        return self.path_for(media_id, stage, params, suffix)
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """List (path, size, mtime) of all published artifacts (startup only)."""
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if TMP_MARKER in name:
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Delete least-recently-used artifacts until the store is back under
+        EVICT_LOW_WATER of its budget.
+
+        Victims are picked from the in-memory index under the lock; files are
+        deleted after it is released, so readers and writers are not blocked
+        by disk I/O.
+
+        Returns:
+            Number of artifacts evicted
+        """
+        target = int(self.max_bytes * EVICT_LOW_WATER)
+        with self._lock:
+            victims = []
+            for path, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+                if self._total_bytes <= target:
+                    break
+                victims.append((path, size))
+                self._untrack(path)
+
+        evicted = 0
+        for path, size in victims:
+            try:
+                os.remove(path)
+                evicted += 1
+            except FileNotFoundError:
+                evicted += 1
+            except OSError as e:
+                # Still open elsewhere (Windows): keep it indexed, retry on a later eviction
+                logger.debug(f"Could not evict {path}: {e}")
+                with self._lock:
+                    if path not in self._index:
+                        self._track(path, size)
+
+        with self._lock:
+            self._counters["evictions"] += evicted
+            total = self._total_bytes
+        if evicted:
+            logger.info(f"Artifact store evicted {evicted} artifacts ({total / 1024 ** 2:.1f} MiB in use)")
+        return evicted
+
+    def invalidate(self, media_id: str, stage: str):
+        """Drop every artifact of a stage for one media file."""
+        media_dir = os.path.join(self.root, stage, media_id)
+        if not os.path.isdir(media_dir):
+            return
+        for name in os.listdir(media_dir):
+            if TMP_MARKER in name:
+                continue
+            path = os.path.join(media_dir, name)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            with self._lock:
+                self._untrack(path)
+
+    def invalidate_media(self, media_id: str):
+        """Drop every artifact of every stage for one media file."""
+        if not os.path.isdir(self.root):
+            return
+        for stage in os.listdir(self.root):
+            if os.path.isdir(os.path.join(self.root, stage)):
+                self.invalidate(media_id, stage)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/write/eviction counters and current disk usage."""
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_store: LazySingleton[ArtifactStore] = LazySingleton(ArtifactStore)
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide artifact store, creating it on first use."""
+    return _store.get()
@@ -0,0 +1,119 @@
+"""
+Audio Pre-Classifier
+
+Cheap signal-level check over decoded PCM that runs BEFORE Whisper. Media that
+is clearly silent, music or noise skips transcription entirely and goes
+straight to vision-driven chunking; anything that might contain speech is
+passed on to Whisper and the transcript heuristics in ASRNode.
+
+Features (vectorized over a bounded sample of 30 ms frames):
+- Loudness: 95th-percentile frame level (dBFS)
+- Zero-crossing rate: mean and spread (speech alternates voiced / unvoiced)
+- Spectral flatness: noise-likeness
+- Speech-band energy ratio: share of energy in 300-3400 Hz
+- Level modulation: spread of active frame levels (speech is bursty at the
+  syllable rate; sustained music and noise are steady)
+"""
+
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+from .audio_features import (
+    frame_signal, frame_power_spectrum, zero_crossing_rate, band_energy_ratio,
+    FRAME_LENGTH, HOP_LENGTH, BLOCK_FRAMES
+)
+
+logger = logging.getLogger(__name__)
+
+# Frames analysed at most (evenly spaced); ~10 minutes of 10 ms hops
+MAX_ANALYSIS_FRAMES = 60000
+
+# Verdict thresholds (deliberately conservative: only clear non-speech is skipped)
+SILENT_P95_DB = -55.0          # Loudest 5% of frames below this -> silent
+ACTIVE_MARGIN_DB = 25.0        # Frames within this of the p95 level count as active
+MIN_SPEECH_BAND_RATIO = 0.25   # Speech carries much of its energy in 300-3400 Hz
+MAX_NOISE_FLATNESS = 0.45      # Median flatness above this -> broadband noise
+MIN_LEVEL_SPREAD_DB = 4.0      # Speech level varies strongly frame to frame
+MIN_ZCR_SPREAD = 0.03          # Voiced/unvoiced alternation in speech
+
+
+def _frame_features(audio: np.ndarray, sample_rate: int) -> Dict[str, np.ndarray]:
+    """Per-frame level, ZCR, flatness and speech-band ratio over sampled frames."""
+    frames = frame_signal(audio, FRAME_LENGTH, HOP_LENGTH)
+    n = len(frames)
+    if n > MAX_ANALYSIS_FRAMES:
+        indices = np.linspace(0, n - 1, MAX_ANALYSIS_FRAMES).astype(np.int64)
+    else:
+        indices = np.arange(n)
+
+    level_db, zcr, flatness, speech_band = [], [], [], []
+    for i in range(0, len(indices), BLOCK_FRAMES):
+        block = frames[indices[i:i + BLOCK_FRAMES]]
+        rms = np.sqrt(np.mean(np.square(block, dtype=np.float32), axis=1))
+        level_db.append(20.0 * np.log10(rms + 1e-10))
+        zcr.append(zero_crossing_rate(block))
+
+        power = frame_power_spectrum(block) + 1e-10
+        flatness.append(np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1))
+        speech_band.append(band_energy_ratio(power, sample_rate, 300.0, 3400.0))
+
+    return {
+        "level_db": np.concatenate(level_db),
+        "zcr": np.concatenate(zcr),
+        "flatness": np.concatenate(flatness),
+        "speech_band": np.concatenate(speech_band),
+    }
+
+
+def preclassify_audio(audio: np.ndarray, sample_rate: int) -> Dict[str, Any]:
+    """
+    Classify decoded audio before transcription.
+
+    Args:
+        audio: Mono float32 samples
+        sample_rate: Sample rate of `audio`
+
+    Returns:
+        dict with "verdict" ("speech", "silent", "music_or_noise" or "noise";
+        "speech" means "possibly speech, run Whisper") and "features" (summary values)
+    """
+    if len(audio) < FRAME_LENGTH:
+        return {"verdict": "silent", "features": {"duration": len(audio) / sample_rate}}
+
+    feats = _frame_features(audio, sample_rate)
+    p95_db = float(np.percentile(feats["level_db"], 95))
+
+    features: Dict[str, Any] = {
+        "duration": round(len(audio) / sample_rate, 2),
+        "p95_level_db": round(p95_db, 1),
+    }
+
+    if p95_db < SILENT_P95_DB:
+        return {"verdict": "silent", "features": features}
+
+    # Only characterise frames that carry signal
+    active = feats["level_db"] > p95_db - ACTIVE_MARGIN_DB
+    active_level = feats["level_db"][active]
+    features.update({
+        "active_ratio": round(float(active.mean()), 3),
+        "level_spread_db": round(float(np.std(active_level)), 2),
+        "zcr_mean": round(float(np.mean(feats["zcr"][active])), 3),
+        "zcr_spread": round(float(np.std(feats["zcr"][active])), 3),
+        "flatness_median": round(float(np.median(feats["flatness"][active])), 3),
+        "speech_band_ratio": round(float(np.mean(feats["speech_band"][active])), 3),
+    })
+
+    if features["flatness_median"] > MAX_NOISE_FLATNESS:
+        verdict = "noise"
+    elif features["speech_band_ratio"] < MIN_SPEECH_BAND_RATIO:
+        verdict = "music_or_noise"
+    elif features["level_spread_db"] < MIN_LEVEL_SPREAD_DB and features["zcr_spread"] < MIN_ZCR_SPREAD:
+        # Steady level and steady timbre: sustained music / hum, not conversation
+        verdict = "music_or_noise"
+    else:
+        verdict = "speech"
+
+    logger.info(f"Audio pre-classifier verdict: {verdict} ({features})")
+    return {"verdict": verdict, "features": features}
@@ -0,0 +1,145 @@
+"""
+Audio Features
+
+Vectorized frame-level features over decoded PCM (see audio_source.decode_audio).
+Frames are strided views into the signal, so no per-frame copies are made.
+"""
+
+import logging
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Default analysis frame: 30 ms window, 10 ms hop at 16 kHz
+FRAME_LENGTH = 480
+HOP_LENGTH = 160
+
+# Frames processed per block; bounds temporary memory on multi-hour signals
+BLOCK_FRAMES = 8192
+
+
+def frame_signal(audio: np.ndarray, frame_length: int = FRAME_LENGTH, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Split a 1-D signal into overlapping frames without copying.
+
+    Returns:
+        Read-only view of shape (n_frames, frame_length); empty if the signal
+        is shorter than one frame
+    """
+    if len(audio) < frame_length:
+        return np.empty((0, frame_length), dtype=audio.dtype)
+    windows = np.lib.stride_tricks.sliding_window_view(audio, frame_length)
+    return windows[::hop_length]
+
+
+def _blockwise(
+    audio: np.ndarray,
+    func: Callable[[np.ndarray], np.ndarray],
+    frame_length: int,
+    hop_length: int,
+    block_frames: int = BLOCK_FRAMES
+) -> np.ndarray:
+    """Apply a per-frame reduction over blocks of frames and concatenate the results."""
+    frames = frame_signal(audio, frame_length, hop_length)
+    if not len(frames):
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate([
+        func(frames[i:i + block_frames]) for i in range(0, len(frames), block_frames)
+    ]).astype(np.float32, copy=False)
+
+
+def frame_rms(audio: np.ndarray, frame_length: int = FRAME_LENGTH, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """Root-mean-square energy per frame."""
+    return _blockwise(
+        audio,
+        lambda frames: np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1)),
+        frame_length, hop_length
+    )
+
+
+def frame_power_spectrum(frames: np.ndarray) -> np.ndarray:
+    """Hann-windowed power spectrum of a block of frames, shape (n_frames, frame_length // 2 + 1)."""
+    window = np.hanning(frames.shape[1]).astype(np.float32)
+    return np.square(np.abs(np.fft.rfft(frames * window, axis=1)))
+
+
+def spectral_flatness(audio: np.ndarray, frame_length: int = FRAME_LENGTH, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Spectral flatness per frame (geometric / arithmetic mean of the power spectrum).
+
+    Near 1.0 for white noise, near 0.0 for tonal or voiced sound.
+    """
+    def flatness(frames: np.ndarray) -> np.ndarray:
+        power = frame_power_spectrum(frames) + 1e-10
+        return np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+    return _blockwise(audio, flatness, frame_length, hop_length)
+
+
+def zero_crossing_rate(frames: np.ndarray) -> np.ndarray:
+    """Fraction of adjacent-sample sign changes per frame."""
+    signs = np.signbit(frames)
+    return np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+
+def band_energy_ratio(power: np.ndarray, sample_rate: int, low_hz: float, high_hz: float) -> np.ndarray:
+    """Fraction of each frame's spectral energy inside [low_hz, high_hz]."""
+    n_fft = (power.shape[1] - 1) * 2
+    freqs = np.fft.rfftfreq(n_fft, d=1.0 / sample_rate)
+    band = (freqs >= low_hz) & (freqs <= high_hz)
+    return power[:, band].sum(axis=1) / (power.sum(axis=1) + 1e-10)
+
+
+def split_on_silence(
+    audio: np.ndarray,
+    sample_rate: int,
+    window_seconds: float = 60.0,
+    search_seconds: float = 5.0,
+    hop_length: int = HOP_LENGTH,
+    frame_length: int = FRAME_LENGTH
+) -> List[Tuple[int, int]]:
+    """
+    Split a signal into ~window_seconds windows, cutting at the quietest frame
+    within +/- search_seconds of each nominal boundary.
+
+    The search never reaches back past half a window from the previous cut,
+    nor so close to the end that less than half a window would remain, so
+    every window (except a signal shorter than one window) is at least
+    window_seconds / 2 long, whatever search_seconds is.
+
+    The layout depends only on the signal and the parameters, so transcribing
+    the windows in any order (or on any number of workers) is deterministic.
+
+    Returns:
+        List of (start_sample, end_sample) covering the whole signal
+    """
+    total = len(audio)
+    window = int(window_seconds * sample_rate)
+    if window <= 0 or total <= window:
+        return [(0, total)]
+
+    rms = frame_rms(audio, frame_length, hop_length)
+    search = int(search_seconds * sample_rate)
+    min_window = window // 2
+
+    bounds = [0]
+    while total - bounds[-1] > window:
+        start = bounds[-1]
+        # Cut range in samples: [start + window/2, start + window + search],
+        # leaving at least window/2 for the rest of the signal
+        lo_sample = max(start + window - search, start + min_window)
+        hi_sample = min(start + window + search, total - min_window)
+        lo = -(-lo_sample // hop_length)
+        hi = min(len(rms), hi_sample // hop_length + 1)
+        if lo >= hi:
+            cut = start + window
+        else:
+            # Cut in the middle of the quietest frame
+            cut = (lo + int(np.argmin(rms[lo:hi]))) * hop_length + frame_length // 2
+        cut = min(max(cut, lo_sample), hi_sample)
+        bounds.append(cut)
+    bounds.append(total)
+
+    return list(zip(bounds[:-1], bounds[1:]))
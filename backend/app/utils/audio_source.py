@@ -0,0 +1,80 @@
+"""
+Audio Source
+
+Decodes audio from any ffmpeg-readable input (audio or video container)
+straight into a NumPy float32 array via a pipe:
+
+    ffmpeg -i <media> -vn -f f32le -ar 16000 -ac 1 pipe:1
+
+ffmpeg resamples and downmixes once; the stdout buffer is wrapped with
+np.frombuffer (no extra copy) and fed directly to WhisperPipeline.generate.
+No temporary WAV file is written and no second resample is done.
+"""
+
+import logging
+import subprocess
+from typing import Optional
+
+import numpy as np
+
+from .ffmpeg_utils import ensure_ffmpeg_in_path
+
+logger = logging.getLogger(__name__)
+
+# Whisper expects 16 kHz mono float32 PCM
+SAMPLE_RATE = 16000
+
+
+def decode_audio(
+    media_path: str,
+    sample_rate: int = SAMPLE_RATE,
+    start_time: Optional[float] = None,
+    duration: Optional[float] = None,
+    timeout: int = 600
+) -> np.ndarray:
+    """
+    Decode an audio or video file to mono float32 PCM.
+
+    Args:
+        media_path: Path to audio or video file
+        sample_rate: Output sample rate (default 16 kHz for Whisper)
+        start_time: Optional start offset in seconds
+        duration: Optional duration to decode in seconds
+        timeout: ffmpeg timeout in seconds
+
+    Returns:
+        1-D float32 array of samples in [-1, 1] (read-only view over ffmpeg's output)
+
+    Raises:
+        RuntimeError: If ffmpeg fails, times out, or the file has no audio stream
+    """
+    ensure_ffmpeg_in_path()
+
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error"]
+    if start_time:
+        cmd += ["-ss", f"{start_time:.3f}"]
+    cmd += ["-i", media_path]
+    if duration is not None:
+        cmd += ["-t", f"{duration:.3f}"]
+    cmd += [
+        "-vn",                    # No video
+        "-f", "f32le",            # Raw little-endian float32
+        "-acodec", "pcm_f32le",
+        "-ar", str(sample_rate),  # Resample once, inside ffmpeg
+        "-ac", "1",               # Mono
+        "pipe:1"
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True, timeout=timeout)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffmpeg audio decode failed: {e.stderr.decode(errors='replace').strip() if e.stderr else e}")
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"ffmpeg audio decode timed out after {timeout}s")
+
+    if not result.stdout:
+        raise RuntimeError(f"No audio samples decoded from {media_path}")
+
+    audio = np.frombuffer(result.stdout, dtype=np.float32)
+    logger.info(f"Decoded {len(audio) / sample_rate:.2f}s of audio from {media_path}")
+    return audio
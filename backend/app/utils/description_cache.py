@@ -0,0 +1,114 @@
+"""
+VLM Description Cache
+
+Durable, exact-match cache of generated visual descriptions, stored next to
+the chat database. Re-running ingestion (after `multimodal_chunks` is cleared,
+or with different chunking parameters) only pays for chunks whose inputs
+actually changed.
+
+A description is keyed by everything that determines the model's output:
+the frame set (hash of the decoded pixels, in order), the prompt template,
+the ASR context, the model path / version and `max_new_tokens`. Generation is
+greedy, so an identical key always yields the same text.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from PIL import Image
+
+from ..config import VLM_DESCRIPTION_CACHE_DB_PATH
+from .stores import LazySingleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+def hash_images(images: Sequence[Image.Image]) -> str:
+    """SHA-256 over the size, mode and pixels of each image, in order."""
+    digest = hashlib.sha256()
+    for image in images:
+        digest.update(f"{image.mode}:{image.size[0]}x{image.size[1]};".encode("ascii"))
+        digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def description_key(
+    frames_hash: str,
+    prompt_template: str,
+    asr_context: Optional[str],
+    model_version: str,
+    max_new_tokens: int
+) -> str:
+    """Cache key for one describe_frames call."""
+    parts = [
+        frames_hash,
+        hashlib.sha256(prompt_template.encode("utf-8")).hexdigest(),
+        hashlib.sha256((asr_context or "").encode("utf-8")).hexdigest(),
+        model_version,
+        str(max_new_tokens),
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class DescriptionCache(SQLiteStore):
+    """
+    SQLite-backed cache of VLM descriptions.
+
+    Counters (see stats()): lookups, hits, writes.
+    """
+
+    def __init__(self, db_path: str = VLM_DESCRIPTION_CACHE_DB_PATH):
+        self._counters = {"lookups": 0, "hits": 0, "writes": 0}
+        super().__init__(db_path)
+
+    def _init_db(self):
+        """Initialize the descriptions table."""
+        with self._lock, self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS vlm_descriptions (
+                    key TEXT PRIMARY KEY,
+                    model_version TEXT NOT NULL,
+                    max_new_tokens INTEGER NOT NULL,
+                    description TEXT NOT NULL,
+                    created_at INTEGER NOT NULL
+                )
+            """)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached description for a key, or None."""
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT description FROM vlm_descriptions WHERE key = ?", (key,)).fetchone()
+            self._counters["lookups"] += 1
+            if row:
+                self._counters["hits"] += 1
+        return row[0] if row else None
+
+    def put(self, key: str, description: str, model_version: str, max_new_tokens: int):
+        """Store a generated description (replacing any previous entry for the key)."""
+        now = int(time.time() * 1000)
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO vlm_descriptions "
+                "(key, model_version, max_new_tokens, description, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model_version, max_new_tokens, description, now)
+            )
+            self._counters["writes"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup / hit / write counters since process start."""
+        with self._lock:
+            lookups = self._counters["lookups"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache: LazySingleton[DescriptionCache] = LazySingleton(DescriptionCache)
+
+
+def get_description_cache() -> DescriptionCache:
+    """Return the process-wide description cache, creating it on first use."""
+    return _cache.get()
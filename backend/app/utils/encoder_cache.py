@@ -0,0 +1,135 @@
+"""
+Vision Encoder Cache
+
+Reuses SmolVLM2 vision-tower outputs across chunks of one ingestion.
+Vision-driven chunks overlap (4s windows, 1s overlap), so frames at shared
+timestamps are decoded to identical pixels and would otherwise run through
+the vision encoder once per chunk.
+
+The cache wraps the model's `get_vision_embeddings` (optimum-intel
+OVModelForVisualCausalLM). The processor resizes and splits every frame into
+tiles before the encoder sees it, so entries are keyed by a hash of each
+tile's pixels (plus its attention mask) rather than by frame timestamp.
+A tile hit skips the encoder and connector; only missing tiles are
+encoded, and the language model still runs for every chunk. Entries live
+in a small in-memory LRU that VLMNode clears at the start and end of each
+ingestion.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VisionEmbeddingCache:
+    """
+    LRU of per-tile vision embeddings.
+
+    Counters (see stats()): tiles, hits.
+    """
+
+    def __init__(self, max_tiles: int):
+        self.max_tiles = max_tiles
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"tiles": 0, "hits": 0}
+        self._original: Optional[Callable[..., Any]] = None
+
+    def attach(self, model: Any) -> bool:
+        """
+        Route the model's get_vision_embeddings through this cache.
+
+        Returns:
+            False if the model has no get_vision_embeddings (nothing attached)
+        """
+        original = getattr(model, "get_vision_embeddings", None)
+        if original is None or self.max_tiles <= 0:
+            return False
+        self._original = original
+
+        def get_vision_embeddings(pixel_values=None, *args, **kwargs):
+            return self._get_vision_embeddings(pixel_values, *args, **kwargs)
+
+        model.get_vision_embeddings = get_vision_embeddings
+        return True
+
+    def clear(self):
+        """Drop all cached embeddings (new ingestion)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get_vision_embeddings(self, pixel_values, *args, **kwargs):
+        # Decode steps and text-only calls pass through untouched
+        input_ids = kwargs.get("input_ids")
+        decoding = input_ids is not None and input_ids.shape[1] == 1 and kwargs.get("past_key_values") is not None
+        if pixel_values is None or args or decoding or getattr(pixel_values, "ndim", 0) != 5:
+            return self._original(pixel_values, *args, **kwargs)
+        try:
+            return self._cached_embeddings(pixel_values, **kwargs)
+        except Exception as e:
+            logger.warning(f"Vision encoder cache bypassed: {e}")
+            return self._original(pixel_values, **kwargs)
+
+    def _cached_embeddings(self, pixel_values, **kwargs):
+        import torch
+
+        batch_size, num_images = pixel_values.shape[:2]
+        tiles = pixel_values.reshape(batch_size * num_images, *pixel_values.shape[2:])
+        mask = kwargs.get("pixel_attention_mask")
+        masks = mask.reshape(batch_size * num_images, *mask.shape[2:]) if mask is not None else None
+
+        # Padding tiles (all zeros) produce no embeddings, as in the model itself
+        real = [i for i in range(tiles.shape[0]) if bool(tiles[i].any())]
+        if not real:
+            return self._original(pixel_values, **kwargs)
+        keys = [self._tile_key(tiles[i], masks[i] if masks is not None else None) for i in real]
+
+        with self._lock:
+            cached = [self._entries.get(key) for key in keys]
+            for key, value in zip(keys, cached):
+                if value is not None:
+                    self._entries.move_to_end(key)
+        missing = [j for j, value in enumerate(cached) if value is None]
+
+        if missing:
+            sub_kwargs = dict(kwargs)
+            sub_tiles = tiles[[real[j] for j in missing]].unsqueeze(0)
+            if masks is not None:
+                sub_kwargs["pixel_attention_mask"] = masks[[real[j] for j in missing]].unsqueeze(0)
+            encoded = self._original(sub_tiles, **sub_kwargs)
+            if encoded is None or encoded.shape[0] != len(missing):
+                raise RuntimeError("unexpected vision embedding layout")
+            with self._lock:
+                for j, row in zip(missing, encoded):
+                    cached[j] = row
+                    self._entries[keys[j]] = row
+                while len(self._entries) > self.max_tiles:
+                    self._entries.popitem(last=False)
+
+        with self._lock:
+            self._counters["tiles"] += len(keys)
+            self._counters["hits"] += len(keys) - len(missing)
+        return torch.stack(cached)
+
+    @staticmethod
+    def _tile_key(tile, mask) -> str:
+        digest = hashlib.sha256()
+        digest.update(str(tuple(tile.shape)).encode("ascii"))
+        digest.update(tile.detach().cpu().contiguous().numpy().tobytes())
+        if mask is not None:
+            digest.update(mask.detach().cpu().contiguous().numpy().tobytes())
+        return digest.hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        """Tile / hit counters since process start."""
+        with self._lock:
+            tiles = self._counters["tiles"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "hit_rate": round(self._counters["hits"] / tiles, 3) if tiles else 0.0,
+            }
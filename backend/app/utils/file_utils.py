@@ -1,10 +1,108 @@
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 
-def compute_sha256(file_path: str) -> str:
+# Read buffer for hashing. Large enough that multi-GB recordings are hashed
+# with a few thousand syscalls instead of millions of 4K reads.
+HASH_BUFFER_SIZE = 1024 * 1024
+
+
+def compute_sha256(file_path: str, buffer_size: int = HASH_BUFFER_SIZE) -> str:
     """Compute SHA-256 hash of a file"""
     sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        # Read and update hash string value in blocks of 4K
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(file_path, "rb", buffering=0) as f:
+        # Read into a reusable buffer to avoid allocating a new bytes object per block
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(view[:n])
     return sha256_hash.hexdigest()
+
+
+# Segment size for the parallel tree hash. Each segment is hashed on its own
+# thread (hashlib releases the GIL for large updates) and the segment digests
+# are combined into a single root digest.
+TREE_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Size of each sampled block (head / middle / tail) used by the quick ID.
+QUICK_SAMPLE_SIZE = 1024 * 1024
+
+
+def _hash_segment(file_path: str, offset: int, length: int, buffer_size: int = HASH_BUFFER_SIZE) -> bytes:
+    """Hash `length` bytes starting at `offset` (own file handle, safe to run in parallel)."""
+    segment_hash = hashlib.sha256()
+    buffer = bytearray(min(buffer_size, max(length, 1)))
+    view = memoryview(buffer)
+    remaining = length
+    with open(file_path, "rb", buffering=0) as f:
+        f.seek(offset)
+        while remaining > 0:
+            n = f.readinto(view[:min(len(buffer), remaining)])
+            if not n:
+                break
+            segment_hash.update(view[:n])
+            remaining -= n
+    return segment_hash.digest()
+
+
+def compute_tree_sha256(
+    file_path: str,
+    segment_size: int = TREE_SEGMENT_SIZE,
+    max_workers: int = None
+) -> str:
+    """
+    Compute a chunked tree hash of a file using parallel threads.
+
+    The file is split into fixed-size segments, each segment is SHA-256 hashed
+    concurrently, and the root is SHA-256 over (file size, segment size, segment
+    digests). The result is NOT equal to compute_sha256() of the same file.
+    """
+    size = os.path.getsize(file_path)
+    offsets = list(range(0, size, segment_size)) or [0]
+
+    if max_workers is None:
+        max_workers = min(len(offsets), os.cpu_count() or 1, 8)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tree-hash") as pool:
+        digests = list(pool.map(
+            lambda offset: _hash_segment(file_path, offset, min(segment_size, size - offset)),
+            offsets
+        ))
+
+    root_hash = hashlib.sha256(b"obsidian-tree-v1")
+    root_hash.update(size.to_bytes(8, "little"))
+    root_hash.update(segment_size.to_bytes(8, "little"))
+    for digest in digests:
+        root_hash.update(digest)
+    return root_hash.hexdigest()
+
+
+def compute_quick_id(file_path: str, sample_size: int = QUICK_SAMPLE_SIZE) -> str:
+    """
+    Compute a fast, sampled file ID from the size plus head, middle and tail blocks.
+
+    Reads at most 3 * sample_size bytes regardless of file size. This is NOT a
+    full content hash; two files differing only outside the sampled blocks will
+    collide, so callers should verify it against a full digest afterwards.
+    """
+    size = os.path.getsize(file_path)
+    quick_hash = hashlib.sha256(b"obsidian-quick-v1")
+    quick_hash.update(size.to_bytes(8, "little"))
+
+    if size <= 3 * sample_size:
+        offsets = [(0, size)]
+    else:
+        offsets = [
+            (0, sample_size),
+            (size // 2 - sample_size // 2, sample_size),
+            (size - sample_size, sample_size),
+        ]
+
+    with open(file_path, "rb") as f:
+        for offset, length in offsets:
+            f.seek(offset)
+            quick_hash.update(f.read(length))
+    return quick_hash.hexdigest()
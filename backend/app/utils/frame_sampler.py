@@ -1,17 +1,22 @@
 """
 Frame Sampler Utility
 
-Extracts frames from video files using ffmpeg (via imageio_ffmpeg fallback).
-Uses OpenCV for video metadata (duration, dimensions).
-Frames are persisted for debugging and potential re-processing.
+Extracts frames from video files with OpenCV: all requested timestamps of a
+video are decoded in one sequential pass (grab / retrieve, seeking only across
+long gaps) instead of one ffmpeg process per frame.
+Video metadata (duration, dimensions) comes from a memoized header probe.
+Frames are handed to the VLM in memory as RGB arrays. Persisting them as JPEG
+(artifact store cache, or a debug directory) is optional.
 """
 
 import os
-import subprocess
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from .ffmpeg_utils import ensure_ffmpeg_in_path
+from .artifact_store import get_artifact_store
+from ..config import FRAME_CACHE_ENABLED
+from .media_index import resolve_media_id
+from .media_probe import probe_media
 
 logger = logging.getLogger(__name__)
 
@@ -27,25 +32,334 @@ def _get_cv2():
             _cv2 = cv2
         except ImportError:
             raise ImportError(
-                "OpenCV is required for video metadata. "
+                "OpenCV is required for frame extraction and video metadata. "
                 "Install with: pip install opencv-python"
             )
     return _cv2
 
 
+# Artifact store stage for persisted frames (OpenCV JPEG quality, 0-100)
+FRAMES_ARTIFACT_STAGE = "frames"
+FRAME_JPEG_QUALITY = 95
+
+# Gaps longer than this are crossed with a seek; shorter ones by grabbing
+# (decoding without converting) frames sequentially
+SEEK_GAP_SECONDS = 10.0
+
+
+def frame_timestamps(start_time: float, end_time: float, fps: float = 1.0, max_frames: int = 12) -> List[float]:
+    """
+    Evenly spaced sample timestamps within [start_time, end_time].
+
+    Returns:
+        min(duration * fps + 1, max_frames) timestamps, including both ends
+    """
+    duration = end_time - start_time
+    total_frames = min(int(duration * fps) + 1, max_frames)
+
+    if total_frames <= 0:
+        logger.warning(f"No frames to extract: duration={duration}, fps={fps}")
+        return []
+    if total_frames == 1:
+        return [start_time]
+    step = duration / (total_frames - 1)
+    return [start_time + i * step for i in range(total_frames)]
+
+
+def iter_video_frames(
+    video_path: str,
+    timestamps: Iterable[float],
+    seek_gap: float = SEEK_GAP_SECONDS,
+    max_edge: Optional[int] = None
+) -> Iterator[Tuple[float, Any]]:
+    """
+    Decode the frames at the given timestamps in a single pass over the video.
+
+    Timestamps are visited in ascending order. Frames between targets are only
+    grabbed (no colour conversion); gaps longer than `seek_gap` seconds are
+    skipped with a seek instead.
+
+    Args:
+        video_path: Path to video file
+        timestamps: Timestamps in seconds (any order)
+        seek_gap: Gap (seconds) above which the decoder seeks instead of grabbing
+        max_edge: Downscale frames so their longest edge is at most this many pixels
+
+    Yields:
+        (timestamp, BGR frame as a numpy array), ascending by timestamp;
+        timestamps past the end of the stream are not yielded
+
+    Raises:
+        RuntimeError: If the video cannot be opened
+    """
+    cv2 = _get_cv2()
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Failed to open video: {video_path}")
+
+    try:
+        video_fps = cap.get(cv2.CAP_PROP_FPS)
+        if video_fps <= 0:
+            raise RuntimeError(f"Invalid FPS ({video_fps}) for video: {video_path}")
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        seek_gap_frames = max(1, int(seek_gap * video_fps))
+
+        nominal_duration = frame_count / video_fps if frame_count > 0 else 0.0
+
+        position = 0  # Index of the frame the next grab() returns
+        last_index, last_frame = -1, None
+        targets = sorted(timestamps)
+        for n, ts in enumerate(targets):
+            index = int(round(ts * video_fps))
+            if frame_count > 0:
+                index = min(index, frame_count - 1)
+
+            if index == last_index:
+                yield ts, last_frame
+                continue
+
+            if index < position or index - position > seek_gap_frames:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                position = index
+
+            while position < index and cap.grab():
+                position += 1
+            if position < index or not cap.grab():
+                # Container frame counts can overstate the stream; timestamps up to
+                # the nominal duration get the final decodable frame (as ffmpeg -ss does)
+                logger.debug(f"End of stream before {ts:.2f}s in {video_path}")
+                final_frame = _read_frame_at(cap, position - 1) if position > 0 else None
+                if final_frame is not None:
+                    final_frame = _downscale(final_frame, max_edge)
+                if final_frame is not None:
+                    for tail_ts in targets[n:]:
+                        if tail_ts <= nominal_duration + 1.0 / video_fps:
+                            yield tail_ts, final_frame
+                break
+            position += 1
+
+            ok, frame = cap.retrieve()
+            if not ok:
+                logger.warning(f"Failed to decode frame at {ts:.2f}s")
+                continue
+            frame = _downscale(frame, max_edge)
+            last_index, last_frame = index, frame
+            yield ts, frame
+    finally:
+        cap.release()
+
+
+def _downscale(frame: Any, max_edge: Optional[int]) -> Any:
+    """Shrink a frame (area interpolation) so its longest edge is at most max_edge; never upscales."""
+    if not max_edge:
+        return frame
+    h, w = frame.shape[:2]
+    scale = max_edge / max(h, w)
+    if scale >= 1.0:
+        return frame
+    cv2 = _get_cv2()
+    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _read_frame_at(cap: Any, index: int) -> Optional[Any]:
+    """Seek to a frame index and decode it (None if that fails)."""
+    cv2 = _get_cv2()
+    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+    if not cap.grab():
+        return None
+    ok, frame = cap.retrieve()
+    return frame if ok else None
+
+
+def _write_jpeg(frame: Any, path: str):
+    """Encode a BGR frame to JPEG at `path`."""
+    cv2 = _get_cv2()
+    if not cv2.imwrite(path, frame, [cv2.IMWRITE_JPEG_QUALITY, FRAME_JPEG_QUALITY]):
+        raise RuntimeError(f"Failed to write frame to {path}")
+
+
+def _read_rgb(path: str) -> Optional[Any]:
+    """Load a persisted frame as an RGB array (None if unreadable)."""
+    cv2 = _get_cv2()
+    frame = cv2.imread(path)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) if frame is not None else None
+
+
+def iter_frames_for_chunks(
+    video_path: str,
+    windows: Sequence[Tuple[float, float]],
+    fps: float = 1.0,
+    max_frames: int = 12,
+    output_dir: Optional[str] = None,
+    media_id: Optional[str] = None,
+    cache: bool = FRAME_CACHE_ENABLED,
+    max_edge: Optional[int] = None
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Sample frames for many time windows with one decoding pass.
+
+    All timestamps of all windows are decoded together by iter_video_frames and
+    handed over in memory as RGB arrays (no JPEG round-trip). Each window is
+    yielded as soon as all of its frames are available, so callers can process
+    early windows while later ones are still being decoded; a decoded frame is
+    released once every window that uses it has been yielded.
+
+    Args:
+        video_path: Path to video file
+        windows: (start_time, end_time) per chunk
+        fps: Frames per second to extract per window
+        max_frames: Maximum frames per window (SmolVLM2 limit)
+        output_dir: Optional debug sink; frames are also written here as JPEG
+        media_id: Content-derived media ID (artifact key, resolved from video_path if omitted)
+        cache: Reuse / persist frames in the artifact store (JPEG)
+        max_edge: Downscale at decode time so the longest edge is at most this
+            (e.g. the VLM processor's target size); None keeps the source resolution
+
+    Yields:
+        (window index, [{timestamp, image, path (if persisted)}, ...]) in order of completion
+    """
+    keys_per_window = [
+        [round(ts, 3) for ts in frame_timestamps(start, end, fps, max_frames)]
+        for start, end in windows
+    ]
+
+    # Windows still to be yielded that use each timestamp
+    uses: Dict[float, int] = {}
+    for keys in keys_per_window:
+        for key in set(keys):
+            uses[key] = uses.get(key, 0) + 1
+
+    store = None
+    if cache:
+        store = get_artifact_store()
+        if media_id is None:
+            media_id = resolve_media_id(video_path)
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        video_name = os.path.splitext(os.path.basename(video_path))[0]
+
+    images: Dict[float, Any] = {}
+    paths: Dict[float, str] = {}
+    if store is not None:
+        for key in sorted(uses):
+            params = {"timestamp": key, "quality": FRAME_JPEG_QUALITY, "max_edge": max_edge}
+            cached = store.lookup(media_id, FRAMES_ARTIFACT_STAGE, params, ".jpg")
+            if cached:
+                paths[key] = cached
+
+    # Unresolved timestamp count per window, and the windows waiting on each timestamp
+    waiting: Dict[float, List[int]] = {}
+    unresolved = []
+    for i, keys in enumerate(keys_per_window):
+        missing = {key for key in keys if key not in paths}
+        unresolved.append(len(missing))
+        for key in missing:
+            waiting.setdefault(key, []).append(i)
+
+    def window_frames(i: int) -> List[Dict[str, Any]]:
+        frames = []
+        for key in keys_per_window[i]:
+            if key not in images and key in paths:
+                images[key] = _read_rgb(paths[key])
+            if images.get(key) is None:
+                continue
+            frame = {"timestamp": key, "image": images[key]}
+            if key in paths:
+                frame["path"] = paths[key]
+            frames.append(frame)
+        return frames
+
+    def release(i: int):
+        for key in set(keys_per_window[i]):
+            uses[key] -= 1
+            if uses[key] == 0:
+                images.pop(key, None)
+
+    emitted = set()
+    for i, count in enumerate(unresolved):
+        if count == 0:
+            emitted.add(i)
+            yield i, window_frames(i)
+            release(i)
+
+    if waiting:
+        cv2 = _get_cv2()
+        for key, frame in iter_video_frames(video_path, waiting.keys(), max_edge=max_edge):
+            images[key] = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+            # Optional disk sinks (JPEG); failures never block the in-memory handoff
+            params = {"timestamp": key, "quality": FRAME_JPEG_QUALITY, "max_edge": max_edge}
+            try:
+                if store is not None:
+                    with store.writer(media_id, FRAMES_ARTIFACT_STAGE, params, ".jpg") as tmp_path:
+                        _write_jpeg(frame, tmp_path)
+                    paths[key] = store.path_for(media_id, FRAMES_ARTIFACT_STAGE, params, ".jpg")
+                if output_dir is not None:
+                    frame_path = os.path.join(output_dir, f"{video_name}_{key:.3f}.jpg")
+                    _write_jpeg(frame, frame_path)
+                    paths.setdefault(key, frame_path)
+            except (RuntimeError, OSError) as e:
+                logger.warning(f"Failed to persist frame at {key:.2f}s: {e}")
+
+            for i in waiting[key]:
+                unresolved[i] -= 1
+                if unresolved[i] == 0:
+                    emitted.add(i)
+                    yield i, window_frames(i)
+                    release(i)
+
+    # Windows whose frames could not all be decoded (e.g. past the end of the stream)
+    for i in range(len(keys_per_window)):
+        if i not in emitted:
+            yield i, window_frames(i)
+            release(i)
+
+
+def sample_frames_batch(
+    video_path: str,
+    windows: Sequence[Tuple[float, float]],
+    fps: float = 1.0,
+    max_frames: int = 12,
+    output_dir: Optional[str] = None,
+    media_id: Optional[str] = None,
+    cache: bool = FRAME_CACHE_ENABLED,
+    max_edge: Optional[int] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Sample frames for every window in one pass (see iter_frames_for_chunks).
+
+    Note: all frames are held in memory at once; prefer iter_frames_for_chunks
+    for long videos.
+
+    Returns:
+        Per-window lists of {timestamp, image, path (if persisted)}, in window order
+    """
+    results: List[List[Dict[str, Any]]] = [[] for _ in windows]
+    for i, frames in iter_frames_for_chunks(video_path, windows, fps, max_frames, output_dir, media_id, cache, max_edge):
+        results[i] = frames
+    logger.info(
+        f"Extracted {sum(len(frames) for frames in results)} frames for {len(windows)} windows from {video_path}"
+    )
+    return results
+
+
 def sample_frames(
     video_path: str,
     start_time: float,
     end_time: float,
     fps: float = 1.0,
     max_frames: int = 12,
-    output_dir: Optional[str] = None
+    output_dir: Optional[str] = None,
+    media_id: Optional[str] = None,
+    cache: bool = FRAME_CACHE_ENABLED,
+    max_edge: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Sample frames from a video within a time window.
     
-    Uses ffmpeg (via imageio_ffmpeg fallback) for extraction.
-    Frames are persisted in output_dir for debugging/re-processing.
+    Frames are returned in memory as RGB arrays. Use sample_frames_batch /
+    iter_frames_for_chunks for many windows.
     
     Args:
         video_path: Path to video file
@@ -53,161 +367,58 @@ def sample_frames(
         end_time: End timestamp in seconds
         fps: Frames per second to extract (default 1.0)
         max_frames: Maximum frames to extract (default 12, SmolVLM2 limit)
-        output_dir: Directory to save frames (defaults to sibling 'frames' folder)
+        output_dir: Optional debug sink; frames are also written here as JPEG
+        media_id: Content-derived media ID (artifact key, resolved from video_path if omitted)
+        cache: Reuse / persist frames in the artifact store (JPEG)
+        max_edge: Downscale at decode time so the longest edge is at most this
+            (e.g. the VLM processor's target size); None keeps the source resolution
     
     Returns:
-        List of {timestamp: float, path: str} for each extracted frame
+        List of {timestamp: float, image: RGB ndarray, path: str (if persisted)}
     """
-    ensure_ffmpeg_in_path()
-    
-    # Calculate duration and frame count
-    duration = end_time - start_time
-    total_frames = min(int(duration * fps) + 1, max_frames)
-    
-    if total_frames <= 0:
-        logger.warning(f"No frames to extract: duration={duration}, fps={fps}")
-        return []
-    
-    # Setup output directory
-    if output_dir is None:
-        output_dir = os.path.join(os.path.dirname(video_path), "frames")
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Generate frame timestamps
-    if total_frames == 1:
-        timestamps = [start_time]
-    else:
-        step = duration / (total_frames - 1)
-        timestamps = [start_time + i * step for i in range(total_frames)]
-    
-    frames = []
-    video_name = os.path.splitext(os.path.basename(video_path))[0]
-    
-    for i, ts in enumerate(timestamps):
-        # Output path: {output_dir}/{video_basename}_{start}_{end}_frame{i}.jpg
-        frame_path = os.path.join(
-            output_dir, 
-            f"{video_name}_{start_time:.2f}_{end_time:.2f}_frame{i:03d}.jpg"
-        )
-        
-        # Extract frame using ffmpeg
-        cmd = [
-            "ffmpeg", "-y",
-            "-ss", str(ts),
-            "-i", video_path,
-            "-vframes", "1",
-            "-q:v", "2",  # High quality JPEG
-            frame_path
-        ]
-        
-        try:
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                check=True,
-                timeout=30  # 30 second timeout per frame
-            )
-            frames.append({"timestamp": ts, "path": frame_path})
-            logger.debug(f"Extracted frame at {ts:.2f}s -> {frame_path}")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Failed to extract frame at {ts:.2f}s: {e.stderr.decode() if e.stderr else e}")
-        except subprocess.TimeoutExpired:
-            logger.warning(f"Timeout extracting frame at {ts:.2f}s")
-    
+    _, frames = next(iter_frames_for_chunks(
+        video_path, [(start_time, end_time)], fps, max_frames, output_dir, media_id, cache, max_edge
+    ))
     logger.info(f"Extracted {len(frames)} frames from {video_path} [{start_time:.2f}-{end_time:.2f}s]")
     return frames
 
 
-def get_video_duration(video_path: str) -> float:
+def get_video_duration(video_path: str, media_id: Optional[str] = None) -> float:
     """
-    Get video duration in seconds using OpenCV.
+    Get video duration in seconds from the container header (see media_probe).
     
     Args:
         video_path: Path to video file
+        media_id: Optional media ID; probe results are memoized under it
         
     Returns:
         Duration in seconds
         
     Raises:
-        RuntimeError: If OpenCV fails to get duration
+        RuntimeError: If the file cannot be probed or reports no duration
     """
-    cv2 = _get_cv2()
-    
-    try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise RuntimeError(f"Failed to open video: {video_path}")
-        
-        # Get frame count and FPS
-        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        video_fps = cap.get(cv2.CAP_PROP_FPS)
-        
-        cap.release()
-        
-        if video_fps <= 0:
-            raise RuntimeError(f"Invalid FPS ({video_fps}) for video: {video_path}")
-        
-        duration = frame_count / video_fps
-        logger.debug(f"Video duration: {duration:.2f}s (frames={frame_count}, fps={video_fps})")
-        return duration
-        
-    except Exception as e:
-        logger.error(f"Failed to get video duration: {e}")
-        raise RuntimeError(f"Failed to get video duration: {e}")
+    info = probe_media(video_path, media_id)
+    if not info.duration or info.duration <= 0:
+        raise RuntimeError(f"Failed to get video duration: no duration reported for {video_path}")
+    logger.debug(f"Video duration: {info.duration:.2f}s ({info.container})")
+    return info.duration
 
 
-def get_media_info(media_path: str) -> Dict[str, Any]:
+def get_media_info(media_path: str, media_id: Optional[str] = None) -> Dict[str, Any]:
     """
-    Get media file information using OpenCV.
+    Get media file information from a single header probe (see media_probe).
     
-    Works for both video and image files.
+    Works for video, audio and image files; no frames are decoded.
     
     Args:
-        media_path: Path to media file (video or image)
+        media_path: Path to media file
+        media_id: Optional media ID; probe results are memoized under it
         
     Returns:
-        Dict with 'type' ('video' or 'image'), 'duration' (if video), 
-        'width', 'height', 'fps' (if video)
+        Dict with 'type' ('video', 'audio' or 'image'), 'duration' (if not an image),
+        'width', 'height', 'fps', 'frame_count' (if video), codecs and streams
     """
-    cv2 = _get_cv2()
-    
-    try:
-        # Try opening as video first
-        cap = cv2.VideoCapture(media_path)
-        
-        if cap.isOpened():
-            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            video_fps = cap.get(cv2.CAP_PROP_FPS)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            cap.release()
-            
-            # If it has multiple frames and valid FPS, it's a video
-            if frame_count > 1 and video_fps > 0:
-                duration = frame_count / video_fps
-                return {
-                    "type": "video",
-                    "duration": duration,
-                    "width": width,
-                    "height": height,
-                    "fps": video_fps,
-                    "frame_count": int(frame_count)
-                }
-        
-        # Try opening as image
-        img = cv2.imread(media_path)
-        if img is not None:
-            height, width = img.shape[:2]
-            return {
-                "type": "image",
-                "duration": None,
-                "width": width,
-                "height": height
-            }
-        
-        raise RuntimeError(f"Could not open media file: {media_path}")
-        
-    except Exception as e:
-        logger.error(f"Failed to get media info: {e}")
-        raise RuntimeError(f"Failed to get media info: {e}")
-
+    info = probe_media(media_path, media_id)
+    if info.type == "unknown":
+        raise RuntimeError(f"Failed to get media info: unrecognized media file {media_path}")
+    return info.to_dict()
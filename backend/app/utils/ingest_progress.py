@@ -0,0 +1,97 @@
+"""
+Ingestion Progress
+
+Per-media, per-stage high-water marks for long-running ingestion, stored in
+SQLite next to the chat database. Stages commit their output incrementally
+and advance the mark, so an interrupted ingestion resumes from the last
+committed timestamp instead of starting over.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from ..config import INGEST_DB_PATH
+from .stores import LazySingleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class IngestProgressStore(SQLiteStore):
+    """
+    SQLite-backed progress tracker keyed by (media_id, stage).
+
+    Row fields:
+        committed_until: Seconds of media whose output is durably committed
+        completed: Whether the stage finished for this media
+        details: Free-form JSON (stage-specific metadata)
+    """
+
+    def __init__(self, db_path: str = INGEST_DB_PATH):
+        super().__init__(db_path)
+
+    def _init_db(self):
+        """Initialize the progress table."""
+        with self._lock, self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_progress (
+                    media_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    committed_until REAL NOT NULL DEFAULT 0,
+                    completed INTEGER NOT NULL DEFAULT 0,
+                    details TEXT,
+                    updated_at INTEGER NOT NULL,
+                    PRIMARY KEY (media_id, stage)
+                )
+            """)
+
+    def get(self, media_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Return {committed_until, completed, details} or None if never started."""
+        with self._lock, self._connect() as db:
+            row = db.execute(
+                "SELECT committed_until, completed, details FROM ingest_progress WHERE media_id = ? AND stage = ?",
+                (media_id, stage)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "committed_until": row[0],
+            "completed": bool(row[1]),
+            "details": json.loads(row[2]) if row[2] else {},
+        }
+
+    def _upsert(self, media_id: str, stage: str, committed_until: float, completed: bool, details: Optional[Dict[str, Any]]):
+        now = int(time.time() * 1000)
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO ingest_progress "
+                "(media_id, stage, committed_until, completed, details, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (media_id, stage, committed_until, int(completed), json.dumps(details or {}), now)
+            )
+
+    def advance(self, media_id: str, stage: str, committed_until: float, details: Optional[Dict[str, Any]] = None):
+        """Record that output up to `committed_until` seconds is committed."""
+        self._upsert(media_id, stage, committed_until, False, details)
+
+    def complete(self, media_id: str, stage: str, committed_until: float, details: Optional[Dict[str, Any]] = None):
+        """Mark a stage as finished for this media."""
+        self._upsert(media_id, stage, committed_until, True, details)
+
+    def reset(self, media_id: str, stage: str):
+        """Forget progress for a stage (next run starts from zero)."""
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM ingest_progress WHERE media_id = ? AND stage = ?", (media_id, stage))
+
+    def forget(self, media_id: str):
+        """Forget progress of every stage for one media_id."""
+        with self._lock, self._connect() as db:
+            db.execute("DELETE FROM ingest_progress WHERE media_id = ?", (media_id,))
+
+
+_store: LazySingleton[IngestProgressStore] = LazySingleton(IngestProgressStore)
+
+
+def get_progress_store() -> IngestProgressStore:
+    """Return the process-wide progress store, creating it on first use."""
+    return _store.get()
@@ -0,0 +1,118 @@
+"""
+Keyframe Selection
+
+Drops near-duplicate frames from a chunk before it reaches the VLM, so a static
+slide costs one frame's worth of visual tokens instead of eight.
+
+Frames are reduced to small grayscale thumbnails (vectorized block means over
+a sampled pixel lattice), compared pairwise by the fraction of thumbnail cells
+that changed, and selected greedily in time order: a frame is kept when it differs from the last
+kept frame by more than the change threshold. Min/max bounds are then applied.
+"""
+
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Thumbnail edge length (pixels) used for comparison, and lattice points
+# averaged per thumbnail pixel along each axis
+THUMBNAIL_SIZE = 32
+SUBSAMPLE = 4
+
+# A thumbnail cell has changed when its intensity moved by more than CELL_DELTA
+# (0-1 scale; compression noise stays around 0.01). A frame counts as new when
+# more than CHANGE_THRESHOLD of its cells changed: a global mean would miss
+# local edits such as a line of handwriting added to a static slide.
+CELL_DELTA = 0.03
+CHANGE_THRESHOLD = 0.0015
+
+# Frames kept per chunk
+MIN_KEYFRAMES = 1
+MAX_KEYFRAMES = 8
+
+# ITU-R BT.601 luma weights
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def thumbnails(images: Sequence[np.ndarray], size: int = THUMBNAIL_SIZE) -> np.ndarray:
+    """
+    Downscale RGB frames to size x size grayscale thumbnails in [0, 1].
+
+    Each frame is point-sampled on a (size * SUBSAMPLE)^2 lattice and reduced
+    by block means, so the cost does not grow with the source resolution.
+
+    Returns:
+        Array of shape (n_frames, size, size)
+    """
+    grid = size * SUBSAMPLE
+    thumbs = np.empty((len(images), size, size), dtype=np.float32)
+    for i, image in enumerate(images):
+        if image.ndim == 2:
+            image = image[:, :, None]
+        h, w = image.shape[:2]
+        # Point-sample a grid x grid lattice (only these pixels are read),
+        # then average SUBSAMPLE x SUBSAMPLE blocks of it
+        rows = np.arange(grid) * h // grid
+        cols = np.arange(grid) * w // grid
+        lattice = image[rows][:, cols]
+        small = lattice.reshape(size, SUBSAMPLE, size, SUBSAMPLE, -1).mean(axis=(1, 3), dtype=np.float32)
+        gray = small @ _LUMA if small.shape[2] == 3 else small[:, :, 0]
+        thumbs[i] = gray / 255.0
+    return thumbs
+
+
+def change_matrix(thumbs: np.ndarray, cell_delta: float = CELL_DELTA) -> np.ndarray:
+    """Pairwise fraction of changed thumbnail cells, shape (n, n)."""
+    flat = thumbs.reshape(len(thumbs), -1)
+    return (np.abs(flat[:, None, :] - flat[None, :, :]) > cell_delta).mean(axis=2)
+
+
+def select_keyframes(
+    frames: List[Dict[str, Any]],
+    min_frames: int = MIN_KEYFRAMES,
+    max_frames: int = MAX_KEYFRAMES,
+    threshold: float = CHANGE_THRESHOLD
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Keep only visually distinct frames of a chunk.
+
+    Args:
+        frames: Sampled frames ({timestamp, image (RGB array), ...}) in time order
+        min_frames: Keep at least this many frames (if available)
+        max_frames: Keep at most this many frames
+        threshold: Minimum fraction of changed cells (vs the last kept frame) to keep a frame
+
+    Returns:
+        (kept frames in time order, {"sampled", "kept", "dropped"})
+    """
+    n = len(frames)
+    if n <= min_frames:
+        return list(frames), {"sampled": n, "kept": n, "dropped": 0}
+
+    diffs = change_matrix(thumbnails([frame["image"] for frame in frames]))
+
+    kept = [0]
+    for i in range(1, n):
+        if diffs[i, kept[-1]] > threshold:
+            kept.append(i)
+
+    if len(kept) > max_frames:
+        # Keep the first frame plus the frames that changed the most
+        scores = [diffs[k, kept[j - 1]] for j, k in enumerate(kept) if j > 0]
+        order = np.argsort(scores)[::-1][:max_frames - 1]
+        kept = [kept[0]] + sorted(kept[j + 1] for j in order)
+    elif len(kept) < min_frames:
+        # Top up with the frames least similar to any already kept
+        remaining = [i for i in range(n) if i not in kept]
+        while len(kept) < min_frames and remaining:
+            best = max(remaining, key=lambda i: diffs[i, kept].min())
+            kept.append(best)
+            remaining.remove(best)
+        kept.sort()
+
+    stats = {"sampled": n, "kept": len(kept), "dropped": n - len(kept)}
+    logger.debug(f"Keyframes: {stats}")
+    return [frames[i] for i in kept], stats
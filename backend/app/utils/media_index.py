@@ -0,0 +1,333 @@
+"""
+Media Fingerprint Index
+
+Persistent SQLite index of media fingerprints, stored next to the chat database.
+Entries are keyed by (path, size, mtime, inode) so an unchanged upload resolves
+to its media_id with a single stat() call instead of re-hashing the whole file.
+Any change to the file on disk invalidates the entry and triggers a re-hash.
+
+Fingerprint modes (see MEDIA_ID_MODE in config):
+- "sha256": full-file SHA-256
+- "tree":   parallel chunked tree hash
+- "quick":  sampled head/middle/tail ID; the full SHA-256 is computed in the
+            background and checked against earlier files with the same quick ID.
+            On a collision, everything stored under the quick ID (progress,
+            vector-store entries, artifacts) is dropped, since one file may have
+            been served the other's results. The quick ID is revoked first:
+            ingestion still running under it has its later commits rejected
+            (see media_commit) and sessions that cached it re-resolve the file
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+
+from ..config import MEDIA_INDEX_DB_PATH, MEDIA_ID_MODE
+from .file_utils import compute_sha256, compute_tree_sha256, compute_quick_id
+from .stores import LazySingleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class MediaIdRevokedError(RuntimeError):
+    """Raised when results are committed under a media_id that has been purged."""
+
+
+class MediaFingerprintIndex(SQLiteStore):
+    """
+    SQLite-backed cache of file fingerprints.
+
+    One row is kept per (path, algorithm); a stale row is replaced as soon as
+    the file is re-hashed, so the table does not grow with every edit.
+    """
+
+    def __init__(self, db_path: str = MEDIA_INDEX_DB_PATH):
+        super().__init__(db_path)
+
+    def _init_db(self):
+        """Initialize the fingerprints table."""
+        with self._lock, self._connect() as db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS media_fingerprints (
+                    path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    updated_at INTEGER NOT NULL,
+                    PRIMARY KEY (path, algorithm)
+                )
+            """)
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS quick_id_checks (
+                    quick_id TEXT PRIMARY KEY,
+                    full_digest TEXT NOT NULL,
+                    collision INTEGER NOT NULL DEFAULT 0,
+                    updated_at INTEGER NOT NULL
+                )
+            """)
+
+    def lookup(self, path: str, st: os.stat_result, algorithm: str = "sha256") -> Optional[str]:
+        """Return the cached digest if the file is unchanged since it was indexed."""
+        with self._lock, self._connect() as db:
+            row = db.execute(
+                "SELECT digest FROM media_fingerprints "
+                "WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (path, algorithm, st.st_size, st.st_mtime_ns, st.st_ino)
+            ).fetchone()
+        return row[0] if row else None
+
+    def store(self, path: str, st: os.stat_result, digest: str, algorithm: str = "sha256"):
+        """Insert or replace the digest for a file."""
+        now = int(time.time() * 1000)
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO media_fingerprints "
+                "(path, algorithm, size, mtime_ns, inode, digest, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, algorithm, st.st_size, st.st_mtime_ns, st.st_ino, digest, now)
+            )
+
+    def is_quick_id_collision(self, quick_id: str) -> bool:
+        """True if two different files were seen with this quick ID."""
+        with self._lock, self._connect() as db:
+            row = db.execute(
+                "SELECT collision FROM quick_id_checks WHERE quick_id = ?", (quick_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def check_quick_id(self, quick_id: str, full_digest: str) -> bool:
+        """
+        Record the full digest behind a quick ID.
+
+        Returns:
+            False if the quick ID was previously seen with a different full digest
+        """
+        now = int(time.time() * 1000)
+        with self._lock, self._connect() as db:
+            row = db.execute(
+                "SELECT full_digest FROM quick_id_checks WHERE quick_id = ?", (quick_id,)
+            ).fetchone()
+            if row is None:
+                db.execute(
+                    "INSERT INTO quick_id_checks (quick_id, full_digest, collision, updated_at) VALUES (?, ?, 0, ?)",
+                    (quick_id, full_digest, now)
+                )
+                return True
+            if row[0] != full_digest:
+                db.execute(
+                    "UPDATE quick_id_checks SET collision = 1, updated_at = ? WHERE quick_id = ?",
+                    (now, quick_id)
+                )
+                return False
+        return True
+
+
+# Vector-store collections whose entries are keyed by media_id
+MEDIA_COLLECTIONS = ("asr_segments", "multimodal_chunks")
+
+_FINGERPRINT_FUNCS = {
+    "sha256": compute_sha256,
+    "tree": compute_tree_sha256,
+    "quick": compute_quick_id,
+}
+
+_index: LazySingleton[MediaFingerprintIndex] = LazySingleton(MediaFingerprintIndex)
+
+
+def get_media_index() -> Optional[MediaFingerprintIndex]:
+    """Lazily create the process-wide fingerprint index (None if the DB is unusable)."""
+    try:
+        return _index.get()
+    except sqlite3.Error as e:
+        logger.warning(f"Media fingerprint index unavailable ({MEDIA_INDEX_DB_PATH}): {e}")
+        return None
+
+
+# Background verification of quick IDs (one file at a time to bound disk I/O)
+_verify_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quick-id-verify")
+_pending_verifications: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+# Quick IDs purged after a collision; nothing may be stored under them again
+_revoked_ids: Set[str] = set()
+# A purge and commits under the same media_id exclude each other (striped by
+# media_id; reentrant so a commit may call helpers that guard the same id)
+_commit_locks = [threading.RLock() for _ in range(16)]
+
+
+def _commit_lock(media_id: str) -> threading.RLock:
+    return _commit_locks[hash(media_id) % len(_commit_locks)]
+
+
+@contextmanager
+def media_commit(media_id: str) -> Iterator[None]:
+    """
+    Guard a write of ingestion results stored under media_id.
+
+    A purge of the same media_id waits until the write is done, and writes
+    that start after the media_id was revoked raise MediaIdRevokedError
+    instead of re-populating what the purge dropped.
+
+    Raises:
+        MediaIdRevokedError: If media_id has been revoked
+    """
+    with _commit_lock(media_id):
+        if media_id in _revoked_ids:
+            raise MediaIdRevokedError(f"media_id {media_id[:16]}... was revoked after a quick ID collision")
+        yield
+
+
+def is_media_id_revoked(media_id: str) -> bool:
+    """True if media_id is a quick ID found to be shared by two different files."""
+    if media_id in _revoked_ids:
+        return True
+    index = get_media_index()
+    try:
+        return index is not None and index.is_quick_id_collision(media_id)
+    except sqlite3.Error as e:
+        logger.warning(f"Fingerprint index lookup failed: {e}")
+        return False
+
+
+def _fingerprint(path: str, st: os.stat_result, mode: str, index: Optional[MediaFingerprintIndex]) -> str:
+    """Return the fingerprint for `mode`, consulting and updating the index."""
+    if index is not None:
+        try:
+            digest = index.lookup(path, st, algorithm=mode)
+            if digest:
+                logger.debug(f"Fingerprint index hit for {path} ({mode})")
+                return digest
+        except sqlite3.Error as e:
+            logger.warning(f"Fingerprint index lookup failed: {e}")
+
+    logger.info(f"Fingerprinting {path} ({st.st_size / (1024 * 1024):.1f} MB, mode={mode})...")
+    digest = _FINGERPRINT_FUNCS[mode](path)
+
+    if index is not None:
+        try:
+            index.store(path, st, digest, algorithm=mode)
+        except sqlite3.Error as e:
+            logger.warning(f"Fingerprint index update failed: {e}")
+
+    return digest
+
+
+def _verify_quick_id(path: str, st: os.stat_result, quick_id: str):
+    """Compute the full digest behind a quick ID and check it for collisions."""
+    try:
+        index = get_media_index()
+        full_digest = _fingerprint(path, st, "sha256", index)
+        if index is not None and not index.check_quick_id(quick_id, full_digest):
+            logger.error(
+                f"Quick ID collision for {path}: {quick_id[:16]}... maps to more than one file. "
+                f"Future uploads with this quick ID will use the full SHA-256."
+            )
+            purge_media_id(quick_id)
+        else:
+            logger.info(f"Quick ID {quick_id[:16]}... verified (sha256 {full_digest[:16]}...)")
+    except Exception as e:
+        logger.warning(f"Quick ID verification failed for {path}: {e}")
+    finally:
+        with _pending_lock:
+            _pending_verifications.pop(path, None)
+
+
+def purge_media_id(media_id: str):
+    """
+    Drop everything stored under a media_id: ingestion progress, ASR / fused
+    chunks in the vector store, derived artifacts and the memoized probe.
+
+    Used when a quick ID turns out to be shared by two different files, so
+    neither file is served results computed for the other. The media_id is
+    revoked and the purge runs under its commit lock, so ingestion still in
+    flight cannot store anything under it afterwards. Each part is
+    best-effort; failures are logged.
+    """
+    # Imported here: heavy (vector store) and only needed on a collision
+    from .artifact_store import get_artifact_store
+    from .ingest_progress import get_progress_store
+    from .media_probe import get_media_probe
+    from ..vector_store import get_vector_store
+
+    logger.warning(f"Purging cached results stored under media_id {media_id[:16]}...")
+    with _commit_lock(media_id):
+        _revoked_ids.add(media_id)
+        try:
+            get_progress_store().forget(media_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not clear ingestion progress for {media_id[:16]}: {e}")
+        for collection_name in MEDIA_COLLECTIONS:
+            try:
+                get_vector_store(collection_name).delete_by_metadata(where={"media_id": media_id})
+            except Exception as e:
+                logger.warning(f"Could not purge {collection_name} for {media_id[:16]}: {e}")
+        try:
+            get_artifact_store().invalidate_media(media_id)
+        except OSError as e:
+            logger.warning(f"Could not purge artifacts for {media_id[:16]}: {e}")
+        get_media_probe().invalidate(media_id)
+
+
+def verify_quick_id_async(path: str, st: os.stat_result, quick_id: str) -> Future:
+    """Schedule background verification of a quick ID (deduplicated per path)."""
+    with _pending_lock:
+        future = _pending_verifications.get(path)
+        if future is None:
+            future = _verify_executor.submit(_verify_quick_id, path, st, quick_id)
+            _pending_verifications[path] = future
+        return future
+
+
+def resolve_media_id(file_path: str, mode: Optional[str] = None) -> str:
+    """
+    Resolve the media_id (content fingerprint) of a file.
+
+    Shared by every ingestion entry point (ConnectRPC chat, REST /chat, ASRNode)
+    so the same file always maps to the same id and is hashed at most once
+    while it stays unchanged on disk.
+
+    Note: each mode produces a different id for the same file, so switching
+    modes means existing ASR/VLM caches are not reused. Ingestion entry points
+    therefore leave `mode` unset and all follow MEDIA_ID_MODE.
+
+    Args:
+        file_path: Path to the media file
+        mode: "sha256", "tree" or "quick" (defaults to MEDIA_ID_MODE; meant
+            for benchmarks and tooling, not per-component overrides)
+
+    Returns:
+        Hex digest used as media_id
+    """
+    mode = mode or MEDIA_ID_MODE
+    if mode not in _FINGERPRINT_FUNCS:
+        logger.warning(f"Unknown media_id mode '{mode}', falling back to sha256")
+        mode = "sha256"
+
+    path = os.path.realpath(file_path)
+    st = os.stat(path)
+    index = get_media_index()
+
+    digest = _fingerprint(path, st, mode, index)
+
+    if mode == "quick":
+        try:
+            collision = index is not None and index.is_quick_id_collision(digest)
+        except sqlite3.Error as e:
+            logger.warning(f"Fingerprint index lookup failed: {e}")
+            collision = False
+
+        if collision:
+            # Known-ambiguous quick ID: pay for the full hash up front
+            logger.warning(f"Quick ID {digest[:16]}... is ambiguous, using full SHA-256 for {path}")
+            return _fingerprint(path, st, "sha256", index)
+
+        # Start ingestion immediately; check the full digest afterwards
+        verify_quick_id_async(path, st, digest)
+
+    return digest
@@ -0,0 +1,403 @@
+"""
+Media Probe
+
+One container-header probe per media file: duration, streams, codecs and
+dimensions, without decoding any frames.
+
+    ffprobe -v error -print_format json -show_format -show_streams <media>
+
+When ffprobe is not available (e.g. only the imageio_ffmpeg binary is on
+PATH), the stream summary printed by `ffmpeg -i <media>` is parsed instead.
+The media type (video / audio / image) comes from the file's magic bytes and
+its streams rather than the file extension, and results are memoized by
+media_id so the chunking and ingestion paths do not probe the same file again.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .ffmpeg_utils import ensure_ffmpeg_in_path
+from .stores import LazySingleton
+
+logger = logging.getLogger(__name__)
+
+# Probed files kept in memory
+MAX_CACHED_PROBES = 256
+
+# Bytes read from the head of the file for magic-byte detection (covers
+# two MPEG-TS packets)
+MAGIC_BYTES = 192
+
+PROBE_TIMEOUT = 30
+
+# ISO-BMFF (MP4 / QuickTime) brands that only carry audio or still images
+_AUDIO_BRANDS = {"M4A ", "M4B ", "M4P ", "F4A ", "F4B "}
+_IMAGE_BRANDS = {"heic", "heix", "heim", "heis", "mif1", "msf1", "avif", "avis"}
+
+
+@dataclass
+class StreamInfo:
+    """One stream of a media container."""
+    index: int
+    codec_type: str                     # "video", "audio", "subtitle", "data"
+    codec_name: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    frame_count: Optional[int] = None   # Estimated from duration x fps without ffprobe
+    duration: Optional[float] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    attached_pic: bool = False          # Cover art, not a real video stream
+
+
+@dataclass
+class MediaInfo:
+    """Container-level probe result."""
+    path: str
+    type: str                           # "video", "audio", "image" or "unknown"
+    container: Optional[str] = None
+    duration: Optional[float] = None
+    streams: List[StreamInfo] = field(default_factory=list)
+
+    @property
+    def video_stream(self) -> Optional[StreamInfo]:
+        return next((s for s in self.streams if s.codec_type == "video" and not s.attached_pic), None)
+
+    @property
+    def audio_stream(self) -> Optional[StreamInfo]:
+        return next((s for s in self.streams if s.codec_type == "audio"), None)
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_stream is not None
+
+    @property
+    def has_audio(self) -> bool:
+        return self.audio_stream is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flat summary: type, duration, width, height, fps, frame_count, codecs, has_audio, streams."""
+        video = self.video_stream if self.type != "image" else next(
+            (s for s in self.streams if s.codec_type == "video"), None
+        )
+        audio = self.audio_stream
+        return {
+            "type": self.type,
+            "container": self.container,
+            "duration": self.duration if self.type != "image" else None,
+            "width": video.width if video else None,
+            "height": video.height if video else None,
+            "fps": video.fps if video and self.type == "video" else None,
+            "frame_count": video.frame_count if video and self.type == "video" else None,
+            "video_codec": video.codec_name if video else None,
+            "audio_codec": audio.codec_name if audio else None,
+            "has_audio": audio is not None,
+            "streams": [asdict(s) for s in self.streams],
+        }
+
+
+def detect_media_type(media_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Guess container and media type from the file's magic bytes.
+
+    The type is only a hint for containers that can hold either audio or video
+    (MP4, Matroska/WebM, Ogg); probe() settles it from the actual streams.
+
+    Returns:
+        (container, type) - either may be None if the signature is unknown
+    """
+    with open(media_path, "rb") as f:
+        head = f.read(MAGIC_BYTES)
+
+    if len(head) >= 12 and head[4:8] == b"ftyp":
+        brand = head[8:12].decode("latin-1")
+        if brand in _AUDIO_BRANDS:
+            return "mp4", "audio"
+        if brand in _IMAGE_BRANDS:
+            return "heif", "image"
+        return ("mov" if brand == "qt  " else "mp4"), "video"
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return ("webm" if b"webm" in head else "matroska"), "video"
+    if head.startswith(b"RIFF") and len(head) >= 12:
+        kind = head[8:12]
+        if kind == b"WAVE":
+            return "wav", "audio"
+        if kind == b"AVI ":
+            return "avi", "video"
+        if kind == b"WEBP":
+            return "webp", "image"
+    if head.startswith(b"FLV"):
+        return "flv", "video"
+    if head.startswith(b"\x00\x00\x01\xba"):
+        return "mpeg", "video"
+    if head.startswith(b"ID3") or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0 and head[1] & 0x06):
+        return "mp3", "audio"
+    if len(head) >= 2 and head[0] == 0xFF and head[1] & 0xF6 == 0xF0:
+        return "aac", "audio"
+    if head.startswith(b"fLaC"):
+        return "flac", "audio"
+    if head.startswith(b"OggS"):
+        return "ogg", "audio"
+    if head.startswith(b"FORM") and head[8:12] in (b"AIFF", b"AIFC"):
+        return "aiff", "audio"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png", "image"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg", "image"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "gif", "image"
+    if head.startswith(b"BM"):
+        return "bmp", "image"
+    if head.startswith((b"II*\x00", b"MM\x00*")):
+        return "tiff", "image"
+    # MPEG-TS: a sync byte at the start of every 188-byte packet
+    if head[:1] == b"\x47" and head[188:189] == b"\x47":
+        return "mpegts", "video"
+    return None, None
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe rational ("30000/1001") or decimal frame rate."""
+    if not rate:
+        return None
+    try:
+        if "/" in rate:
+            num, den = rate.split("/", 1)
+            return float(num) / float(den) if float(den) else None
+        return float(rate)
+    except ValueError:
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "N/A") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "N/A") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _probe_ffprobe(media_path: str) -> Tuple[Optional[str], Optional[float], List[StreamInfo]]:
+    """Probe with ffprobe JSON output."""
+    cmd = [
+        "ffprobe", "-v", "error", "-print_format", "json",
+        "-show_format", "-show_streams", media_path
+    ]
+    proc = subprocess.run(cmd, capture_output=True, timeout=PROBE_TIMEOUT)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", errors="replace").strip() or "ffprobe failed")
+
+    data = json.loads(proc.stdout or b"{}")
+    fmt = data.get("format", {})
+    streams = []
+    for s in data.get("streams", []):
+        fps = _parse_rate(s.get("avg_frame_rate")) or _parse_rate(s.get("r_frame_rate"))
+        streams.append(StreamInfo(
+            index=s.get("index", len(streams)),
+            codec_type=s.get("codec_type", "data"),
+            codec_name=s.get("codec_name"),
+            width=_to_int(s.get("width")),
+            height=_to_int(s.get("height")),
+            fps=fps,
+            frame_count=_to_int(s.get("nb_frames")),
+            duration=_to_float(s.get("duration")),
+            sample_rate=_to_int(s.get("sample_rate")),
+            channels=_to_int(s.get("channels")),
+            attached_pic=bool(s.get("disposition", {}).get("attached_pic")),
+        ))
+    container = (fmt.get("format_name") or "").split(",")[0] or None
+    return container, _to_float(fmt.get("duration")), streams
+
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_INPUT_RE = re.compile(r"Input #0,\s*([^,\s]+)")
+_STREAM_RE = re.compile(r"Stream #0:(\d+)(?:\[[^\]]*\])?(?:\([^)]*\))?:\s*(Video|Audio|Subtitle|Data):\s*(.*)")
+_SIZE_RE = re.compile(r"(?:^|[\s,])(\d{2,5})x(\d{2,5})(?:[\s,\[]|$)")
+_FPS_RE = re.compile(r"([\d.]+)\s*(?:fps|tbr)")
+_RATE_RE = re.compile(r"(\d+)\s*Hz")
+_LAYOUTS = {"mono": 1, "stereo": 2, "2.1": 3, "quad": 4, "5.0": 5, "5.1": 6, "6.1": 7, "7.1": 8}
+
+
+def _probe_ffmpeg(media_path: str) -> Tuple[Optional[str], Optional[float], List[StreamInfo]]:
+    """Fallback probe: parse the stream summary `ffmpeg -i` prints (no decoding)."""
+    ensure_ffmpeg_in_path()
+    cmd = ["ffmpeg", "-nostdin", "-hide_banner", "-i", media_path]
+    # ffmpeg exits non-zero without an output file; the header is still printed
+    proc = subprocess.run(cmd, capture_output=True, timeout=PROBE_TIMEOUT)
+    text = proc.stderr.decode("utf-8", errors="replace")
+    if "Input #0" not in text:
+        raise RuntimeError(text.strip().splitlines()[-1] if text.strip() else "ffmpeg could not read input")
+
+    container_match = _INPUT_RE.search(text)
+    container = container_match.group(1) if container_match else None
+
+    duration = None
+    duration_match = _DURATION_RE.search(text)
+    if duration_match:
+        h, m, s = duration_match.groups()
+        duration = int(h) * 3600 + int(m) * 60 + float(s)
+
+    streams = []
+    for match in _STREAM_RE.finditer(text):
+        index, kind, details = int(match.group(1)), match.group(2).lower(), match.group(3)
+        stream = StreamInfo(
+            index=index,
+            codec_type=kind,
+            codec_name=details.split(",")[0].split()[0] if details.strip() else None,
+            attached_pic="(attached pic)" in details,
+        )
+        if kind == "video":
+            size = _SIZE_RE.search(details)
+            if size:
+                stream.width, stream.height = int(size.group(1)), int(size.group(2))
+            fps = _FPS_RE.search(details)
+            if fps:
+                stream.fps = float(fps.group(1))
+        elif kind == "audio":
+            rate = _RATE_RE.search(details)
+            if rate:
+                stream.sample_rate = int(rate.group(1))
+            for part in details.split(","):
+                layout = part.strip().split("(")[0]
+                if layout in _LAYOUTS:
+                    stream.channels = _LAYOUTS[layout]
+                    break
+        streams.append(stream)
+
+    # `ffmpeg -i` prints no frame count; estimate it from the container duration
+    for stream in streams:
+        if stream.codec_type == "video" and stream.fps and duration:
+            stream.frame_count = int(round(duration * stream.fps))
+    return container, duration, streams
+
+
+def _classify(magic_type: Optional[str], streams: List[StreamInfo]) -> str:
+    """Media type from the magic-byte hint and the streams actually present."""
+    if magic_type == "image":
+        return "image"
+    if any(s.codec_type == "video" and not s.attached_pic for s in streams):
+        return "video"
+    if any(s.codec_type == "audio" for s in streams):
+        return "audio"
+    return magic_type or "unknown"
+
+
+class MediaProbe:
+    """
+    Memoizing media prober.
+
+    Results are keyed by media_id when the caller has one, otherwise by
+    (path, size, mtime), and kept in a small in-memory LRU.
+
+    Counters (see stats()): probes, hits.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_PROBES):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Hashable, MediaInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"probes": 0, "hits": 0}
+
+    def probe(self, media_path: str, media_id: Optional[str] = None) -> MediaInfo:
+        """
+        Probe a media file (memoized).
+
+        Args:
+            media_path: Path to the media file
+            media_id: Content fingerprint of the file, if already resolved
+
+        Returns:
+            MediaInfo
+
+        Raises:
+            RuntimeError: If the file cannot be read as media
+        """
+        if media_id:
+            key: Hashable = ("media_id", media_id)
+        else:
+            path = os.path.realpath(media_path)
+            st = os.stat(path)
+            key = ("path", path, st.st_size, st.st_mtime_ns)
+
+        with self._lock:
+            info = self._cache.get(key)
+            if info is not None:
+                self._cache.move_to_end(key)
+                self._counters["hits"] += 1
+                return info
+
+        info = self._probe_uncached(media_path)
+
+        with self._lock:
+            self._counters["probes"] += 1
+            self._cache[key] = info
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return info
+
+    def _probe_uncached(self, media_path: str) -> MediaInfo:
+        try:
+            magic_container, magic_type = detect_media_type(media_path)
+        except OSError as e:
+            raise RuntimeError(f"Could not open media file: {media_path}: {e}")
+
+        try:
+            if shutil.which("ffprobe"):
+                container, duration, streams = _probe_ffprobe(media_path)
+            else:
+                container, duration, streams = _probe_ffmpeg(media_path)
+        except (subprocess.SubprocessError, ValueError, RuntimeError) as e:
+            raise RuntimeError(f"Failed to probe {media_path}: {e}")
+
+        media_type = _classify(magic_type, streams)
+        if duration is None:
+            # Some containers only carry the duration on the stream
+            duration = next((s.duration for s in streams if s.duration), None)
+
+        info = MediaInfo(
+            path=media_path,
+            type=media_type,
+            container=magic_container or container,
+            duration=duration,
+            streams=streams,
+        )
+        logger.debug(f"Probed {media_path}: type={media_type}, container={info.container}, duration={duration}")
+        return info
+
+    def invalidate(self, media_id: str):
+        """Forget the cached probe for a media_id."""
+        with self._lock:
+            self._cache.pop(("media_id", media_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Probe / hit counters since process start."""
+        with self._lock:
+            return {**self._counters, "entries": len(self._cache)}
+
+
+_probe: LazySingleton[MediaProbe] = LazySingleton(MediaProbe)
+
+
+def get_media_probe() -> MediaProbe:
+    """Return the process-wide media probe, creating it on first use."""
+    return _probe.get()
+
+
+def probe_media(media_path: str, media_id: Optional[str] = None) -> MediaInfo:
+    """Probe a media file through the shared, memoized MediaProbe."""
+    return get_media_probe().probe(media_path, media_id)
@@ -0,0 +1,290 @@
+"""
+Perceptual Hash Index
+
+Reuses VLM descriptions across visually identical chunks (repeated slides,
+static screen recordings), within one media file or across everything
+previously ingested.
+
+Each frame gets a 256-bit difference hash (16x16 dHash, NumPy). A chunk's
+frame set matches a stored one when every frame on either side has a
+counterpart within `max_distance` bits (Hamming). Candidates are found through
+8-bit hash bands stored in SQLite: two hashes within d bits of each other share
+at least 32 - d of their 32 bands, so lookups stay indexed instead of scanning
+every entry.
+
+Descriptions are only reused under the same context key (model, profile and
+prompt template). The ASR text is matched separately through its speech key:
+an audio-aligned description explains how the frames relate to what is said,
+so it is only reused for the same words (case, punctuation and spacing are
+ignored); vision-only descriptions carry no speech and match on visuals alone.
+
+Entries beyond the size budget are evicted least recently used first.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..config import VISUAL_INDEX_DB_PATH, VLM_REUSE_MAX_DISTANCE, VLM_REUSE_MAX_ENTRIES
+from .stores import LazySingleton, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# 16x16 dHash: a 64-bit (8x8) hash cannot tell a slide from the same slide
+# with a line of handwriting added
+HASH_SIZE = 16
+HASH_BITS = HASH_SIZE * HASH_SIZE
+BAND_BITS = 8
+NUM_BANDS = HASH_BITS // BAND_BITS
+
+# Neighbouring cells must differ by more than this (0-255 luma) to set a bit;
+# keeps flat regions (white slide backgrounds) from flipping bits on noise
+GRADIENT_MARGIN = 1.0
+
+# Candidate entries verified per lookup (most recent first)
+MAX_CANDIDATES = 64
+
+# Eviction trims the index to this fraction of max_entries, so it does not
+# run again on the very next store
+EVICT_LOW_WATER = 0.9
+
+# ITU-R BT.601 luma weights
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def dhash(image: np.ndarray, hash_size: int = HASH_SIZE) -> int:
+    """
+    Difference hash of an RGB (or grayscale) frame.
+
+    The frame is reduced to a (hash_size) x (hash_size + 1) grayscale grid by
+    block means over a sampled pixel lattice; each bit records whether a cell
+    is brighter than its left-hand neighbour by more than GRADIENT_MARGIN.
+
+    Returns:
+        hash_size ** 2 bit integer
+    """
+    if image.ndim == 2:
+        image = image[:, :, None]
+    h, w = image.shape[:2]
+    sub = 4
+    rows = np.arange(hash_size * sub) * h // (hash_size * sub)
+    cols = np.arange((hash_size + 1) * sub) * w // ((hash_size + 1) * sub)
+    lattice = image[rows][:, cols]
+    grid = lattice.reshape(hash_size, sub, hash_size + 1, sub, -1).mean(axis=(1, 3), dtype=np.float32)
+    gray = grid @ _LUMA if grid.shape[2] == 3 else grid[:, :, 0]
+    bits = (gray[:, 1:] - gray[:, :-1] > GRADIENT_MARGIN).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return (a ^ b).bit_count()
+
+
+def frame_sets_match(a: Sequence[int], b: Sequence[int], max_distance: int) -> bool:
+    """True if every hash in each set has a counterpart in the other within max_distance."""
+    if not a or not b:
+        return False
+    return (
+        all(min(hamming(x, y) for y in b) <= max_distance for x in a)
+        and all(min(hamming(y, x) for x in a) <= max_distance for y in b)
+    )
+
+
+def speech_key(asr_text: Optional[str]) -> str:
+    """Key of the ASR context a description was written for ("" without speech)."""
+    words = re.sub(r"[^\w\s]", "", (asr_text or "").lower()).split()
+    if not words:
+        return ""
+    return hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+
+
+def _bands(value: int) -> List[int]:
+    """Split a hash into NUM_BANDS band values."""
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (i * BAND_BITS)) & mask for i in range(NUM_BANDS)]
+
+
+class PerceptualHashIndex(SQLiteStore):
+    """
+    SQLite-backed index of frame-set hashes -> visual descriptions.
+
+    Counters (see stats()): lookups, hits, evictions.
+    """
+
+    def __init__(
+        self,
+        db_path: str = VISUAL_INDEX_DB_PATH,
+        max_distance: int = VLM_REUSE_MAX_DISTANCE,
+        max_entries: int = VLM_REUSE_MAX_ENTRIES
+    ):
+        if max_distance >= NUM_BANDS:
+            logger.warning(
+                f"Hamming distance {max_distance} exceeds the band index guarantee; clamping to {NUM_BANDS - 1}"
+            )
+            max_distance = NUM_BANDS - 1
+        self.max_distance = max_distance
+        self.max_entries = max(1, max_entries)
+        self._counters = {"lookups": 0, "hits": 0, "evictions": 0}
+        super().__init__(db_path)
+
+    def _init_db(self):
+        """Initialize the entry and band tables."""
+        with self._lock, self._connect() as db:
+            columns = {row[1] for row in db.execute("PRAGMA table_info(visual_entries)")}
+            if columns and "speech_key" not in columns:
+                # Entries keyed on the full prompt (ASR text included) never match the
+                # current context keys; start over instead of carrying them
+                logger.info("Rebuilding the visual reuse index for the current key format")
+                db.execute("DROP TABLE visual_entries")
+                db.execute("DROP TABLE IF EXISTS visual_bands")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS visual_entries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    context_key TEXT NOT NULL,
+                    speech_key TEXT NOT NULL,
+                    media_id TEXT,
+                    start_time REAL,
+                    end_time REAL,
+                    hashes TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
+                    used_at INTEGER NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS idx_visual_entries_used ON visual_entries (used_at)")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS visual_bands (
+                    band INTEGER NOT NULL,
+                    value INTEGER NOT NULL,
+                    entry_id INTEGER NOT NULL
+                )
+            """)
+            db.execute("CREATE INDEX IF NOT EXISTS idx_visual_bands ON visual_bands (band, value)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_visual_bands_entry ON visual_bands (entry_id)")
+            self._entry_count = db.execute("SELECT COUNT(*) FROM visual_entries").fetchone()[0]
+
+    def lookup(
+        self,
+        context_key: str,
+        hashes: Sequence[int],
+        asr_text: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find a stored description for a visually matching frame set.
+
+        Args:
+            context_key: Model / profile / prompt template the description must share
+            hashes: dHash of each frame in the chunk
+            asr_text: ASR context of the chunk (must match the stored one, see speech_key)
+
+        Returns:
+            {description, media_id, start_time, end_time} of the matching entry, or None
+        """
+        if not hashes:
+            return None
+
+        # A match holds a hash within max_distance bits of hashes[0]; at most
+        # max_distance of its bands differ, so it shares the rest with the probe
+        probe = _bands(hashes[0])
+        clauses = " OR ".join(["(b.band = ? AND b.value = ?)"] * NUM_BANDS)
+        params: List[Any] = [context_key, speech_key(asr_text)]
+        for band, value in enumerate(probe):
+            params.extend([band, value])
+        params.append(NUM_BANDS - self.max_distance)
+
+        with self._lock, self._connect() as db:
+            rows = db.execute(
+                "SELECT e.id, e.hashes, e.description, e.media_id, e.start_time, e.end_time "
+                "FROM visual_bands b JOIN visual_entries e ON e.id = b.entry_id "
+                f"WHERE e.context_key = ? AND e.speech_key = ? AND ({clauses}) "
+                f"GROUP BY e.id HAVING COUNT(*) >= ? ORDER BY e.id DESC LIMIT {MAX_CANDIDATES}",
+                params
+            ).fetchall()
+            self._counters["lookups"] += 1
+
+        for entry_id, stored, description, media_id, start_time, end_time in rows:
+            stored_hashes = [int(h, 16) for h in json.loads(stored)]
+            if not frame_sets_match(hashes, stored_hashes, self.max_distance):
+                continue
+            with self._lock, self._connect() as db:
+                db.execute(
+                    "UPDATE visual_entries SET used_at = ? WHERE id = ?", (int(time.time() * 1000), entry_id)
+                )
+                self._counters["hits"] += 1
+            return {
+                "description": description,
+                "media_id": media_id,
+                "start_time": start_time,
+                "end_time": end_time,
+            }
+        return None
+
+    def store(
+        self,
+        context_key: str,
+        hashes: Sequence[int],
+        description: str,
+        media_id: Optional[str] = None,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        asr_text: Optional[str] = None
+    ):
+        """Index a generated description under its frame-set hashes and the ASR context it was written for."""
+        if not hashes:
+            return
+        now = int(time.time() * 1000)
+        with self._lock, self._connect() as db:
+            cursor = db.execute(
+                "INSERT INTO visual_entries "
+                "(context_key, speech_key, media_id, start_time, end_time, hashes, description, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (context_key, speech_key(asr_text), media_id, start_time, end_time,
+                 json.dumps([f"{h:0{HASH_BITS // 4}x}" for h in hashes]), description, now, now)
+            )
+            entry_id = cursor.lastrowid
+            bands = {(band, value) for h in hashes for band, value in enumerate(_bands(h))}
+            db.executemany(
+                "INSERT INTO visual_bands (band, value, entry_id) VALUES (?, ?, ?)",
+                [(band, value, entry_id) for band, value in bands]
+            )
+            self._entry_count += 1
+            if self._entry_count > self.max_entries:
+                self._evict(db)
+
+    def _evict(self, db):
+        """Drop least recently used entries down to EVICT_LOW_WATER of max_entries (caller holds the lock)."""
+        excess = self._entry_count - int(self.max_entries * EVICT_LOW_WATER)
+        victims = [
+            (row[0],) for row in
+            db.execute("SELECT id FROM visual_entries ORDER BY used_at, id LIMIT ?", (excess,))
+        ]
+        db.executemany("DELETE FROM visual_bands WHERE entry_id = ?", victims)
+        db.executemany("DELETE FROM visual_entries WHERE id = ?", victims)
+        self._entry_count -= len(victims)
+        self._counters["evictions"] += len(victims)
+        logger.info(f"Evicted {len(victims)} visual reuse entries ({self._entry_count} left)")
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup / hit / eviction counters since process start and the current entry count."""
+        with self._lock:
+            lookups = self._counters["lookups"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": self._entry_count,
+                "max_entries": self.max_entries,
+            }
+
+
+_index: LazySingleton[PerceptualHashIndex] = LazySingleton(PerceptualHashIndex)
+
+
+def get_phash_index() -> PerceptualHashIndex:
+    """Return the process-wide perceptual hash index, creating it on first use."""
+    return _index.get()
@@ -0,0 +1,230 @@
+"""
+Stage Pipeline
+
+Bounded producer/consumer pipeline: a source iterator and each intermediate
+stage run on their own thread, connected by queues of at most `prefetch`
+items, while the last stage runs on the calling thread. The VLM node uses it
+to decode and prepare chunk N+1 while the model is still describing chunk N;
+OpenCV decoding and OpenVINO inference both release the GIL, so threads
+overlap them without extra processes or copying frames between them.
+
+Per-stage busy time and utilization (busy / wall time) are recorded, so a
+run shows which stage is the bottleneck.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Poll interval for queue operations (lets workers notice a stop request)
+_POLL_SECONDS = 0.1
+
+_DONE = object()
+
+
+class _Failure:
+    """Exception raised in a worker, forwarded to the consumer."""
+
+    def __init__(self, stage: str, error: BaseException):
+        self.stage = stage
+        self.error = error
+
+
+Stage = Tuple[str, Callable[[Any], Any]]
+
+T = TypeVar("T")
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group an iterator into lists of up to `size` items (the last may be shorter)."""
+    group: List[T] = []
+    for item in items:
+        group.append(item)
+        if len(group) >= size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+class StagePipeline:
+    """
+    Run items from a source through a sequence of named stages.
+
+    Counters (see stats()): per-stage items, busy seconds and utilization.
+    """
+
+    def __init__(self, stages: Sequence[Stage], prefetch: int = 2, source_name: str = "source"):
+        """
+        Args:
+            stages: (name, fn) pairs; each fn maps one item to the next stage's input
+            prefetch: Items buffered between stages; 0 runs everything inline
+            source_name: Stage name under which time spent in the source iterator is reported
+        """
+        if not stages:
+            raise ValueError("stages cannot be empty")
+        self.stages = list(stages)
+        self.prefetch = max(0, prefetch)
+        self.source_name = source_name
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        names = [self.source_name] + [name for name, _ in self.stages]
+        self._busy: Dict[str, float] = {name: 0.0 for name in names}
+        self._items: Dict[str, int] = {name: 0 for name in names}
+        self._wall = 0.0
+
+    def _record(self, name: str, seconds: float):
+        with self._lock:
+            self._busy[name] += seconds
+            self._items[name] += 1
+
+    def _timed(self, name: str, fn: Callable[[Any], Any], item: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(item)
+        finally:
+            self._record(name, time.perf_counter() - start)
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """
+        Yield the last stage's output for every source item, in source order.
+
+        Exceptions raised by the source or a stage stop the pipeline and are
+        re-raised here; closing the iterator early stops the workers.
+        """
+        self._reset()
+        if self.prefetch == 0:
+            return self._run_inline(source)
+        return self._run_threaded(source)
+
+    def _run_inline(self, source: Iterable[Any]) -> Iterator[Any]:
+        start = time.perf_counter()
+        it = iter(source)
+        try:
+            while True:
+                t0 = time.perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    break
+                self._record(self.source_name, time.perf_counter() - t0)
+                for name, fn in self.stages:
+                    item = self._timed(name, fn, item)
+                yield item
+        finally:
+            close = getattr(it, "close", None)
+            if close:
+                close()
+            self._wall = time.perf_counter() - start
+
+    def _run_threaded(self, source: Iterable[Any]) -> Iterator[Any]:
+        start = time.perf_counter()
+        stop = threading.Event()
+        # queues[k] feeds stage k
+        queues: List[queue.Queue] = [queue.Queue(maxsize=self.prefetch) for _ in self.stages]
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue) -> Optional[Any]:
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=_POLL_SECONDS)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def source_worker():
+            it = iter(source)
+            try:
+                while not stop.is_set():
+                    t0 = time.perf_counter()
+                    try:
+                        item = next(it)
+                    except StopIteration:
+                        break
+                    self._record(self.source_name, time.perf_counter() - t0)
+                    if not put(queues[0], item):
+                        return
+                put(queues[0], _DONE)
+            except Exception as e:
+                put(queues[0], _Failure(self.source_name, e))
+            finally:
+                close = getattr(it, "close", None)
+                if close:
+                    close()
+
+        def stage_worker(k: int):
+            name, fn = self.stages[k]
+            while True:
+                item = get(queues[k])
+                if item is _DONE or isinstance(item, _Failure):
+                    put(queues[k + 1], item)
+                    return
+                try:
+                    result = self._timed(name, fn, item)
+                except Exception as e:
+                    put(queues[k + 1], _Failure(name, e))
+                    return
+                if not put(queues[k + 1], result):
+                    return
+
+        threads = [threading.Thread(target=source_worker, name=f"pipeline-{self.source_name}", daemon=True)]
+        for k in range(len(self.stages) - 1):
+            threads.append(threading.Thread(
+                target=stage_worker, args=(k,), name=f"pipeline-{self.stages[k][0]}", daemon=True
+            ))
+        for thread in threads:
+            thread.start()
+
+        last_name, last_fn = self.stages[-1]
+        try:
+            while True:
+                item = get(queues[-1])
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failure):
+                    logger.error(f"Pipeline stage '{item.stage}' failed: {item.error}")
+                    raise item.error
+                yield self._timed(last_name, last_fn, item)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            self._wall = time.perf_counter() - start
+
+    def stats(self) -> Dict[str, Any]:
+        """Wall time and per-stage {items, busy_seconds, utilization} of the last run."""
+        with self._lock:
+            wall = self._wall
+            return {
+                "wall_seconds": round(wall, 3),
+                "stages": {
+                    name: {
+                        "items": self._items[name],
+                        "busy_seconds": round(self._busy[name], 3),
+                        "utilization": round(self._busy[name] / wall, 3) if wall else 0.0,
+                    }
+                    for name in self._busy
+                },
+            }
+
+    def format_stats(self) -> str:
+        """One-line summary, e.g. 'wall 12.3s | decode 40% | prepare 5% | describe 97%'."""
+        stats = self.stats()
+        parts = [f"wall {stats['wall_seconds']:.1f}s"]
+        for name, stage in stats["stages"].items():
+            parts.append(f"{name} {stage['utilization']:.0%} ({stage['busy_seconds']:.1f}s/{stage['items']})")
+        return " | ".join(parts)
@@ -0,0 +1,174 @@
+"""
+Repeated Phrase Detection
+
+Finds phrases that repeat in a transcript (a Whisper hallucination indicator)
+without materialising every n-gram as a string.
+
+Words are mapped to integer token IDs, a suffix array is built over the token
+sequence by prefix doubling (vectorized NumPy sorts, O(n log L) for phrases of
+at most L words), and the LCP array is scanned once with a stack to enumerate
+every repeated phrase group in linear time. Strings are only built for reported
+phrases.
+
+A phrase is reported when it occurs at least `min_repeats` times (overlapping
+occurrences count) and is not contained in a longer reported phrase with the
+same count, i.e. the same {phrase: count} contract as the original n-gram
+detector in ASRNode.
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _suffix_array(tokens: np.ndarray, max_len: Optional[int]) -> np.ndarray:
+    """
+    Suffix array by prefix doubling.
+
+    When max_len is set, suffixes are only ordered by their first max_len
+    tokens (enough for phrases up to that length), which stops the doubling early.
+    """
+    n = len(tokens)
+    rank = tokens.astype(np.int64)
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while True:
+        if max_len is not None and k >= max_len:
+            break
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - k] = rank[k:]
+        sa = np.lexsort((second, rank))
+
+        # Re-rank: increment wherever the (rank, second) pair changes
+        changed = np.empty(n, dtype=np.int64)
+        changed[0] = 0
+        changed[1:] = (rank[sa[1:]] != rank[sa[:-1]]) | (second[sa[1:]] != second[sa[:-1]])
+        new_rank = np.empty(n, dtype=np.int64)
+        new_rank[sa] = np.cumsum(changed)
+        rank = new_rank
+
+        if rank.max() == n - 1:
+            break
+        k *= 2
+    return sa
+
+
+def _lcp_array(tokens: np.ndarray, sa: np.ndarray, max_len: Optional[int]) -> List[int]:
+    """
+    lcp[i] = common prefix length of suffixes sa[i-1] and sa[i] (lcp[0] = 0).
+
+    Capped: compare up to max_len tokens of adjacent suffixes, vectorized
+    (the suffix array is only sorted to that depth, so Kasai does not apply).
+    Uncapped: Kasai's algorithm over the fully sorted suffix array, O(n).
+    """
+    n = len(tokens)
+    if max_len is not None:
+        # Distinct negative padding so two suffixes never "match" past the end
+        padded = np.concatenate((tokens, -1 - np.arange(max_len, dtype=np.int64)))
+        prev, curr = sa[:-1], sa[1:]
+        lcp = np.zeros(n, dtype=np.int64)
+        alive = np.ones(n - 1, dtype=bool)
+        for offset in range(max_len):
+            alive &= padded[prev + offset] == padded[curr + offset]
+            lcp[1:] += alive
+        return lcp.tolist()
+
+    token_list = tokens.tolist()
+    sa_list = sa.tolist()
+    rank = [0] * n
+    for i, suffix in enumerate(sa_list):
+        rank[suffix] = i
+
+    lcp = [0] * n
+    h = 0
+    for i in range(n):
+        r = rank[i]
+        if r == 0:
+            h = 0
+            continue
+        j = sa_list[r - 1]
+        while i + h < n and j + h < n and token_list[i + h] == token_list[j + h]:
+            h += 1
+        lcp[r] = h
+        if h > 0:
+            h -= 1
+    return lcp
+
+
+def _lcp_intervals(lcp: List[int]) -> List[Tuple[int, int, int]]:
+    """
+    Enumerate LCP intervals (depth, left, right) over the suffix array.
+
+    Each interval is a group of >= 2 suffixes sharing their first `depth`
+    tokens, with `depth` maximal for the group.
+    """
+    n = len(lcp)
+    intervals = []
+    stack = [(0, 0)]  # (depth, left bound)
+    for i in range(1, n + 1):
+        current = lcp[i] if i < n else 0
+        left = i - 1
+        while current < stack[-1][0]:
+            depth, left = stack.pop()
+            intervals.append((depth, left, i - 1))
+        if current > stack[-1][0]:
+            stack.append((current, left))
+    return intervals
+
+
+def detect_repeated_phrases(
+    text: str,
+    min_phrase_words: int = 3,
+    min_repeats: int = 3,
+    max_phrase_words: Optional[int] = 6
+) -> Dict[str, int]:
+    """
+    Detect repeated phrases that may indicate Whisper hallucination.
+
+    Args:
+        text: Transcript text
+        min_phrase_words: Shortest phrase length (words) to report
+        min_repeats: Minimum occurrence count to report
+        max_phrase_words: Longest phrase length to report (None = unbounded)
+
+    Returns:
+        dict mapping repeated phrases to their occurrence count
+    """
+    words = text.lower().split()
+    n = len(words)
+    if n < min_phrase_words or (max_phrase_words is not None and max_phrase_words < min_phrase_words):
+        return {}
+
+    vocab: Dict[str, int] = {}
+    tokens = np.fromiter((vocab.setdefault(w, len(vocab)) for w in words), dtype=np.int64, count=n)
+
+    sa = _suffix_array(tokens, max_phrase_words)
+    sa_list = sa.tolist()
+    lcp = _lcp_array(tokens, sa, max_phrase_words)
+
+    # Left context of each suffix in SA order; suffix 0 gets a unique sentinel
+    left = np.where(sa > 0, tokens[np.maximum(sa - 1, 0)], -1 - np.arange(n))
+    # left_changes[i] = number of positions p < i where left[p] != left[p + 1]
+    left_changes = np.zeros(n, dtype=np.int64)
+    left_changes[1:] = np.cumsum(left[1:] != left[:-1])
+
+    repeated: Dict[str, int] = {}
+    for depth, lo, hi in _lcp_intervals(lcp):
+        count = hi - lo + 1
+        if depth < min_phrase_words or count < min_repeats:
+            continue
+
+        # Every occurrence preceded by the same word: the phrase is contained in a
+        # longer phrase with the same count (unless that one exceeds the length cap)
+        left_uniform = left_changes[hi] == left_changes[lo]
+        if left_uniform and (max_phrase_words is None or depth < max_phrase_words):
+            continue
+
+        start = sa_list[lo]
+        repeated[" ".join(words[start:start + depth])] = count
+
+    # Longest phrases first (matches the original detector's ordering)
+    return dict(sorted(repeated.items(), key=lambda item: -len(item[0])))
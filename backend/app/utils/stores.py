@@ -0,0 +1,61 @@
+"""
+Store Helpers
+
+Plumbing shared by the small process-wide stores: SQLite-backed ones kept next
+to the chat database open a short-lived connection per operation behind a
+lock, and every store is created lazily, once per process.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SQLiteStore:
+    """
+    Base class for SQLite-backed stores.
+
+    Subclasses create their tables in _init_db() and wrap every query in
+    `with self._lock, self._connect() as db:`.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_db()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection, committing on success."""
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _init_db(self):
+        """Create the store's tables (called once from __init__)."""
+        raise NotImplementedError
+
+
+class LazySingleton(Generic[T]):
+    """
+    Process-wide instance built by `factory` on the first get() call.
+
+    If the factory raises, nothing is cached and the next get() tries again.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        with self._lock:
+            if self._instance is None:
+                self._instance = self._factory()
+            return self._instance
@@ -0,0 +1,208 @@
+"""
+Voice Activity Detection
+
+Energy + spectral-flatness VAD over decoded PCM, run before Whisper so long
+silent or near-silent stretches are not transcribed (and not hallucinated on).
+
+Non-speech regions are compressed rather than zeroed: speech regions are kept
+intact, and each gap between them is shortened to at most `max_gap` seconds of
+real audio. SpeechMap records which original spans were kept so segment
+timestamps in compressed time can be mapped back to the original timeline.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .audio_features import frame_rms, spectral_flatness, FRAME_LENGTH, HOP_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# Decision thresholds
+ABS_THRESHOLD_DB = -50.0     # Frames quieter than this are never speech
+FLOOR_MARGIN_DB = 10.0       # Speech must be this far above the estimated noise floor
+MAX_FLATNESS = 0.5           # Flatter (noise-like) frames are not speech
+
+# Region smoothing (seconds)
+MIN_SPEECH = 0.25            # Drop speech bursts shorter than this
+MIN_SILENCE = 0.5            # Bridge silences shorter than this
+PADDING = 0.2                # Keep this much context around each region
+MAX_GAP = 0.5                # Longest stretch of non-speech kept between regions
+
+
+@dataclass
+class SpeechMap:
+    """
+    Mapping between compressed and original time.
+
+    Attributes:
+        sample_rate: Samples per second
+        original_starts: Start sample of each kept span in the original signal
+        compressed_starts: Start sample of each kept span in the compressed signal
+        lengths: Length of each kept span in samples
+        total_samples: Length of the original signal
+        speech_samples: Samples classified as speech (before padding)
+    """
+    sample_rate: int
+    original_starts: np.ndarray
+    compressed_starts: np.ndarray
+    lengths: np.ndarray
+    total_samples: int
+    speech_samples: int
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_samples / self.total_samples if self.total_samples else 0.0
+
+    @property
+    def compressed_samples(self) -> int:
+        return int(self.lengths.sum()) if len(self.lengths) else 0
+
+    def to_original(self, t: float, prefer_end: bool = False) -> float:
+        """
+        Map a compressed-time timestamp (seconds) to original time.
+
+        At a boundary between two kept spans, prefer_end=True maps to the end
+        of the earlier span (use for segment ends); otherwise to the start of
+        the later span (use for segment starts and resume points).
+        """
+        if not len(self.lengths):
+            return t
+        sample = t * self.sample_rate
+        side = "left" if prefer_end else "right"
+        i = max(0, int(np.searchsorted(self.compressed_starts, sample, side=side)) - 1)
+        within = min(max(sample - self.compressed_starts[i], 0), self.lengths[i])
+        return float(self.original_starts[i] + within) / self.sample_rate
+
+    def to_compressed(self, t: float) -> float:
+        """Map an original-time timestamp (seconds) to compressed time."""
+        if not len(self.lengths):
+            return t
+        sample = t * self.sample_rate
+        i = int(np.searchsorted(self.original_starts, sample, side="right")) - 1
+        if i < 0:
+            return 0.0
+        within = min(max(sample - self.original_starts[i], 0), self.lengths[i])
+        return float(self.compressed_starts[i] + within) / self.sample_rate
+
+    def remap_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Map {start, end, text} chunks from compressed to original time."""
+        return [
+            {**chunk, "start": self.to_original(chunk["start"]), "end": self.to_original(chunk["end"], prefer_end=True)}
+            for chunk in chunks
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary for audio_usability diagnostics."""
+        return {
+            "speech_ratio": round(self.speech_ratio, 3),
+            "vad_kept_seconds": round(self.compressed_samples / self.sample_rate, 2),
+            "vad_original_seconds": round(self.total_samples / self.sample_rate, 2),
+        }
+
+
+def detect_speech(
+    audio: np.ndarray,
+    sample_rate: int,
+    frame_length: int = FRAME_LENGTH,
+    hop_length: int = HOP_LENGTH
+) -> np.ndarray:
+    """
+    Frame-level speech decision.
+
+    Returns:
+        Boolean array, one entry per analysis frame
+    """
+    rms = frame_rms(audio, frame_length, hop_length)
+    if not len(rms):
+        return np.zeros(0, dtype=bool)
+
+    rms_db = 20.0 * np.log10(rms + 1e-10)
+    # Adaptive noise floor: the quietest 10% of frames
+    noise_floor = np.percentile(rms_db, 10)
+    threshold = max(ABS_THRESHOLD_DB, noise_floor + FLOOR_MARGIN_DB)
+
+    flatness = spectral_flatness(audio, frame_length, hop_length)
+    return (rms_db > threshold) & (flatness < MAX_FLATNESS)
+
+
+def _frames_to_regions(is_speech: np.ndarray, hop_length: int, frame_length: int, sample_rate: int, total: int) -> List[Tuple[int, int]]:
+    """Convert frame decisions into smoothed, padded sample regions."""
+    if not is_speech.any():
+        return []
+
+    # Run boundaries from the sign changes of the padded decision array
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0]))))
+    starts, ends = edges[::2] * hop_length, edges[1::2] * hop_length + frame_length
+
+    regions: List[List[int]] = []
+    min_silence = int(MIN_SILENCE * sample_rate)
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if regions and start - regions[-1][1] < min_silence:
+            regions[-1][1] = end
+        else:
+            regions.append([start, end])
+
+    min_speech = int(MIN_SPEECH * sample_rate)
+    padding = int(PADDING * sample_rate)
+    padded = []
+    for start, end in regions:
+        if end - start < min_speech:
+            continue
+        start, end = max(0, start - padding), min(total, end + padding)
+        if padded and start <= padded[-1][1]:
+            padded[-1] = (padded[-1][0], end)
+        else:
+            padded.append((start, end))
+    return padded
+
+
+def compress_silence(audio: np.ndarray, sample_rate: int, max_gap: float = MAX_GAP) -> Tuple[np.ndarray, SpeechMap]:
+    """
+    Run VAD and drop non-speech audio, keeping at most `max_gap` seconds of each gap.
+
+    Returns:
+        (compressed samples, SpeechMap for timestamp remapping)
+    """
+    total = len(audio)
+    is_speech = detect_speech(audio, sample_rate)
+    regions = _frames_to_regions(is_speech, HOP_LENGTH, FRAME_LENGTH, sample_rate, total)
+    speech_samples = int(is_speech.sum()) * HOP_LENGTH
+
+    # Kept spans: each speech region plus up to max_gap/2 of audio on either side of each gap
+    half_gap = int(max_gap * sample_rate / 2)
+    spans: List[Tuple[int, int]] = []
+    for start, end in regions:
+        start, end = max(0, start - half_gap), min(total, end + half_gap)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+
+    original_starts = np.array([s for s, _ in spans], dtype=np.int64)
+    lengths = np.array([e - s for s, e in spans], dtype=np.int64)
+    compressed_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64) if spans else np.zeros(0, dtype=np.int64)
+
+    speech_map = SpeechMap(
+        sample_rate=sample_rate,
+        original_starts=original_starts,
+        compressed_starts=compressed_starts,
+        lengths=lengths,
+        total_samples=total,
+        speech_samples=min(speech_samples, total),
+    )
+
+    if not spans:
+        compressed = np.zeros(0, dtype=audio.dtype)
+    elif len(spans) == 1 and spans[0] == (0, total):
+        compressed = audio
+    else:
+        compressed = np.concatenate([audio[s:e] for s, e in spans])
+
+    logger.info(
+        f"VAD: speech ratio {speech_map.speech_ratio:.2f}, "
+        f"kept {speech_map.compressed_samples / sample_rate:.1f}s of {total / sample_rate:.1f}s"
+    )
+    return compressed, speech_map
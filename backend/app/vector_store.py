@@ -1,25 +1,83 @@
 import chromadb
 import logging
+import os
+import threading
 import uuid
+from typing import Dict, Tuple
 
 from chromadb.utils import embedding_functions
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PERSIST_DIRECTORY = "chroma_db"
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# Process-wide ChromaDB clients (one per directory), embedding model and stores.
+# Chroma allows a single PersistentClient per path, and every store shares one
+# copy of the embedding model
+_registry_lock = threading.Lock()
+_clients: Dict[str, "chromadb.ClientAPI"] = {}
+_embedding_function = None
+_stores: Dict[Tuple[str, str], "VectorStore"] = {}
+
+
+def get_chroma_client(persist_directory: str = DEFAULT_PERSIST_DIRECTORY) -> "chromadb.ClientAPI":
+    """Return the shared PersistentClient for a directory, creating it on first use."""
+    path = os.path.abspath(persist_directory)
+    with _registry_lock:
+        if path not in _clients:
+            logger.info(f"Initializing ChromaDB at {persist_directory}...")
+            _clients[path] = chromadb.PersistentClient(path=persist_directory)
+        return _clients[path]
+
+
+def get_embedding_function():
+    """Return the shared sentence-transformers embedding function, loading the model on first use."""
+    global _embedding_function
+    with _registry_lock:
+        if _embedding_function is None:
+            logger.info(f"Loading embedding model ({EMBEDDING_MODEL_NAME})...")
+            _embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=EMBEDDING_MODEL_NAME
+            )
+        return _embedding_function
+
+
+def get_vector_store(
+    collection_name: str,
+    persist_directory: str = DEFAULT_PERSIST_DIRECTORY
+) -> "VectorStore":
+    """
+    Return the process-wide VectorStore for a collection, creating it on first use.
+
+    All stores share one ChromaDB client and one embedding model. Chroma
+    collections are safe to use from several threads, so nodes and tools
+    can hold the same instance.
+    """
+    key = (os.path.abspath(persist_directory), collection_name)
+    with _registry_lock:
+        store = _stores.get(key)
+    if store is not None:
+        return store
+
+    # Built outside the lock (client / model loading take it themselves)
+    store = VectorStore(persist_directory=persist_directory, collection_name=collection_name)
+    with _registry_lock:
+        return _stores.setdefault(key, store)
+
+
 class VectorStore:
-    def __init__(self, persist_directory="chroma_db", collection_name="video_knowledge"):
+    def __init__(self, persist_directory=DEFAULT_PERSIST_DIRECTORY, collection_name="video_knowledge"):
         """
-        Initialize ChromaDB Persistent Client.
+        Open a collection on the shared ChromaDB client.
         Explicitly loads the embedding model to avoid timeouts during add().
+
+        Prefer get_vector_store(), which also shares the VectorStore instance.
         """
-        logger.info(f"Initializing ChromaDB at {persist_directory}...")
-        self.client = chromadb.PersistentClient(path=persist_directory)
+        self.client = get_chroma_client(persist_directory)
         
-        # Pre-load embedding function
-        logger.info("Loading embedding model (all-MiniLM-L6-v2)...")
-        self.ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
+        # Pre-load embedding function (shared by all stores)
+        self.ef = get_embedding_function()
         
         # Get or create the collection
         self.collection = self.client.get_or_create_collection(
@@ -28,12 +86,15 @@ class VectorStore:
         )
         logger.info(f"ChromaDB initialized. Collection '{collection_name}' count: {self.collection.count()}")
     
-    def add_texts(self, texts: list[str], metadatas: list[dict]):
+    def add_texts(self, texts: list[str], metadatas: list[dict]) -> list[str]:
         """
         Add text chunks to the vector store.
+
+        Returns:
+            The generated document ids
         """
         if not texts:
-            return
+            return []
             
         ids = [str(uuid.uuid4()) for _ in texts]
         self.collection.add(
@@ -42,6 +103,22 @@ class VectorStore:
             ids=ids
         )
         logger.info(f"Added {len(texts)} documents to Vector Store.")
+        return ids
+
+    def update_metadatas(self, ids: list[str], metadatas: list[dict]):
+        """
+        Replace metadata of existing documents (documents and embeddings are unchanged).
+        """
+        if not ids:
+            return
+        self.collection.update(ids=ids, metadatas=metadatas)
+        logger.info(f"Updated metadata of {len(ids)} documents in Vector Store.")
+
+    def delete_by_metadata(self, where: dict):
+        """
+        Delete documents matching a metadata filter.
+        """
+        self.collection.delete(where=where)
 
     def search(self, query_text: str, n_results: int = 5, where: dict = None):
         """
@@ -1,22 +1,86 @@
+import hashlib
+import json
 import logging
 import os
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
 
+import numpy as np
 from PIL import Image
-from optimum.intel import OVModelForVisualCausalLM
-from transformers import AutoProcessor
+try:
+    import openvino_genai
+except ImportError:
+    openvino_genai = None
+
 from langchain_core.messages import BaseMessage
 
 from .base_llm import BaseLLMWrapper
-from .config import get_model_path
+from .config import (
+    get_model_path, VLM_BACKEND, VLM_DESCRIPTION_CACHE_ENABLED, VLM_ENCODER_CACHE_TILES, VLM_PROFILE
+)
+from .utils.description_cache import description_key, get_description_cache, hash_images
+from .utils.encoder_cache import VisionEmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+# A frame handed to the VLM: image path, RGB uint8 array (H, W, 3) or PIL image
+FrameInput = Union[str, np.ndarray, Image.Image]
+
+# Receives decoded text pieces as they are generated
+TokenStreamer = Callable[[str], Any]
+
+
+@dataclass(frozen=True)
+class VLMProfile:
+    """
+    Detail / throughput trade-off for VLM descriptions.
+
+    Attributes:
+        name: Profile name (recorded with fused chunks)
+        image_splitting: Split large images into encoder tiles plus a global view
+        long_edge_tiles: Longest image edge in encoder tiles (multiples of the
+            processor's max_image_size); None keeps the processor default
+        max_new_tokens: Default generation budget per description
+    """
+    name: str
+    image_splitting: bool
+    long_edge_tiles: Optional[int]
+    max_new_tokens: int
+
+
+# quality: processor defaults (SmolVLM2-500M: up to 4x4 tiles + global view per image)
+# balanced: at most 2x2 tiles + global view
+# fast: one tile per image, shorter descriptions
+VLM_PROFILES: Dict[str, VLMProfile] = {
+    "quality": VLMProfile("quality", image_splitting=True, long_edge_tiles=None, max_new_tokens=256),
+    "balanced": VLMProfile("balanced", image_splitting=True, long_edge_tiles=2, max_new_tokens=192),
+    "fast": VLMProfile("fast", image_splitting=False, long_edge_tiles=1, max_new_tokens=96),
+}
+
+
+def get_vlm_profile(profile: Union[str, VLMProfile, None] = None) -> VLMProfile:
+    """
+    Resolve a profile name (None = OBSIDIAN_VLM_PROFILE).
+
+    Raises:
+        ValueError: If the name is not a known profile
+    """
+    if isinstance(profile, VLMProfile):
+        return profile
+    name = (profile or VLM_PROFILE).strip().lower()
+    if name not in VLM_PROFILES:
+        raise ValueError(f"Unknown VLM profile '{name}' (expected one of: {', '.join(VLM_PROFILES)})")
+    return VLM_PROFILES[name]
 
 
 class VLMWrapper(BaseLLMWrapper):
     """
     Visual Language Model wrapper using SmolVLM2 via OpenVINO.
 
-    Uses OVModelForVisualCausalLM from optimum-intel for Intel-optimized inference.
+    Uses OVModelForVisualCausalLM from optimum-intel for Intel-optimized inference
+    (optimum / transformers / torch are imported when the model is loaded).
     Supports both video frames and static images (jpg/png).
+    See GenAIVLMWrapper for the openvino_genai.VLMPipeline backend.
     """
     AUDIO_ALIGNED_PROMPT = """You are given video frames corresponding to spoken audio.
 If you see any graph, be sure to describe it in detail.
@@ -35,12 +99,28 @@ If this is a static image, describe what you see.
 Indicate whether any action appears to complete within this segment.
 Be concise and factual."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        description_cache_enabled: bool = VLM_DESCRIPTION_CACHE_ENABLED,
+        encoder_cache_tiles: int = VLM_ENCODER_CACHE_TILES,
+        profile: Union[str, VLMProfile, None] = None
+    ):
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Default profile; describe calls can override it per ingestion
+        self.profile = get_vlm_profile(profile)
         self.model_path = get_model_path("vision")
+        self.model_version = self._model_version(self.model_path)
         self.device = "CPU"
         self.model = None
         self.processor = None
+        # Generated descriptions are reused across runs (exact frames / prompt / model match)
+        self.description_cache = get_description_cache() if description_cache_enabled else None
+        # Vision-tower outputs shared by overlapping chunks of one ingestion
+        self.encoder_cache_tiles = encoder_cache_tiles
+        self.encoder_cache: Optional[VisionEmbeddingCache] = None
+        # Token counts of the last generate() call (prompt tokens include visual tokens)
+        self.last_usage: Dict[str, int] = {}
+        self._clip_path_failed = False
 
         self.load_model()
 
@@ -49,6 +129,9 @@ Be concise and factual."""
         self.logger.info(f"Loading VLM model from {self.model_path} on {self.device}...")
 
         try:
+            from optimum.intel import OVModelForVisualCausalLM
+            from transformers import AutoProcessor
+
             # Load OpenVINO-optimized model
             self.model = OVModelForVisualCausalLM.from_pretrained(
                 self.model_path,
@@ -61,6 +144,17 @@ Be concise and factual."""
                 self.model_path,
                 trust_remote_code=True
             )
+            # Batched prompts must end where generation starts
+            tokenizer = getattr(self.processor, "tokenizer", None)
+            if tokenizer is not None:
+                tokenizer.padding_side = "left"
+
+            if self.encoder_cache_tiles > 0:
+                encoder_cache = VisionEmbeddingCache(self.encoder_cache_tiles)
+                if encoder_cache.attach(self.model):
+                    self.encoder_cache = encoder_cache
+                else:
+                    self.logger.info("Model exposes no get_vision_embeddings; vision encoder cache disabled")
 
             self.logger.info("VLM model loaded successfully.")
 
@@ -73,6 +167,12 @@ Be concise and factual."""
         self.logger.info("Unloading VLM model...")
         self.model = None
         self.processor = None
+        self.encoder_cache = None
+
+    def reset_encoder_cache(self):
+        """Forget cached vision-encoder outputs (called at ingestion boundaries)."""
+        if self.encoder_cache is not None:
+            self.encoder_cache.clear()
 
     def generate(self, messages: List[BaseMessage]) -> str:
         """
@@ -84,46 +184,290 @@ Be concise and factual."""
             "Use describe_frames() or describe_image() instead."
         )
 
+    def _check_loaded(self):
+        if self.model is None or self.processor is None:
+            raise RuntimeError("VLM model not loaded. Call load_model() first.")
+
     def describe_frames(
         self,
-        frame_paths: List[str],
+        frames: Sequence[FrameInput],
         asr_context: Optional[str] = None,
-        max_new_tokens: int = 256
+        max_new_tokens: Optional[int] = None,
+        profile: Union[str, VLMProfile, None] = None,
+        streamer: Optional[TokenStreamer] = None
     ) -> str:
         """
         Generate visual description from a sequence of video frames.
 
         Args:
-            frame_paths: List of paths to frame images
+            frames: Frames as in-memory RGB arrays, PIL images or image paths
             asr_context: Optional ASR transcript for audio-aligned prompting
-            max_new_tokens: Maximum tokens to generate
+            max_new_tokens: Maximum tokens to generate (None = profile default)
+            profile: VLM profile name (None = the wrapper's default profile)
+            streamer: Optional callback receiving text pieces as they are generated
+                (a cached description is passed in one piece)
 
         Returns:
             Visual description text
         """
-        if self.model is None or self.processor is None:
-            raise RuntimeError("VLM model not loaded. Call load_model() first.")
+        self._check_loaded()
 
-        if not frame_paths:
-            raise ValueError("frame_paths cannot be empty")
+        if not len(frames):
+            raise ValueError("frames cannot be empty")
+
+        profile = self._resolve_profile(profile)
+        max_new_tokens = max_new_tokens or profile.max_new_tokens
 
         # Load images
-        images = self._load_images(frame_paths)
+        images = self._load_images(frames)
+
+        # Unchanged chunk (same frames, prompt, ASR context, profile and model): no generation
+        key = self._cache_key(images, asr_context, max_new_tokens, profile=profile)
+        if key:
+            cached = self.description_cache.get(key)
+            if cached is not None:
+                self.logger.debug("Description cache hit")
+                if streamer is not None:
+                    streamer(cached)
+                return cached
 
         # Build prompt based on context
-        if asr_context:
-            prompt = self.AUDIO_ALIGNED_PROMPT.format(asr_context=asr_context)
-        else:
-            prompt = self.VISION_ONLY_PROMPT
+        prompt = self.build_prompt(asr_context)
 
         # Generate description
-        return self._generate_with_images(images, prompt, max_new_tokens)
+        description = self._generate_with_images(images, prompt, max_new_tokens, profile, streamer)
+        if key:
+            self.description_cache.put(key, description, self.model_version, max_new_tokens)
+        return description
+
+    def describe_frames_batch(
+        self,
+        frame_sets: Sequence[Sequence[FrameInput]],
+        asr_contexts: Optional[Sequence[Optional[str]]] = None,
+        max_new_tokens: Optional[int] = None,
+        profile: Union[str, VLMProfile, None] = None
+    ) -> List[str]:
+        """
+        Describe several chunks in one padded generate() call.
+
+        Each chunk keeps its own prompt (audio-aligned or vision-only).
+
+        Args:
+            frame_sets: One frame sequence per chunk (see describe_frames)
+            asr_contexts: Optional ASR transcript per chunk (None = vision-only)
+            max_new_tokens: Maximum tokens to generate per chunk (None = profile default)
+            profile: VLM profile name (None = the wrapper's default profile)
+
+        Returns:
+            Visual description per chunk, in input order
+        """
+        self._check_loaded()
+
+        if not len(frame_sets):
+            return []
+        if asr_contexts is None:
+            asr_contexts = [None] * len(frame_sets)
+        if len(asr_contexts) != len(frame_sets):
+            raise ValueError("asr_contexts must match frame_sets in length")
+        if any(not len(frames) for frames in frame_sets):
+            raise ValueError("frames cannot be empty")
+
+        profile = self._resolve_profile(profile)
+        max_new_tokens = max_new_tokens or profile.max_new_tokens
+        image_sets = [self._load_images(frames) for frames in frame_sets]
+        keys = [
+            self._cache_key(images, asr_context, max_new_tokens, profile=profile)
+            for images, asr_context in zip(image_sets, asr_contexts)
+        ]
+        descriptions: List[Optional[str]] = [
+            self.description_cache.get(key) if key else None for key in keys
+        ]
+
+        # Only cache misses go to the model
+        pending = [i for i, description in enumerate(descriptions) if description is None]
+        if pending:
+            generated = self._generate_batch(
+                [image_sets[i] for i in pending],
+                [self.build_prompt(asr_contexts[i]) for i in pending],
+                max_new_tokens,
+                profile
+            )
+            for i, description in zip(pending, generated):
+                descriptions[i] = description
+                if keys[i]:
+                    self.description_cache.put(keys[i], description, self.model_version, max_new_tokens)
+        return descriptions
+
+    def describe_clip(
+        self,
+        frames: Sequence[FrameInput],
+        asr_context: Optional[str] = None,
+        max_new_tokens: Optional[int] = None,
+        profile: Union[str, VLMProfile, None] = None
+    ) -> str:
+        """
+        Generate a visual description of frames sent as one video clip.
+
+        Uses SmolVLM2's video input path (frames in time order, one tile each)
+        instead of N independent, possibly image-split images, which needs far
+        fewer visual tokens per second of footage. Falls back to the
+        multi-image path (for the rest of the process) if the installed
+        processor rejects video input with a TypeError / ValueError; any other
+        error is raised as usual, so a transient failure only fails this call.
+        Video frames are never split, so the profile only sets max_new_tokens.
+
+        Args:
+            frames: Frames in time order (same size), as in describe_frames
+            asr_context: Optional ASR transcript for audio-aligned prompting
+            max_new_tokens: Maximum tokens to generate (None = profile default)
+            profile: VLM profile name (None = the wrapper's default profile)
+
+        Returns:
+            Visual description text
+        """
+        self._check_loaded()
+
+        if not len(frames):
+            raise ValueError("frames cannot be empty")
+
+        profile = self._resolve_profile(profile)
+        max_new_tokens = max_new_tokens or profile.max_new_tokens
+        images = self._load_images(frames)
+        if self._clip_path_failed:
+            return self.describe_frames(images, asr_context, max_new_tokens, profile)
+
+        key = self._cache_key(images, asr_context, max_new_tokens, input_mode="clip")
+        if key:
+            cached = self.description_cache.get(key)
+            if cached is not None:
+                self.logger.debug("Description cache hit")
+                return cached
+
+        prompt = self.build_prompt(asr_context)
+        clip = np.stack([np.asarray(img) for img in images])
+        try:
+            inputs = self._clip_inputs(clip, prompt)
+        except (TypeError, ValueError) as e:
+            # The processor has no video support (unknown `videos` argument / video template)
+            self.logger.warning(f"Video input path unavailable ({e}), using multi-image input from now on")
+            self._clip_path_failed = True
+            return self.describe_frames(images, asr_context, max_new_tokens, profile)
+        self.logger.debug(f"Generating clip description for {len(clip)} frames...")
+        description = self._run_generate(inputs, max_new_tokens)[0]
+
+        if key:
+            self.description_cache.put(key, description, self.model_version, max_new_tokens)
+        return description
+
+    def prompt_template(self, asr_context: Optional[str] = None) -> str:
+        """Prompt template behind build_prompt (ASR context not filled in)."""
+        return self.AUDIO_ALIGNED_PROMPT if asr_context else self.VISION_ONLY_PROMPT
+
+    def build_prompt(self, asr_context: Optional[str] = None) -> str:
+        """Prompt used by describe_frames: audio-aligned if ASR context is given, else vision-only."""
+        if asr_context:
+            return self.AUDIO_ALIGNED_PROMPT.format(asr_context=asr_context)
+        return self.VISION_ONLY_PROMPT
+
+    def _cache_key(
+        self,
+        images: List[Image.Image],
+        asr_context: Optional[str],
+        max_new_tokens: int,
+        input_mode: str = "images",
+        profile: Optional[VLMProfile] = None
+    ) -> Optional[str]:
+        """Description cache key for a describe call (None if caching is disabled)."""
+        if self.description_cache is None:
+            return None
+        template = self.prompt_template(asr_context)
+        if input_mode != "images":
+            template = f"[{input_mode}]\n{template}"
+        # Processor overrides change the visual tokens (processor defaults add nothing)
+        image_kwargs = self._image_kwargs(profile) if profile is not None else {}
+        if image_kwargs:
+            template = f"{sorted(image_kwargs.items())}\n{template}"
+        return description_key(hash_images(images), template, asr_context, self.model_version, max_new_tokens)
+
+    @staticmethod
+    def _model_version(model_path: str) -> str:
+        """
+        Model identity for cache keys.
+
+        For a local OpenVINO export this includes the size and mtime of each
+        IR file, so re-exporting the model invalidates cached descriptions;
+        a Hugging Face ID is used as-is.
+        """
+        if not model_path or not os.path.isdir(model_path):
+            return str(model_path)
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(model_path)):
+            if name.startswith("openvino") and name.endswith((".xml", ".bin")):
+                st = os.stat(os.path.join(model_path, name))
+                digest.update(f"{name}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+        return f"{model_path}@{digest.hexdigest()[:16]}"
+
+    def target_long_edge(self, profile: Union[str, VLMProfile, None] = None) -> Optional[int]:
+        """
+        Longest image edge (pixels) the processor resizes inputs to.
+
+        Read from the processor config (`size["longest_edge"]`) and capped by
+        the profile; frames larger than this can be downscaled at decode time
+        without changing what the model sees.
+
+        Args:
+            profile: VLM profile name (None = the wrapper's default profile)
+
+        Returns:
+            Edge length, or None if the processor is not loaded / does not say
+        """
+        edge = self._processor_long_edge("size")
+        if edge is None:
+            return None
+        profile_edge = self._profile_long_edge(self._resolve_profile(profile))
+        return min(edge, profile_edge) if profile_edge else edge
+
+    def _resolve_profile(self, profile: Union[str, VLMProfile, None]) -> VLMProfile:
+        return self.profile if profile is None else get_vlm_profile(profile)
+
+    def _processor_long_edge(self, attribute: str) -> Optional[int]:
+        """`longest_edge` of an image-processor size setting ("size" or "max_image_size"), if known."""
+        image_processor = getattr(self.processor, "image_processor", None)
+        value = getattr(image_processor, attribute, None)
+        if isinstance(value, dict) and value.get("longest_edge"):
+            return int(value["longest_edge"])
+        return None
+
+    def _profile_long_edge(self, profile: VLMProfile) -> Optional[int]:
+        """Longest image edge (pixels) the profile allows, or None for the processor default."""
+        # Encoder tile edge is the processor's max_image_size
+        tile = self._processor_long_edge("max_image_size")
+        if profile.long_edge_tiles is None or tile is None:
+            return None
+        return profile.long_edge_tiles * tile
+
+    def _image_kwargs(self, profile: VLMProfile) -> Dict[str, Any]:
+        """
+        Image-processor overrides for a profile (empty for processor defaults).
+
+        Passed per call, so concurrent describe calls with different profiles
+        do not interfere.
+        """
+        kwargs: Dict[str, Any] = {}
+        if not profile.image_splitting:
+            kwargs["do_image_splitting"] = False
+        edge = self._profile_long_edge(profile)
+        if edge:
+            kwargs["size"] = {"longest_edge": edge}
+        return kwargs
 
     def describe_image(
         self,
         image_path: str,
         prompt: Optional[str] = None,
-        max_new_tokens: int = 256
+        max_new_tokens: Optional[int] = None,
+        profile: Union[str, VLMProfile, None] = None,
+        streamer: Optional[TokenStreamer] = None
     ) -> str:
         """
         Generate description for a single static image (jpg/png).
@@ -131,13 +475,16 @@ Be concise and factual."""
         Args:
             image_path: Path to image file
             prompt: Optional custom prompt (defaults to vision-only prompt)
-            max_new_tokens: Maximum tokens to generate
+            max_new_tokens: Maximum tokens to generate (None = profile default)
+            profile: VLM profile name (None = the wrapper's default profile)
+            streamer: Optional callback receiving text pieces as they are generated
 
         Returns:
             Image description text
         """
-        if self.model is None or self.processor is None:
-            raise RuntimeError("VLM model not loaded. Call load_model() first.")
+        self._check_loaded()
+
+        profile = self._resolve_profile(profile)
 
         # Load image
         images = self._load_images([image_path])
@@ -146,20 +493,36 @@ Be concise and factual."""
         if prompt is None:
             prompt = self.VISION_ONLY_PROMPT
 
-        return self._generate_with_images(images, prompt, max_new_tokens)
+        return self._generate_with_images(
+            images, prompt, max_new_tokens or profile.max_new_tokens, profile, streamer
+        )
 
-    def _load_images(self, paths: List[str]) -> List[Image.Image]:
-        """Load images from paths and convert to RGB"""
+    def _load_images(self, frames: Sequence[FrameInput]) -> List[Image.Image]:
+        """
+        Convert frames to RGB PIL images.
+
+        In-memory arrays are wrapped without copying or re-encoding; only
+        path inputs are read from disk.
+        """
         images = []
-        for path in paths:
-            if not os.path.exists(path):
-                self.logger.warning(f"Image not found: {path}")
+        for frame in frames:
+            if isinstance(frame, Image.Image):
+                images.append(frame if frame.mode == "RGB" else frame.convert("RGB"))
+                continue
+            if isinstance(frame, np.ndarray):
+                if frame.ndim != 3 or frame.shape[2] != 3 or frame.dtype != np.uint8:
+                    self.logger.warning(f"Skipping frame with unsupported shape/dtype: {frame.shape} {frame.dtype}")
+                    continue
+                images.append(Image.fromarray(frame, mode="RGB"))
+                continue
+            if not os.path.exists(frame):
+                self.logger.warning(f"Image not found: {frame}")
                 continue
             try:
-                img = Image.open(path).convert("RGB")
+                img = Image.open(frame).convert("RGB")
                 images.append(img)
             except Exception as e:
-                self.logger.warning(f"Failed to load image {path}: {e}")
+                self.logger.warning(f"Failed to load image {frame}: {e}")
 
         if not images:
             raise ValueError("No valid images could be loaded")
@@ -170,55 +533,295 @@ Be concise and factual."""
         self,
         images: List[Image.Image],
         prompt: str,
-        max_new_tokens: int
+        max_new_tokens: int,
+        profile: Optional[VLMProfile] = None,
+        streamer: Optional[TokenStreamer] = None
     ) -> str:
+        """Generate text from one set of images and a prompt (batch of one)."""
+        return self._generate_batch([images], [prompt], max_new_tokens, profile, streamer)[0]
+
+    def _generate_batch(
+        self,
+        image_sets: List[List[Image.Image]],
+        prompts: List[str],
+        max_new_tokens: int,
+        profile: Optional[VLMProfile] = None,
+        streamer: Optional[TokenStreamer] = None
+    ) -> List[str]:
         """
-        Generate text from images and prompt using SmolVLM2 chat format.
+        Generate text for several (images, prompt) pairs using SmolVLM2 chat format.
 
         SmolVLM2 expects a chat template format where images are specified
-        as content entries with type "image".
+        as content entries with type "image". Prompts of different lengths are
+        left-padded so every sequence ends where generation starts. The
+        profile's image splitting / resolution is applied by the processor.
         """
-        self.logger.debug(f"Generating description for {len(images)} images...")
+        self.logger.debug(
+            f"Generating descriptions for {len(image_sets)} chunk(s), "
+            f"{sum(len(images) for images in image_sets)} images..."
+        )
 
         try:
-            # Build chat messages with images
-            # SmolVLM2 expects: [{"type": "image", "image" : image}, ..., {"type": "text", "text": prompt}]
-            content = []
-            for img in images:
-                content.append({"type": "image", "image": img})
-            content.append({"type": "text", "text": prompt})
-
-            messages = [{"role": "user", "content": content}]
-
-            # Apply chat template to get proper input format
-            text_input = self.processor.apply_chat_template(
-                messages,
-                add_generation_prompt=True,
-                tokenize=False
-            )
-
-            # Process with images
+            text_inputs = []
+            for images, prompt in zip(image_sets, prompts):
+                # Build chat messages with images
+                # SmolVLM2 expects: [{"type": "image", "image" : image}, ..., {"type": "text", "text": prompt}]
+                content = []
+                for img in images:
+                    content.append({"type": "image", "image": img})
+                content.append({"type": "text", "text": prompt})
+
+                messages = [{"role": "user", "content": content}]
+
+                # Apply chat template to get proper input format
+                text_inputs.append(self.processor.apply_chat_template(
+                    messages,
+                    add_generation_prompt=True,
+                    tokenize=False
+                ))
+
+            # Process with images (padding is a no-op for a single chunk)
             inputs = self.processor(
-                text=text_input,
-                images=images,
-                return_tensors="pt"
+                text=text_inputs,
+                images=image_sets,
+                padding=len(text_inputs) > 1,
+                return_tensors="pt",
+                **self._image_kwargs(self._resolve_profile(profile))
             )
 
-            # Generate
-            output_ids = self.model.generate(
-                **inputs,
-                max_new_tokens=max_new_tokens,
-                do_sample=False
-            )
+            return self._run_generate(inputs, max_new_tokens, streamer if len(text_inputs) == 1 else None)
 
-            # Decode output (skip input tokens)
-            input_len = inputs["input_ids"].shape[1]
-            generated_ids = output_ids[0, input_len:]
-            description = self.processor.decode(generated_ids, skip_special_tokens=True)
+        except Exception as e:
+            self.logger.error(f"VLM generation failed: {e}")
+            raise
+
+    def _clip_inputs(self, clip: np.ndarray, prompt: str):
+        """
+        Processor inputs for frames passed as one video through SmolVLM2's video path.
+
+        The chat template gets a single {"type": "video"} entry and the
+        processor receives the frames as a (T, H, W, 3) clip. Video frames are
+        never image-split, so each costs one tile of visual tokens.
+        Frames were already sampled, so the processor must not resample them.
+
+        Raises:
+            TypeError, ValueError: If the processor has no video support
+        """
+        messages = [{"role": "user", "content": [{"type": "video"}, {"type": "text", "text": prompt}]}]
+        text_input = self.processor.apply_chat_template(
+            messages,
+            add_generation_prompt=True,
+            tokenize=False
+        )
+        return self.processor(
+            text=[text_input],
+            videos=[clip],
+            do_sample_frames=False,
+            return_tensors="pt"
+        )
+
+    def _run_generate(self, inputs, max_new_tokens: int, streamer: Optional[TokenStreamer] = None) -> List[str]:
+        """Greedy generate() on processed inputs; returns the decoded continuations."""
+        generate_kwargs = {}
+        if streamer is not None:
+            generate_kwargs["streamer"] = _callback_streamer(self.processor.tokenizer, streamer)
+
+        # Generate
+        output_ids = self.model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            **generate_kwargs
+        )
+
+        # Decode output (skip input tokens; inputs share the padded length)
+        input_len = inputs["input_ids"].shape[1]
+        generated = output_ids[:, input_len:]
+        descriptions = self.processor.batch_decode(generated, skip_special_tokens=True)
+        self.last_usage = {
+            "prompt_tokens": int(input_len),
+            "generated_tokens": int(generated.shape[1]),
+            "batch_size": int(generated.shape[0]),
+        }
+
+        self.logger.debug(f"Generated description: {descriptions[0][:100]}...")
+        return [description.strip() for description in descriptions]
+
+
+def _callback_streamer(tokenizer, callback: TokenStreamer):
+    """transformers streamer forwarding each finalized text piece to a callback."""
+    from transformers import TextStreamer
+
+    class CallbackStreamer(TextStreamer):
+        def on_finalized_text(self, text: str, stream_end: bool = False):
+            if text:
+                callback(text)
+
+    return CallbackStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+
+
+class GenAIVLMWrapper(VLMWrapper):
+    """
+    SmolVLM2 on openvino_genai.VLMPipeline (as ASR uses WhisperPipeline).
+
+    Image preprocessing, the chat template, tokenization and generation all
+    run in the C++ pipeline: no optimum / transformers / torch import and no
+    torch tensors per call. Needs a local OpenVINO export of the model.
+
+    Differences from the optimum backend:
+    - Batches are generated one chunk after another (no padded batch)
+    - Profiles cap resolution by resizing frames before the pipeline; the
+      pipeline's own image splitting follows the exported preprocessor config
+    - No video input path (describe_clip is multi-image input)
+    - No vision-encoder cache (the encoder runs inside the pipeline)
+    """
 
-            self.logger.debug(f"Generated description: {description[:100]}...")
-            return description.strip()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Same weights, different runtime and preprocessing: keep cached descriptions apart
+        self.model_version = f"{self.model_version}+genai"
 
+    def load_model(self):
+        """Load SmolVLM2 as an openvino_genai.VLMPipeline."""
+        if openvino_genai is None:
+            raise ImportError("openvino-genai is not installed. Please install it to use the genai VLM backend.")
+        if not os.path.isdir(self.model_path):
+            raise RuntimeError(
+                f"The genai VLM backend needs a local OpenVINO export of the model, got '{self.model_path}'"
+            )
+
+        self.logger.info(f"Loading VLM model from {self.model_path} on {self.device} (OpenVINO GenAI)...")
+        try:
+            self.model = openvino_genai.VLMPipeline(self.model_path, self.device)
+            self._preprocessor_config = self._load_preprocessor_config(self.model_path)
+            self.logger.info("VLM model loaded successfully.")
         except Exception as e:
-            self.logger.error(f"VLM generation failed: {e}")
+            self.logger.error(f"Failed to load VLM model: {e}")
             raise
+
+    def unload_model(self):
+        """Unload the VLM pipeline to free memory."""
+        self.logger.info("Unloading VLM model...")
+        self.model = None
+
+    def _check_loaded(self):
+        if self.model is None:
+            raise RuntimeError("VLM model not loaded. Call load_model() first.")
+
+    @staticmethod
+    def _load_preprocessor_config(model_path: str) -> Dict[str, Any]:
+        path = os.path.join(model_path, "preprocessor_config.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _processor_long_edge(self, attribute: str) -> Optional[int]:
+        value = getattr(self, "_preprocessor_config", {}).get(attribute)
+        if isinstance(value, dict) and value.get("longest_edge"):
+            return int(value["longest_edge"])
+        return None
+
+    def _image_kwargs(self, profile: VLMProfile) -> Dict[str, Any]:
+        # The pipeline takes no preprocessing overrides; frames are resized up front
+        edge = self._profile_long_edge(profile)
+        return {"size": {"longest_edge": edge}} if edge else {}
+
+    def _generate_batch(
+        self,
+        image_sets: List[List[Image.Image]],
+        prompts: List[str],
+        max_new_tokens: int,
+        profile: Optional[VLMProfile] = None,
+        streamer: Optional[TokenStreamer] = None
+    ) -> List[str]:
+        """Generate text for each (images, prompt) pair in turn; images are prepended to the prompt."""
+        import openvino as ov
+
+        edge = self._profile_long_edge(self._resolve_profile(profile))
+        config = self.model.get_generation_config()
+        config.max_new_tokens = max_new_tokens
+        config.do_sample = False
+
+        descriptions = []
+        for images, prompt in zip(image_sets, prompts):
+            tensors = [ov.Tensor(np.array(self._fit(img, edge), dtype=np.uint8)[None]) for img in images]
+            try:
+                result = self.model.generate(
+                    prompt,
+                    images=tensors,
+                    generation_config=config,
+                    streamer=_genai_streamer(streamer) if streamer is not None and len(prompts) == 1 else None
+                )
+            except Exception as e:
+                self.logger.error(f"VLM generation failed: {e}")
+                raise
+            metrics = result.perf_metrics
+            self.last_usage = {
+                "prompt_tokens": int(metrics.get_num_input_tokens()),
+                "generated_tokens": int(metrics.get_num_generated_tokens()),
+                "batch_size": 1,
+            }
+            descriptions.append(result.texts[0].strip())
+        return descriptions
+
+    def describe_clip(
+        self,
+        frames: Sequence[FrameInput],
+        asr_context: Optional[str] = None,
+        max_new_tokens: Optional[int] = None,
+        profile: Union[str, VLMProfile, None] = None
+    ) -> str:
+        """The pipeline has no video input: describe the frames as multiple images."""
+        return self.describe_frames(frames, asr_context, max_new_tokens, profile)
+
+    @staticmethod
+    def _fit(image: Image.Image, edge: Optional[int]) -> Image.Image:
+        """Downscale so the longest edge is at most `edge` (never upscales)."""
+        if not edge or max(image.size) <= edge:
+            return image
+        scale = edge / max(image.size)
+        return image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.Resampling.BICUBIC
+        )
+
+
+def _genai_streamer(callback: TokenStreamer) -> Callable[[str], bool]:
+    """openvino_genai streamer: forwards each piece; returning False keeps generating."""
+    def stream(text: str) -> bool:
+        callback(text)
+        return False
+    return stream
+
+
+VLM_BACKENDS = {
+    "optimum": VLMWrapper,
+    "genai": GenAIVLMWrapper,
+}
+
+
+def create_vlm(backend: Optional[str] = None, **kwargs) -> VLMWrapper:
+    """
+    Load the VLM on the configured backend (OBSIDIAN_VLM_BACKEND).
+
+    If the genai backend cannot be loaded (openvino-genai missing, no local
+    export, model not supported by the installed VLMPipeline) the optimum
+    backend is used instead.
+
+    Args:
+        backend: "optimum" or "genai" (None = configured default)
+        **kwargs: Passed to the wrapper constructor
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = (backend or VLM_BACKEND).strip().lower()
+    if name not in VLM_BACKENDS:
+        raise ValueError(f"Unknown VLM backend '{name}' (expected one of: {', '.join(VLM_BACKENDS)})")
+    if name == "genai":
+        try:
+            return GenAIVLMWrapper(**kwargs)
+        except Exception as e:
+            logger.warning(f"GenAI VLM backend unavailable ({e}), falling back to optimum")
+    return VLMWrapper(**kwargs)
@@ -0,0 +1,84 @@
+"""
+ASR real-time-factor benchmark: single generate() call vs windowed parallel transcription.
+
+RTF = processing time / audio duration (lower is better; < 1.0 is faster than real time).
+
+Usage (from the backend directory, with the Whisper model available):
+    python -m benchmarks.bench_asr_rtf
+    python -m benchmarks.bench_asr_rtf --media ../test_media/DarkDaysBeforeDocker.mp3 --workers 1 2 4
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from app.asr import ASRWrapper
+from app.utils.audio_source import decode_audio, SAMPLE_RATE
+
+DEFAULT_MEDIA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "test_media", "DarkDaysBeforeDocker.mp3"
+)
+
+
+def run_case(label: str, asr: ASRWrapper, audio, parallel: bool, repeats: int) -> dict:
+    duration = len(audio) / SAMPLE_RATE
+    # Warm-up (first inference includes compilation / allocation)
+    asr.transcribe(audio, parallel=parallel)
+
+    timings = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = asr.transcribe(audio, parallel=parallel)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    return {
+        "label": label,
+        "seconds": best,
+        "rtf": best / duration if duration else 0.0,
+        "chunks": len(result["chunks"]),
+        "text": result["full_transcription"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", default=DEFAULT_MEDIA, help="Audio or video file to transcribe")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Pool sizes to test")
+    parser.add_argument("--window", type=float, default=30.0, help="Window length in seconds")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    audio = decode_audio(args.media)
+    duration = len(audio) / SAMPLE_RATE
+    print(f"Media: {args.media} ({duration:.1f}s), window={args.window}s, cores={os.cpu_count()}")
+
+    rows = []
+    baseline = ASRWrapper(num_workers=1, window_seconds=args.window)
+    rows.append(run_case("single-call", baseline, audio, parallel=False, repeats=args.repeats))
+    baseline.unload_model()
+
+    for workers in args.workers:
+        asr = ASRWrapper(num_workers=workers, window_seconds=args.window)
+        row = run_case(f"parallel x{workers}", asr, audio, parallel=True, repeats=args.repeats)
+        # Determinism check: a second run must produce the identical transcript
+        row["deterministic"] = asr.transcribe(audio, parallel=True)["full_transcription"] == row["text"]
+        rows.append(row)
+        asr.unload_model()
+
+    print(f"\n{'mode':<14}{'seconds':>10}{'RTF':>8}{'speedup':>9}{'chunks':>8}  deterministic")
+    base_seconds = rows[0]["seconds"]
+    for row in rows:
+        print(
+            f"{row['label']:<14}{row['seconds']:>10.2f}{row['rtf']:>8.3f}"
+            f"{base_seconds / row['seconds']:>8.2f}x{row['chunks']:>8}  {row.get('deterministic', '-')}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Frame sampling benchmark: one ffmpeg process per frame vs single-pass batched extraction.
+
+Windows follow vision-driven chunking (4s chunks, 1s overlap) over the whole
+video, sampled at 1 fps. The per-frame and "single-pass+jpeg" rows write JPEGs
+to a scratch directory; "single-pass" is the default in-memory handoff. The
+artifact store is bypassed so repeated runs are not cache hits. "single-pass@N"
+downscales at decode time to a longest edge of N pixels (--max-edge, the VLM
+processor's target size). The MB column is the decoded frame memory.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_frame_sampler
+    python -m benchmarks.bench_frame_sampler --media ../test_media/YTShorts-GCSEMathPieChart.mp4 --chunk 4 --overlap 1
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import List, Tuple
+
+from app.utils.ffmpeg_utils import ensure_ffmpeg_in_path
+from app.utils.frame_sampler import frame_timestamps, get_video_duration, sample_frames_batch
+
+DEFAULT_MEDIA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "test_media", "YTShorts-GCSEMathPieChart.mp4"
+)
+
+
+def legacy_sample_frames(video_path: str, start_time: float, end_time: float, fps: float, max_frames: int, output_dir: str) -> List[str]:
+    """The original per-frame path: one `ffmpeg -ss ... -vframes 1` process per timestamp."""
+    paths = []
+    for i, ts in enumerate(frame_timestamps(start_time, end_time, fps, max_frames)):
+        frame_path = os.path.join(output_dir, f"{start_time:.2f}_{end_time:.2f}_frame{i:03d}.jpg")
+        cmd = ["ffmpeg", "-y", "-ss", str(ts), "-i", video_path, "-vframes", "1", "-q:v", "2", frame_path]
+        try:
+            subprocess.run(cmd, capture_output=True, check=True, timeout=30)
+            paths.append(frame_path)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+            pass
+    return paths
+
+
+def vision_windows(duration: float, chunk: float, overlap: float) -> List[Tuple[float, float]]:
+    windows = []
+    start = 0.0
+    while start < duration:
+        windows.append((start, min(start + chunk, duration)))
+        start += chunk - overlap
+    return windows
+
+
+def frame_megabytes(batches: List[List[dict]]) -> float:
+    return sum(f["image"].nbytes for frames in batches for f in frames) / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", default=DEFAULT_MEDIA, help="Video file to sample")
+    parser.add_argument("--chunk", type=float, default=4.0, help="Chunk length in seconds")
+    parser.add_argument("--overlap", type=float, default=1.0, help="Chunk overlap in seconds")
+    parser.add_argument("--fps", type=float, default=1.0)
+    parser.add_argument("--max-frames", type=int, default=8)
+    parser.add_argument("--max-edge", type=int, default=512, help="Longest edge for the downscaled row")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    ensure_ffmpeg_in_path()
+
+    duration = get_video_duration(args.media)
+    windows = vision_windows(duration, args.chunk, args.overlap)
+    print(f"Media: {args.media} ({duration:.1f}s), {len(windows)} windows")
+
+    scratch = tempfile.mkdtemp(prefix="obsidian_bench_frames_")
+    try:
+        legacy_dir = os.path.join(scratch, "legacy")
+        os.makedirs(legacy_dir)
+        start = time.perf_counter()
+        legacy_frames = sum(
+            len(legacy_sample_frames(args.media, s, e, args.fps, args.max_frames, legacy_dir)) for s, e in windows
+        )
+        legacy_seconds = time.perf_counter() - start
+
+        batch_dir = os.path.join(scratch, "batch")
+        start = time.perf_counter()
+        batch = sample_frames_batch(args.media, windows, args.fps, args.max_frames, output_dir=batch_dir, cache=False)
+        jpeg_seconds = time.perf_counter() - start
+        jpeg_frames = sum(len(frames) for frames in batch)
+
+        start = time.perf_counter()
+        batch = sample_frames_batch(args.media, windows, args.fps, args.max_frames, cache=False)
+        batch_seconds = time.perf_counter() - start
+        batch_frames = sum(len(frames) for frames in batch)
+        batch_mb = frame_megabytes(batch)
+
+        start = time.perf_counter()
+        small = sample_frames_batch(args.media, windows, args.fps, args.max_frames, cache=False, max_edge=args.max_edge)
+        small_seconds = time.perf_counter() - start
+        small_frames = sum(len(frames) for frames in small)
+        small_mb = frame_megabytes(small)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    small_label = f"single-pass@{args.max_edge}"
+    print(f"\n{'mode':<18}{'seconds':>10}{'frames':>8}{'ms/frame':>10}{'MB':>8}")
+    print(f"{'per-frame':<18}{legacy_seconds:>10.2f}{legacy_frames:>8}{1000 * legacy_seconds / max(legacy_frames, 1):>10.1f}{'-':>8}")
+    print(f"{'single-pass+jpeg':<18}{jpeg_seconds:>10.2f}{jpeg_frames:>8}{1000 * jpeg_seconds / max(jpeg_frames, 1):>10.1f}{'-':>8}")
+    print(f"{'single-pass':<18}{batch_seconds:>10.2f}{batch_frames:>8}{1000 * batch_seconds / max(batch_frames, 1):>10.1f}{batch_mb:>8.1f}")
+    print(f"{small_label:<18}{small_seconds:>10.2f}{small_frames:>8}{1000 * small_seconds / max(small_frames, 1):>10.1f}{small_mb:>8.1f}")
+    print(f"\nSpeedup: {legacy_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Repeated-phrase detector benchmark: original n-gram counting vs suffix-array detector.
+
+Transcripts are synthetic (random vocabulary with injected hallucination loops),
+so the benchmark runs without any model or media.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_repeated_phrases
+    python -m benchmarks.bench_repeated_phrases --sizes 1000 10000 100000 --skip-legacy-above 10000
+"""
+
+import argparse
+import random
+import time
+from typing import Dict
+
+from app.utils.repetition import detect_repeated_phrases
+
+
+def legacy_detect_repeated_phrases(text: str, min_phrase_words: int = 3, min_repeats: int = 3) -> Dict[str, int]:
+    """The original ASRNode implementation (all 3-6 word n-grams + quadratic subphrase filter)."""
+    words = text.lower().split()
+    phrase_counts = {}
+
+    for phrase_len in range(min_phrase_words, min(7, len(words) + 1)):
+        for i in range(len(words) - phrase_len + 1):
+            phrase = " ".join(words[i:i + phrase_len])
+            phrase_counts[phrase] = phrase_counts.get(phrase, 0) + 1
+
+    repeated = {phrase: count for phrase, count in phrase_counts.items() if count >= min_repeats}
+
+    filtered = {}
+    for phrase, count in sorted(repeated.items(), key=lambda x: -len(x[0])):
+        is_subphrase = False
+        for longer_phrase in filtered:
+            if phrase in longer_phrase and filtered[longer_phrase] >= count:
+                is_subphrase = True
+                break
+        if not is_subphrase:
+            filtered[phrase] = count
+
+    return filtered
+
+
+def make_transcript(num_words: int, vocab_size: int = 2000, loop_every: int = 400, seed: int = 0) -> str:
+    """Random words with a short phrase looped several times every `loop_every` words."""
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(vocab_size)]
+    words = []
+    while len(words) < num_words:
+        words.extend(rng.choice(vocab) for _ in range(loop_every))
+        loop = [rng.choice(vocab) for _ in range(rng.randint(3, 8))]
+        words.extend(loop * rng.randint(3, 6))
+    return " ".join(words[:num_words])
+
+
+def time_call(func, text: str, repeats: int):
+    best, result = float("inf"), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(text)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Transcript lengths in words")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--skip-legacy-above", type=int, default=None, help="Do not run the original detector above this size")
+    args = parser.parse_args()
+
+    print(f"\n{'words':>8}{'legacy s':>11}{'suffix s':>11}{'speedup':>9}{'phrases':>9}  same result")
+    for size in args.sizes:
+        text = make_transcript(size)
+        new_seconds, new_result = time_call(detect_repeated_phrases, text, args.repeats)
+
+        if args.skip_legacy_above is not None and size > args.skip_legacy_above:
+            print(f"{size:>8}{'-':>11}{new_seconds:>11.4f}{'-':>9}{len(new_result):>9}  -")
+            continue
+
+        legacy_seconds, legacy_result = time_call(legacy_detect_repeated_phrases, text, 1)
+        print(
+            f"{size:>8}{legacy_seconds:>11.4f}{new_seconds:>11.4f}"
+            f"{legacy_seconds / new_seconds:>8.1f}x{len(new_result):>9}  {legacy_result == new_result}"
+        )
+
+
+if __name__ == "__main__":
+    main()
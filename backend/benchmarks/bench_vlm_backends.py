@@ -0,0 +1,168 @@
+"""
+VLM backend A/B benchmark: optimum-intel (OVModelForVisualCausalLM) vs openvino_genai.VLMPipeline.
+
+Each backend runs in its own Python process, so resident memory (RSS) covers
+only that backend's imports, model and buffers. Chunks follow vision-driven
+chunking (4s chunks, 1s overlap) over the video, downscaled and reduced to
+keyframes as in VLMNode; frames are decoded before the model is loaded. The
+description cache is disabled so every chunk reaches the model.
+
+Reported per backend: import + load time, RSS after loading, peak RSS while
+describing, time to first streamed text piece and seconds per chunk.
+
+Usage (from the backend directory, with a local OpenVINO export of SmolVLM2):
+    python -m benchmarks.bench_vlm_backends
+    python -m benchmarks.bench_vlm_backends --backends genai --max-chunks 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+
+DEFAULT_MEDIA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "test_media", "YTShorts-GCSEMathPieChart.mp4"
+)
+
+# Peak RSS sampling interval
+SAMPLE_SECONDS = 0.05
+
+
+class PeakRSS:
+    """Samples this process's RSS on a background thread and keeps the maximum."""
+
+    def __init__(self):
+        self.process = psutil.Process()
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(SAMPLE_SECONDS):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def mb(num_bytes: float) -> float:
+    return num_bytes / (1024 * 1024)
+
+
+def run_worker(args) -> dict:
+    """Load one backend, describe the chunks and return the measurements."""
+    from app.utils.frame_sampler import get_video_duration, sample_frames_batch
+    from app.utils.keyframes import select_keyframes
+    from benchmarks.bench_frame_sampler import vision_windows
+
+    process = psutil.Process()
+    duration = get_video_duration(args.media)
+    windows = vision_windows(duration, args.chunk, args.overlap)[:args.max_chunks]
+    # Decode at the default profile's resolution (no processor loaded yet)
+    batches = sample_frames_batch(args.media, windows, cache=False, max_edge=args.max_edge)
+    frame_sets = [[f["image"] for f in select_keyframes(frames)[0]] for frames in batches if frames]
+    rss_base = process.memory_info().rss
+
+    start = time.perf_counter()
+    from app.vlm import VLM_BACKENDS
+    vlm = VLM_BACKENDS[args.worker](description_cache_enabled=False)
+    load_seconds = time.perf_counter() - start
+    rss_loaded = process.memory_info().rss
+
+    # Warm-up (first inference includes compilation / allocation)
+    vlm.describe_frames(frame_sets[0], max_new_tokens=8)
+
+    latencies, first_piece, prompt_tokens = [], [], []
+    with PeakRSS() as peak:
+        for frames in frame_sets:
+            pieces = []
+            t0 = time.perf_counter()
+            vlm.describe_frames(
+                frames,
+                max_new_tokens=args.max_new_tokens,
+                streamer=lambda text: pieces.append(time.perf_counter() - t0)
+            )
+            latencies.append(time.perf_counter() - t0)
+            if pieces:
+                first_piece.append(pieces[0])
+            prompt_tokens.append(vlm.last_usage.get("prompt_tokens", 0))
+
+    return {
+        "backend": args.worker,
+        "chunks": len(frame_sets),
+        "load_seconds": load_seconds,
+        "rss_base_mb": mb(rss_base),
+        "rss_loaded_mb": mb(rss_loaded),
+        "rss_peak_mb": mb(peak.peak),
+        "first_piece_ms": statistics.mean(first_piece) * 1000 if first_piece else 0.0,
+        "seconds_per_chunk": statistics.mean(latencies),
+        "prompt_tokens": statistics.mean(prompt_tokens),
+    }
+
+
+def run_backend(backend: str, args) -> dict:
+    """Run one backend in a fresh interpreter and parse its JSON result line."""
+    cmd = [
+        sys.executable, "-m", "benchmarks.bench_vlm_backends", "--worker", backend,
+        "--media", args.media, "--chunk", str(args.chunk), "--overlap", str(args.overlap),
+        "--max-chunks", str(args.max_chunks), "--max-new-tokens", str(args.max_new_tokens),
+        "--max-edge", str(args.max_edge),
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(f"[{backend}] failed:\n{proc.stderr.strip()[-2000:]}")
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", default=DEFAULT_MEDIA, help="Video file to describe")
+    parser.add_argument("--backends", nargs="+", default=["optimum", "genai"], help="Backends to compare")
+    parser.add_argument("--chunk", type=float, default=4.0, help="Chunk length in seconds")
+    parser.add_argument("--overlap", type=float, default=1.0, help="Chunk overlap in seconds")
+    parser.add_argument("--max-chunks", type=int, default=6, help="Chunks described per backend")
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    parser.add_argument("--max-edge", type=int, default=2048, help="Decode-time downscale (longest edge, px)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    print(f"Media: {args.media}, up to {args.max_chunks} chunks, max_new_tokens={args.max_new_tokens}")
+    rows = [row for row in (run_backend(backend, args) for backend in args.backends) if row]
+    if not rows:
+        return
+
+    print(
+        f"\n{'backend':<10}{'load s':>8}{'RSS load':>10}{'RSS peak':>10}"
+        f"{'1st ms':>9}{'s/chunk':>9}{'prompt tok':>12}"
+    )
+    for row in rows:
+        print(
+            f"{row['backend']:<10}{row['load_seconds']:>8.1f}"
+            f"{row['rss_loaded_mb']:>9.0f}M{row['rss_peak_mb']:>9.0f}M"
+            f"{row['first_piece_ms']:>9.0f}{row['seconds_per_chunk']:>9.2f}{row['prompt_tokens']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
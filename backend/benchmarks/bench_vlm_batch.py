@@ -0,0 +1,85 @@
+"""
+VLM batching benchmark: chunks/sec of describe_frames_batch at different batch sizes.
+
+Chunks follow vision-driven chunking (4s chunks, 1s overlap) over the video,
+sampled at 1 fps, downscaled to the processor's target size and reduced to
+keyframes, as in VLMNode. Frames are decoded once up front so only
+inference is timed. Batch size 1 is the per-chunk describe_frames path.
+
+Usage (from the backend directory, with the SmolVLM2 model available):
+    python -m benchmarks.bench_vlm_batch
+    python -m benchmarks.bench_vlm_batch --batch-sizes 1 2 4 8 --max-chunks 16
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from app.vlm import VLMWrapper
+from app.utils.frame_sampler import get_video_duration, sample_frames_batch
+from app.utils.keyframes import select_keyframes
+from app.utils.pipeline import batched
+from benchmarks.bench_frame_sampler import vision_windows
+
+DEFAULT_MEDIA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "test_media", "YTShorts-GCSEMathPieChart.mp4"
+)
+
+
+def run_case(vlm: VLMWrapper, frame_sets, batch_size: int, max_new_tokens: int) -> dict:
+    start = time.perf_counter()
+    descriptions = []
+    for group in batched(frame_sets, batch_size):
+        if batch_size == 1:
+            descriptions.append(vlm.describe_frames(group[0], max_new_tokens=max_new_tokens))
+        else:
+            descriptions.extend(vlm.describe_frames_batch(group, max_new_tokens=max_new_tokens))
+    seconds = time.perf_counter() - start
+    return {
+        "batch_size": batch_size,
+        "seconds": seconds,
+        "chunks_per_sec": len(frame_sets) / seconds if seconds else 0.0,
+        "descriptions": descriptions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", default=DEFAULT_MEDIA, help="Video file to describe")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4], help="Batch sizes to test")
+    parser.add_argument("--chunk", type=float, default=4.0, help="Chunk length in seconds")
+    parser.add_argument("--overlap", type=float, default=1.0, help="Chunk overlap in seconds")
+    parser.add_argument("--max-chunks", type=int, default=8, help="Chunks described per case")
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    vlm = VLMWrapper()
+    duration = get_video_duration(args.media)
+    windows = vision_windows(duration, args.chunk, args.overlap)[:args.max_chunks]
+    batches = sample_frames_batch(args.media, windows, cache=False, max_edge=vlm.target_long_edge())
+    frame_sets = [[f["image"] for f in select_keyframes(frames)[0]] for frames in batches if frames]
+    print(
+        f"Media: {args.media} ({duration:.1f}s), {len(frame_sets)} chunks, "
+        f"{sum(len(frames) for frames in frame_sets)} keyframes, cores={os.cpu_count()}"
+    )
+
+    # Warm-up (first inference includes compilation / allocation)
+    vlm.describe_frames(frame_sets[0], max_new_tokens=8)
+
+    rows = [run_case(vlm, frame_sets, batch_size, args.max_new_tokens) for batch_size in args.batch_sizes]
+
+    print(f"\n{'batch':>6}{'seconds':>10}{'chunks/s':>10}{'speedup':>9}")
+    base = rows[0]["chunks_per_sec"]
+    for row in rows:
+        print(
+            f"{row['batch_size']:>6}{row['seconds']:>10.2f}{row['chunks_per_sec']:>10.3f}"
+            f"{row['chunks_per_sec'] / base if base else 0.0:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+VLM input benchmark: multi-image prompts (describe_frames) vs the video input path (describe_clip).
+
+Chunks follow vision-driven chunking (4s chunks, 1s overlap) over the video,
+sampled at 1 fps and downscaled to the processor's target size, as in
+VLMNode. Every sampled frame is sent (no keyframe selection) so both modes
+see the same frames. Reports prompt tokens (text + visual) and latency per
+chunk; the description cache is disabled so every call reaches the model.
+
+Usage (from the backend directory, with the SmolVLM2 model available):
+    python -m benchmarks.bench_vlm_clip
+    python -m benchmarks.bench_vlm_clip --max-chunks 4 --max-new-tokens 64
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import time
+
+from app.vlm import VLMWrapper
+from app.utils.frame_sampler import get_video_duration, sample_frames_batch
+from benchmarks.bench_frame_sampler import vision_windows
+
+DEFAULT_MEDIA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "test_media", "YTShorts-GCSEMathPieChart.mp4"
+)
+
+
+def run_case(label: str, describe, vlm: VLMWrapper, frame_sets, max_new_tokens: int) -> dict:
+    latencies, prompt_tokens = [], []
+    for frames in frame_sets:
+        start = time.perf_counter()
+        describe(frames, max_new_tokens=max_new_tokens)
+        latencies.append(time.perf_counter() - start)
+        prompt_tokens.append(vlm.last_usage.get("prompt_tokens", 0))
+    return {
+        "label": label,
+        "latency": statistics.mean(latencies),
+        "prompt_tokens": statistics.mean(prompt_tokens),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--media", default=DEFAULT_MEDIA, help="Video file to describe")
+    parser.add_argument("--chunk", type=float, default=4.0, help="Chunk length in seconds")
+    parser.add_argument("--overlap", type=float, default=1.0, help="Chunk overlap in seconds")
+    parser.add_argument("--max-chunks", type=int, default=6, help="Chunks described per mode")
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    vlm = VLMWrapper(description_cache_enabled=False)
+    duration = get_video_duration(args.media)
+    windows = vision_windows(duration, args.chunk, args.overlap)[:args.max_chunks]
+    batches = sample_frames_batch(args.media, windows, cache=False, max_edge=vlm.target_long_edge())
+    frame_sets = [[f["image"] for f in frames] for frames in batches if frames]
+    print(
+        f"Media: {args.media} ({duration:.1f}s), {len(frame_sets)} chunks, "
+        f"{sum(len(frames) for frames in frame_sets)} frames"
+    )
+
+    # Warm-up (first inference includes compilation / allocation)
+    vlm.describe_frames(frame_sets[0][:1], max_new_tokens=8)
+
+    rows = [
+        run_case("multi-image", vlm.describe_frames, vlm, frame_sets, args.max_new_tokens),
+        run_case("clip", vlm.describe_clip, vlm, frame_sets, args.max_new_tokens),
+    ]
+
+    print(f"\n{'mode':<14}{'prompt tokens':>15}{'s/chunk':>10}")
+    for row in rows:
+        print(f"{row['label']:<14}{row['prompt_tokens']:>15.0f}{row['latency']:>10.2f}")
+    if rows[1]["latency"]:
+        print(f"\nSpeedup: {rows[0]['latency'] / rows[1]['latency']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
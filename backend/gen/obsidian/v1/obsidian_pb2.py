@@ -24,51 +24,51 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1aobsidian/v1/obsidian.proto\x12\x0bobsidian.v1\"v\n\x0b\x43hatRequest\x12\x18\n\x07message\x18\x01 \x01(\tR\x07message\x12\x1d\n\nsession_id\x18\x02 \x01(\tR\tsessionId\x12 \n\tfile_path\x18\x03 \x01(\tH\x00R\x08\x66ilePath\x88\x01\x01\x42\x0c\n\n_file_path\"$\n\x0c\x43hatResponse\x12\x14\n\x05token\x18\x01 \x01(\tR\x05token\"m\n\x07Session\x12\x0e\n\x02id\x18\x01 \x01(\tR\x02id\x12\x14\n\x05title\x18\x02 \x01(\tR\x05title\x12\x1d\n\ncreated_at\x18\x03 \x01(\x03R\tcreatedAt\x12\x1d\n\nupdated_at\x18\x04 \x01(\x03R\tupdatedAt\"\x15\n\x13ListSessionsRequest\"H\n\x14ListSessionsResponse\x12\x30\n\x08sessions\x18\x01 \x03(\x0b\x32\x14.obsidian.v1.SessionR\x08sessions\";\n\x14\x43reateSessionRequest\x12\x19\n\x05title\x18\x01 \x01(\tH\x00R\x05title\x88\x01\x01\x42\x08\n\x06_title\"G\n\x15\x43reateSessionResponse\x12.\n\x07session\x18\x01 \x01(\x0b\x32\x14.obsidian.v1.SessionR\x07session\"5\n\x14\x44\x65leteSessionRequest\x12\x1d\n\nsession_id\x18\x01 \x01(\tR\tsessionId\"\x17\n\x15\x44\x65leteSessionResponse\"R\n\x14RenameSessionRequest\x12\x1d\n\nsession_id\x18\x01 \x01(\tR\tsessionId\x12\x1b\n\tnew_title\x18\x02 \x01(\tR\x08newTitle\"G\n\x15RenameSessionResponse\x12.\n\x07session\x18\x01 \x01(\x0b\x32\x14.obsidian.v1.SessionR\x07session\"i\n\x0b\x43hatMessage\x12\x0e\n\x02id\x18\x01 \x01(\tR\x02id\x12\x12\n\x04role\x18\x02 \x01(\tR\x04role\x12\x18\n\x07\x63ontent\x18\x03 \x01(\tR\x07\x63ontent\x12\x1c\n\ttimestamp\x18\x04 \x01(\x03R\ttimestamp\"2\n\x11GetHistoryRequest\x12\x1d\n\nsession_id\x18\x01 \x01(\tR\tsessionId\"J\n\x12GetHistoryResponse\x12\x34\n\x08messages\x18\x01 \x03(\x0b\x32\x18.obsidian.v1.ChatMessageR\x08messages\"\x14\n\x12HealthCheckRequest\"-\n\x13HealthCheckResponse\x12\x16\n\x06status\x18\x01 \x01(\tR\x06status2L\n\x0b\x43hatService\x12=\n\x04\x43hat\x12\x18.obsidian.v1.ChatRequest\x1a\x19.obsidian.v1.ChatResponse0\x01\x32\xed\x02\n\x0eSessionService\x12S\n\x0cListSessions\x12 .obsidian.v1.ListSessionsRequest\x1a!.obsidian.v1.ListSessionsResponse\x12V\n\rCreateSession\x12!.obsidian.v1.CreateSessionRequest\x1a\".obsidian.v1.CreateSessionResponse\x12V\n\rDeleteSession\x12!.obsidian.v1.DeleteSessionRequest\x1a\".obsidian.v1.DeleteSessionResponse\x12V\n\rRenameSession\x12!.obsidian.v1.RenameSessionRequest\x1a\".obsidian.v1.RenameSessionResponse2_\n\x0eHistoryService\x12M\n\nGetHistory\x12\x1e.obsidian.v1.GetHistoryRequest\x1a\x1f.obsidian.v1.GetHistoryResponse2[\n\rHealthService\x12J\n\x05\x43heck\x12\x1f.obsidian.v1.HealthCheckRequest\x1a .obsidian.v1.HealthCheckResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1aobsidian/v1/obsidian.proto\x12\x0bobsidian.v1\"\xac\x01\n\x0b\x43hatRequest\x12\x18\n\x07message\x18\x01 \x01(\tR\x07message\x12\x1d\n\nsession_id\x18\x02 \x01(\tR\tsessionId\x12 \n\tfile_path\x18\x03 \x01(\tH\x00R\x08\x66ilePath\x88\x01\x01\x12$\n\x0bvlm_profile\x18\x04 \x01(\tH\x01R\nvlmProfile\x88\x01\x01\x42\x0c\n\n_file_pathB\x0e\n\x0c_vlm_profile\"$\n\x0c\x43hatResponse\x12\x14\n\x05token\x18\x01 \x01(\tR\x05token\"m\n\x07Session\x12\x0e\n\x02id\x18\x01 \x01(\tR\x02id\x12\x14\n\x05title\x18\x02 \x01(\tR\x05title\x12\x1d\n\ncreated_at\x18\x03 \x01(\x03R\tcreatedAt\x12\x1d\n\nupdated_at\x18\x04 \x01(\x03R\tupdatedAt\"\x15\n\x13ListSessionsRequest\"H\n\x14ListSessionsResponse\x12\x30\n\x08sessions\x18\x01 \x03(\x0b\x32\x14.obsidian.v1.SessionR\x08sessions\";\n\x14\x43reateSessionRequest\x12\x19\n\x05title\x18\x01 \x01(\tH\x00R\x05title\x88\x01\x01\x42\x08\n\x06_title\"G\n\x15\x43reateSessionResponse\x12.\n\x07session\x18\x01 \x01(\x0b\x32\x14.obsidian.v1.SessionR\x07session\"5\n\x14\x44\x65leteSessionRequest\x12\x1d\n\nsession_id\x18\x01 \x01(\tR\tsessionId\"\x17\n\x15\x44\x65leteSessionResponse\"R\n\x14RenameSessionRequest\x12\x1d\n\nsession_id\x18\x01 \x01(\tR\tsessionId\x12\x1b\n\tnew_title\x18\x02 \x01(\tR\x08newTitle\"G\n\x15RenameSessionResponse\x12.\n\x07session\x18\x01 \x01(\x0b\x32\x14.obsidian.v1.SessionR\x07session\"i\n\x0b\x43hatMessage\x12\x0e\n\x02id\x18\x01 \x01(\tR\x02id\x12\x12\n\x04role\x18\x02 \x01(\tR\x04role\x12\x18\n\x07\x63ontent\x18\x03 \x01(\tR\x07\x63ontent\x12\x1c\n\ttimestamp\x18\x04 \x01(\x03R\ttimestamp\"2\n\x11GetHistoryRequest\x12\x1d\n\nsession_id\x18\x01 \x01(\tR\tsessionId\"J\n\x12GetHistoryResponse\x12\x34\n\x08messages\x18\x01 \x03(\x0b\x32\x18.obsidian.v1.ChatMessageR\x08messages\"\x14\n\x12HealthCheckRequest\"-\n\x13HealthCheckResponse\x12\x16\n\x06status\x18\x01 \x01(\tR\x06status2L\n\x0b\x43hatService\x12=\n\x04\x43hat\x12\x18.obsidian.v1.ChatRequest\x1a\x19.obsidian.v1.ChatResponse0\x01\x32\xed\x02\n\x0eSessionService\x12S\n\x0cListSessions\x12 .obsidian.v1.ListSessionsRequest\x1a!.obsidian.v1.ListSessionsResponse\x12V\n\rCreateSession\x12!.obsidian.v1.CreateSessionRequest\x1a\".obsidian.v1.CreateSessionResponse\x12V\n\rDeleteSession\x12!.obsidian.v1.DeleteSessionRequest\x1a\".obsidian.v1.DeleteSessionResponse\x12V\n\rRenameSession\x12!.obsidian.v1.RenameSessionRequest\x1a\".obsidian.v1.RenameSessionResponse2_\n\x0eHistoryService\x12M\n\nGetHistory\x12\x1e.obsidian.v1.GetHistoryRequest\x1a\x1f.obsidian.v1.GetHistoryResponse2[\n\rHealthService\x12J\n\x05\x43heck\x12\x1f.obsidian.v1.HealthCheckRequest\x1a .obsidian.v1.HealthCheckResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'obsidian.v1.obsidian_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_CHATREQUEST']._serialized_start=43
-  _globals['_CHATREQUEST']._serialized_end=161
-  _globals['_CHATRESPONSE']._serialized_start=163
-  _globals['_CHATRESPONSE']._serialized_end=199
-  _globals['_SESSION']._serialized_start=201
-  _globals['_SESSION']._serialized_end=310
-  _globals['_LISTSESSIONSREQUEST']._serialized_start=312
-  _globals['_LISTSESSIONSREQUEST']._serialized_end=333
-  _globals['_LISTSESSIONSRESPONSE']._serialized_start=335
-  _globals['_LISTSESSIONSRESPONSE']._serialized_end=407
-  _globals['_CREATESESSIONREQUEST']._serialized_start=409
-  _globals['_CREATESESSIONREQUEST']._serialized_end=468
-  _globals['_CREATESESSIONRESPONSE']._serialized_start=470
-  _globals['_CREATESESSIONRESPONSE']._serialized_end=541
-  _globals['_DELETESESSIONREQUEST']._serialized_start=543
-  _globals['_DELETESESSIONREQUEST']._serialized_end=596
-  _globals['_DELETESESSIONRESPONSE']._serialized_start=598
-  _globals['_DELETESESSIONRESPONSE']._serialized_end=621
-  _globals['_RENAMESESSIONREQUEST']._serialized_start=623
-  _globals['_RENAMESESSIONREQUEST']._serialized_end=705
-  _globals['_RENAMESESSIONRESPONSE']._serialized_start=707
-  _globals['_RENAMESESSIONRESPONSE']._serialized_end=778
-  _globals['_CHATMESSAGE']._serialized_start=780
-  _globals['_CHATMESSAGE']._serialized_end=885
-  _globals['_GETHISTORYREQUEST']._serialized_start=887
-  _globals['_GETHISTORYREQUEST']._serialized_end=937
-  _globals['_GETHISTORYRESPONSE']._serialized_start=939
-  _globals['_GETHISTORYRESPONSE']._serialized_end=1013
-  _globals['_HEALTHCHECKREQUEST']._serialized_start=1015
-  _globals['_HEALTHCHECKREQUEST']._serialized_end=1035
-  _globals['_HEALTHCHECKRESPONSE']._serialized_start=1037
-  _globals['_HEALTHCHECKRESPONSE']._serialized_end=1082
-  _globals['_CHATSERVICE']._serialized_start=1084
-  _globals['_CHATSERVICE']._serialized_end=1160
-  _globals['_SESSIONSERVICE']._serialized_start=1163
-  _globals['_SESSIONSERVICE']._serialized_end=1528
-  _globals['_HISTORYSERVICE']._serialized_start=1530
-  _globals['_HISTORYSERVICE']._serialized_end=1625
-  _globals['_HEALTHSERVICE']._serialized_start=1627
-  _globals['_HEALTHSERVICE']._serialized_end=1718
+  _globals['_CHATREQUEST']._serialized_start=44
+  _globals['_CHATREQUEST']._serialized_end=216
+  _globals['_CHATRESPONSE']._serialized_start=218
+  _globals['_CHATRESPONSE']._serialized_end=254
+  _globals['_SESSION']._serialized_start=256
+  _globals['_SESSION']._serialized_end=365
+  _globals['_LISTSESSIONSREQUEST']._serialized_start=367
+  _globals['_LISTSESSIONSREQUEST']._serialized_end=388
+  _globals['_LISTSESSIONSRESPONSE']._serialized_start=390
+  _globals['_LISTSESSIONSRESPONSE']._serialized_end=462
+  _globals['_CREATESESSIONREQUEST']._serialized_start=464
+  _globals['_CREATESESSIONREQUEST']._serialized_end=523
+  _globals['_CREATESESSIONRESPONSE']._serialized_start=525
+  _globals['_CREATESESSIONRESPONSE']._serialized_end=596
+  _globals['_DELETESESSIONREQUEST']._serialized_start=598
+  _globals['_DELETESESSIONREQUEST']._serialized_end=651
+  _globals['_DELETESESSIONRESPONSE']._serialized_start=653
+  _globals['_DELETESESSIONRESPONSE']._serialized_end=676
+  _globals['_RENAMESESSIONREQUEST']._serialized_start=678
+  _globals['_RENAMESESSIONREQUEST']._serialized_end=760
+  _globals['_RENAMESESSIONRESPONSE']._serialized_start=762
+  _globals['_RENAMESESSIONRESPONSE']._serialized_end=833
+  _globals['_CHATMESSAGE']._serialized_start=835
+  _globals['_CHATMESSAGE']._serialized_end=940
+  _globals['_GETHISTORYREQUEST']._serialized_start=942
+  _globals['_GETHISTORYREQUEST']._serialized_end=992
+  _globals['_GETHISTORYRESPONSE']._serialized_start=994
+  _globals['_GETHISTORYRESPONSE']._serialized_end=1068
+  _globals['_HEALTHCHECKREQUEST']._serialized_start=1070
+  _globals['_HEALTHCHECKREQUEST']._serialized_end=1090
+  _globals['_HEALTHCHECKRESPONSE']._serialized_start=1092
+  _globals['_HEALTHCHECKRESPONSE']._serialized_end=1137
+  _globals['_CHATSERVICE']._serialized_start=1139
+  _globals['_CHATSERVICE']._serialized_end=1215
+  _globals['_SESSIONSERVICE']._serialized_start=1218
+  _globals['_SESSIONSERVICE']._serialized_end=1583
+  _globals['_HISTORYSERVICE']._serialized_start=1585
+  _globals['_HISTORYSERVICE']._serialized_end=1680
+  _globals['_HEALTHSERVICE']._serialized_start=1682
+  _globals['_HEALTHSERVICE']._serialized_end=1773
 # @@protoc_insertion_point(module_scope)
@@ -11,10 +11,12 @@ class ChatRequest(_message.Message):
     MESSAGE_FIELD_NUMBER: _ClassVar[int]
     SESSION_ID_FIELD_NUMBER: _ClassVar[int]
     FILE_PATH_FIELD_NUMBER: _ClassVar[int]
+    VLM_PROFILE_FIELD_NUMBER: _ClassVar[int]
     message: str
     session_id: str
     file_path: str
-    def __init__(self, message: _Optional[str] = ..., session_id: _Optional[str] = ..., file_path: _Optional[str] = ...) -> None: ...
+    vlm_profile: str
+    def __init__(self, message: _Optional[str] = ..., session_id: _Optional[str] = ..., file_path: _Optional[str] = ..., vlm_profile: _Optional[str] = ...) -> None: ...
 
 class ChatResponse(_message.Message):
     __slots__ = ()
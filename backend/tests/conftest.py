@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the backend as `app` (run from the backend directory or the repo root)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
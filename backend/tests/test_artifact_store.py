@@ -0,0 +1,92 @@
+import os
+import time
+
+import pytest
+
+from app.utils.artifact_store import EVICT_LOW_WATER, TMP_MARKER, ArtifactStore
+
+
+def make_store(tmp_path, max_bytes: int) -> ArtifactStore:
+    return ArtifactStore(root=str(tmp_path / "artifacts"), max_bytes=max_bytes)
+
+
+def test_empty_store(tmp_path):
+    store = make_store(tmp_path, 1000)
+    assert store.evict() == 0
+    assert store.lookup("m", "audio") is None
+    store.invalidate("m", "audio")
+    store.invalidate_media("m")
+    assert store.stats()["bytes"] == 0
+    assert store.stats()["misses"] == 1
+
+
+def test_round_trip_and_params(tmp_path):
+    store = make_store(tmp_path, 10_000)
+    path = store.put_bytes("m", "audio", b"pcm", params={"sr": 16000}, suffix=".wav")
+    assert store.lookup("m", "audio", params={"sr": 16000}, suffix=".wav") == path
+    assert store.lookup("m", "audio", params={"sr": 8000}, suffix=".wav") is None
+    with open(path, "rb") as f:
+        assert f.read() == b"pcm"
+    assert store.stats()["bytes"] == 3
+
+
+def test_budget_zero_keeps_nothing(tmp_path):
+    store = make_store(tmp_path, 0)
+    for i in range(3):
+        store.put_bytes("m", "frames", b"x" * 100, params={"i": i})
+    stats = store.stats()
+    assert stats["bytes"] == 0
+    assert stats["evictions"] == 3
+    assert store.lookup("m", "frames", params={"i": 0}) is None
+
+
+def test_evicts_least_recently_used_down_to_low_water(tmp_path):
+    store = make_store(tmp_path, 1000)
+    for i in range(10):
+        store.put_bytes("m", "frames", b"x" * 100, params={"i": i})
+        time.sleep(0.01)
+    # Touch the oldest artifact so it becomes the most recently used
+    assert store.lookup("m", "frames", params={"i": 0})
+    store.put_bytes("m", "frames", b"x" * 100, params={"i": 10})
+
+    assert store.stats()["bytes"] <= 1000 * EVICT_LOW_WATER
+    assert store.lookup("m", "frames", params={"i": 0}) is not None
+    assert store.lookup("m", "frames", params={"i": 1}) is None
+    assert store.lookup("m", "frames", params={"i": 10}) is not None
+
+
+def test_failed_write_is_discarded(tmp_path):
+    store = make_store(tmp_path, 1000)
+    with pytest.raises(RuntimeError):
+        with store.writer("m", "audio", suffix=".wav") as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("ffmpeg failed")
+    assert store.lookup("m", "audio", suffix=".wav") is None
+    assert os.listdir(os.path.join(store.root, "audio", "m")) == []
+
+
+def test_index_rebuilt_on_startup(tmp_path):
+    store = make_store(tmp_path, 1000)
+    store.put_bytes("m", "audio", b"x" * 10)
+    store.put_bytes("n", "frames", b"x" * 20)
+    # Leftover temp files from an interrupted write are not counted
+    with open(os.path.join(store.root, "audio", "m", f"abc{TMP_MARKER}1234"), "wb") as f:
+        f.write(b"x" * 500)
+
+    reopened = make_store(tmp_path, 1000)
+    assert reopened.stats()["bytes"] == 30
+    reopened.invalidate_media("m")
+    assert reopened.stats()["bytes"] == 20
+
+
+def test_invalidate_media(tmp_path):
+    store = make_store(tmp_path, 1000)
+    store.put_bytes("m", "audio", b"x" * 10)
+    store.put_bytes("m", "frames", b"x" * 10)
+    store.put_bytes("n", "frames", b"x" * 20)
+    store.invalidate_media("m")
+    assert store.lookup("m", "audio") is None
+    assert store.lookup("m", "frames") is None
+    assert store.lookup("n", "frames") is not None
+    assert store.stats()["bytes"] == 20
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from app.utils.audio_features import split_on_silence
+
+SR = 16000
+
+
+def assert_covers(windows, total):
+    assert windows[0][0] == 0
+    assert windows[-1][1] == total
+    for (_, end), (start, _) in zip(windows, windows[1:]):
+        assert end == start
+
+
+def test_empty_input():
+    assert split_on_silence(np.zeros(0, dtype=np.float32), SR) == [(0, 0)]
+
+
+def test_shorter_than_one_window():
+    audio = np.ones(10 * SR, dtype=np.float32)
+    assert split_on_silence(audio, SR, window_seconds=60.0) == [(0, len(audio))]
+
+
+def test_zero_window():
+    audio = np.ones(10 * SR, dtype=np.float32)
+    assert split_on_silence(audio, SR, window_seconds=0.0) == [(0, len(audio))]
+
+
+def test_all_silence():
+    audio = np.zeros(100 * SR, dtype=np.float32)
+    windows = split_on_silence(audio, SR, window_seconds=20.0, search_seconds=5.0)
+    assert_covers(windows, len(audio))
+    assert all(end - start >= 10 * SR for start, end in windows)
+
+
+def test_cuts_at_quiet_point():
+    rng = np.random.default_rng(0)
+    audio = rng.normal(0, 0.3, 50 * SR).astype(np.float32)
+    audio[22 * SR:int(22.5 * SR)] = 0.0
+    windows = split_on_silence(audio, SR, window_seconds=20.0, search_seconds=5.0)
+    assert_covers(windows, len(audio))
+    assert 22 * SR <= windows[0][1] <= int(22.5 * SR)
+
+
+@pytest.mark.parametrize("search_seconds", [5.0, 15.0, 40.0])
+def test_windows_at_least_half_a_window(search_seconds):
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        total = int(rng.uniform(21, 200) * SR)
+        audio = rng.normal(0, 0.3, total).astype(np.float32)
+        # Quiet spots at random places (the search jumps to them if in range)
+        for spot in rng.integers(0, total - SR, 5):
+            audio[spot:spot + SR // 10] = 0.0
+        windows = split_on_silence(audio, SR, window_seconds=20.0, search_seconds=search_seconds)
+        assert_covers(windows, total)
+        assert all(end - start >= 10 * SR for start, end in windows)
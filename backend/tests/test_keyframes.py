@@ -0,0 +1,60 @@
+import numpy as np
+
+from app.utils.keyframes import select_keyframes
+
+
+def frame(value: int, timestamp: float = 0.0, size=(120, 160)) -> dict:
+    return {"timestamp": timestamp, "image": np.full((*size, 3), value, dtype=np.uint8)}
+
+
+def test_empty_input():
+    kept, stats = select_keyframes([])
+    assert kept == []
+    assert stats == {"sampled": 0, "kept": 0, "dropped": 0}
+
+
+def test_single_frame():
+    frames = [frame(10)]
+    kept, stats = select_keyframes(frames)
+    assert kept == frames
+    assert stats["dropped"] == 0
+
+
+def test_static_frames_collapse_to_one():
+    frames = [frame(128, t) for t in range(8)]
+    kept, stats = select_keyframes(frames)
+    assert [f["timestamp"] for f in kept] == [0]
+    assert stats == {"sampled": 8, "kept": 1, "dropped": 7}
+
+
+def test_distinct_frames_are_kept_in_order():
+    frames = [frame(value, t) for t, value in enumerate([0, 0, 200, 200, 50])]
+    kept, _ = select_keyframes(frames)
+    assert [f["timestamp"] for f in kept] == [0, 2, 4]
+
+
+def test_local_change_is_kept():
+    # A small edit on an otherwise static slide (e.g. a line of handwriting)
+    edited = frame(255, 1)
+    edited["image"][40:44, 20:100] = 0
+    kept, _ = select_keyframes([frame(255, 0), edited])
+    assert len(kept) == 2
+
+
+def test_min_and_max_bounds():
+    static = [frame(128, t) for t in range(6)]
+    kept, _ = select_keyframes(static, min_frames=3)
+    assert len(kept) == 3
+    assert [f["timestamp"] for f in kept] == sorted(f["timestamp"] for f in kept)
+
+    changing = [frame(value, t) for t, value in enumerate(range(0, 250, 25))]
+    kept, stats = select_keyframes(changing, max_frames=4)
+    assert len(kept) == 4
+    assert kept[0]["timestamp"] == 0
+    assert stats["dropped"] == len(changing) - 4
+
+
+def test_grayscale_frames():
+    frames = [{"timestamp": t, "image": np.full((64, 64), 100, dtype=np.uint8)} for t in range(3)]
+    kept, _ = select_keyframes(frames)
+    assert len(kept) == 1
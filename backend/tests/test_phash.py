@@ -0,0 +1,142 @@
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from app.utils import phash
+from app.utils.phash import (
+    HASH_BITS, NUM_BANDS, PerceptualHashIndex, _bands, dhash, frame_sets_match, hamming, speech_key
+)
+
+
+def flip_bits(value: int, bits) -> int:
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PerceptualHashIndex(db_path=str(tmp_path / "visual.db"), max_distance=3)
+
+
+def test_bands_round_trip():
+    value = random.Random(0).getrandbits(HASH_BITS)
+    bands = _bands(value)
+    assert len(bands) == NUM_BANDS
+    assert sum(band << (i * 8) for i, band in enumerate(bands)) == value
+
+
+def test_dhash_of_flat_frame_is_zero():
+    assert dhash(np.full((90, 160, 3), 77, dtype=np.uint8)) == 0
+
+
+def test_dhash_grayscale_matches_rgb():
+    gray = np.tile(np.arange(160, dtype=np.uint8), (90, 1))
+    assert dhash(gray) == dhash(np.stack([gray] * 3, axis=2))
+
+
+def test_frame_sets_match_empty():
+    assert not frame_sets_match([], [1], 3)
+    assert not frame_sets_match([1], [], 3)
+
+
+def test_lookup_empty(index):
+    assert index.lookup("ctx", []) is None
+    assert index.lookup("ctx", [123]) is None
+    index.store("ctx", [], "ignored")
+    assert index.stats()["lookups"] == 1
+
+
+def test_match_within_distance(index):
+    rng = random.Random(1)
+    for _ in range(50):
+        stored = rng.getrandbits(HASH_BITS)
+        probe = flip_bits(stored, rng.sample(range(HASH_BITS), rng.randint(0, 3)))
+        index.store("ctx", [stored], f"desc {stored}")
+        match = index.lookup("ctx", [probe])
+        assert match is not None and match["description"] == f"desc {stored}"
+
+
+def test_worst_case_bands_still_found(index):
+    # Every flipped bit in a different band: the candidate shares only NUM_BANDS - 3 bands
+    stored = random.Random(2).getrandbits(HASH_BITS)
+    probe = flip_bits(stored, [0, 8, 16])
+    assert sum(a != b for a, b in zip(_bands(stored), _bands(probe))) == 3
+    index.store("ctx", [stored], "slide")
+    assert index.lookup("ctx", [probe])["description"] == "slide"
+
+
+def test_no_match_beyond_distance_or_context(index):
+    stored = random.Random(3).getrandbits(HASH_BITS)
+    index.store("ctx", [stored], "slide", media_id="m", start_time=1.0, end_time=2.0)
+    assert index.lookup("ctx", [flip_bits(stored, [0, 8, 16, 24])]) is None
+    assert index.lookup("other", [stored]) is None
+    assert index.lookup("ctx", [stored]) == {"description": "slide", "media_id": "m", "start_time": 1.0, "end_time": 2.0}
+
+
+def test_whole_frame_set_must_match(index):
+    rng = random.Random(4)
+    a, b = rng.getrandbits(HASH_BITS), rng.getrandbits(HASH_BITS)
+    index.store("ctx", [a, b], "two frames")
+    assert index.lookup("ctx", [a]) is None
+    assert index.lookup("ctx", [a, b, a])["description"] == "two frames"
+    assert hamming(a, b) > 3
+
+
+def test_max_distance_is_clamped(tmp_path):
+    index = PerceptualHashIndex(db_path=str(tmp_path / "visual.db"), max_distance=NUM_BANDS)
+    assert index.max_distance == NUM_BANDS - 1
+
+
+def test_speech_key_ignores_case_punctuation_and_spacing():
+    assert speech_key("Now click  Save.") == speech_key("now, click save")
+    assert speech_key("now click save") != speech_key("now click cancel")
+    assert speech_key(None) == speech_key("  ") == ""
+
+
+def test_description_reused_only_for_same_speech(index):
+    stored = random.Random(5).getrandbits(HASH_BITS)
+    index.store("ctx", [stored], "slide while saving", asr_text="Now click Save.")
+    index.store("ctx", [stored], "slide, no speech")
+    assert index.lookup("ctx", [stored], "now click save")["description"] == "slide while saving"
+    assert index.lookup("ctx", [stored], "now click cancel") is None
+    assert index.lookup("ctx", [stored])["description"] == "slide, no speech"
+
+
+def test_least_recently_used_entries_evicted(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr(phash.time, "time", lambda: next(clock))
+    index = PerceptualHashIndex(db_path=str(tmp_path / "visual.db"), max_distance=3, max_entries=10)
+    hashes = [random.Random(i).getrandbits(HASH_BITS) for i in range(11)]
+    for i, h in enumerate(hashes[:10]):
+        index.store("ctx", [h], f"desc {i}")
+    assert index.lookup("ctx", [hashes[0]]) is not None  # refreshes entry 0
+    index.store("ctx", [hashes[10]], "desc 10")
+
+    stats = index.stats()
+    assert stats["entries"] == 9 and stats["evictions"] == 2
+    assert index.lookup("ctx", [hashes[0]]) is not None
+    assert index.lookup("ctx", [hashes[1]]) is None
+    assert index.lookup("ctx", [hashes[2]]) is None
+    assert index.lookup("ctx", [hashes[10]]) is not None
+
+    reopened = PerceptualHashIndex(db_path=str(tmp_path / "visual.db"), max_distance=3, max_entries=10)
+    assert reopened.stats()["entries"] == 9
+
+
+def test_index_from_old_key_format_is_rebuilt(tmp_path):
+    path = str(tmp_path / "visual.db")
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "CREATE TABLE visual_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, context_key TEXT NOT NULL, "
+            "media_id TEXT, start_time REAL, end_time REAL, hashes TEXT NOT NULL, description TEXT NOT NULL, "
+            "created_at INTEGER NOT NULL)"
+        )
+        db.execute("INSERT INTO visual_entries (context_key, hashes, description, created_at) VALUES ('k', '[]', 'd', 0)")
+    db.close()
+    index = PerceptualHashIndex(db_path=path, max_distance=3)
+    assert index.stats()["entries"] == 0
+    index.store("ctx", [1], "slide")
+    assert index.lookup("ctx", [1])["description"] == "slide"
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from app.utils.pipeline import StagePipeline, batched
+
+
+@pytest.fixture(params=[0, 1, 3], ids=["inline", "prefetch1", "prefetch3"])
+def prefetch(request):
+    return request.param
+
+
+def test_batched():
+    assert list(batched([], 3)) == []
+    assert list(batched(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_empty_stages():
+    with pytest.raises(ValueError):
+        StagePipeline([])
+
+
+def test_empty_source(prefetch):
+    pipeline = StagePipeline([("double", lambda x: 2 * x)], prefetch=prefetch)
+    assert list(pipeline.run([])) == []
+    assert pipeline.stats()["stages"]["double"]["items"] == 0
+
+
+def test_order_and_stats(prefetch):
+    pipeline = StagePipeline([("add", lambda x: x + 1), ("square", lambda x: x * x)], prefetch=prefetch, source_name="decode")
+    assert list(pipeline.run(range(20))) == [(x + 1) ** 2 for x in range(20)]
+    stats = pipeline.stats()["stages"]
+    assert list(stats) == ["decode", "add", "square"]
+    assert all(stage["items"] == 20 for stage in stats.values())
+    assert "decode" in pipeline.format_stats()
+
+
+def test_stage_error_is_raised(prefetch):
+    def fail_on_three(x):
+        if x == 3:
+            raise RuntimeError("bad item")
+        return x
+
+    pipeline = StagePipeline([("check", fail_on_three), ("identity", lambda x: x)], prefetch=prefetch)
+    results = []
+    with pytest.raises(RuntimeError, match="bad item"):
+        for item in pipeline.run(range(10)):
+            results.append(item)
+    assert results == [0, 1, 2]
+
+
+def test_source_error_is_raised(prefetch):
+    def source():
+        yield 1
+        raise OSError("decode failed")
+
+    pipeline = StagePipeline([("identity", lambda x: x)], prefetch=prefetch)
+    with pytest.raises(OSError, match="decode failed"):
+        list(pipeline.run(source()))
+
+
+def test_early_close_stops_workers(prefetch):
+    closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            closed.set()
+
+    pipeline = StagePipeline([("a", lambda x: x), ("b", lambda x: x)], prefetch=prefetch)
+    results = pipeline.run(source())
+    assert next(results) == 0
+    results.close()
+    assert closed.wait(timeout=5)
+    assert not any(t.name.startswith("pipeline-") for t in threading.enumerate())
@@ -0,0 +1,56 @@
+import random
+from typing import Dict
+
+import pytest
+
+from app.utils.repetition import detect_repeated_phrases
+
+
+def reference_detect(text: str, min_phrase_words: int = 3, min_repeats: int = 3) -> Dict[str, int]:
+    """The original n-gram detector from ASRNode (3-6 word phrases)."""
+    words = text.lower().split()
+    phrase_counts = {}
+    for phrase_len in range(min_phrase_words, min(7, len(words) + 1)):
+        for i in range(len(words) - phrase_len + 1):
+            phrase = " ".join(words[i:i + phrase_len])
+            phrase_counts[phrase] = phrase_counts.get(phrase, 0) + 1
+
+    repeated = {phrase: count for phrase, count in phrase_counts.items() if count >= min_repeats}
+
+    filtered = {}
+    for phrase, count in sorted(repeated.items(), key=lambda x: -len(x[0])):
+        if not any(phrase in longer and filtered[longer] >= count for longer in filtered):
+            filtered[phrase] = count
+    return filtered
+
+
+@pytest.mark.parametrize("vocab", [["a", "b"], ["a", "b", "c"], ["x", "y", "z", "w"], ["the", "cat", "sat"]])
+def test_matches_reference_on_small_vocabularies(vocab):
+    rng = random.Random(len(vocab))
+    for _ in range(500):
+        text = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 40)))
+        assert detect_repeated_phrases(text) == reference_detect(text), text
+
+
+def test_matches_reference_with_other_thresholds():
+    rng = random.Random(7)
+    for _ in range(300):
+        text = " ".join(rng.choice("abc") for _ in range(rng.randint(0, 30)))
+        for min_words, min_repeats in [(2, 2), (3, 4), (4, 2)]:
+            assert detect_repeated_phrases(text, min_words, min_repeats) == reference_detect(text, min_words, min_repeats)
+
+
+def test_hallucination_loop():
+    text = "so today we will " + "thank you for watching " * 5
+    repeated = detect_repeated_phrases(text)
+    assert repeated["thank you for watching"] == 5
+    assert repeated == reference_detect(text)
+
+
+@pytest.mark.parametrize("text", ["", "   ", "one two", "one two three"])
+def test_short_input(text):
+    assert detect_repeated_phrases(text) == {}
+
+
+def test_max_phrase_words_below_min():
+    assert detect_repeated_phrases("a b c " * 5, min_phrase_words=4, max_phrase_words=3) == {}
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from app.utils.vad import MAX_GAP, SpeechMap, compress_silence
+
+SR = 16000
+
+
+def tone(seconds: float, freq: float = 220.0) -> np.ndarray:
+    """Harmonic signal: loud and spectrally peaked, so the VAD treats it as speech."""
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.3 * np.sin(2 * np.pi * freq * t) + 0.1 * np.sin(2 * np.pi * 3 * freq * t)).astype(np.float32)
+
+
+def silence(seconds: float) -> np.ndarray:
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+
+def test_empty_input():
+    compressed, speech_map = compress_silence(np.zeros(0, dtype=np.float32), SR)
+    assert len(compressed) == 0
+    assert speech_map.speech_ratio == 0.0
+    assert speech_map.compressed_samples == 0
+    # No kept spans: timestamps pass through unchanged
+    assert speech_map.to_original(1.5) == 1.5
+    assert speech_map.to_compressed(1.5) == 1.5
+
+
+def test_all_silence():
+    compressed, speech_map = compress_silence(silence(5.0), SR)
+    assert len(compressed) == 0
+    assert speech_map.speech_ratio == 0.0
+    assert speech_map.stats()["vad_original_seconds"] == 5.0
+    assert speech_map.stats()["vad_kept_seconds"] == 0.0
+
+
+def test_long_gap_is_shortened():
+    audio = np.concatenate([tone(2.0), silence(10.0), tone(2.0)])
+    compressed, speech_map = compress_silence(audio, SR)
+    assert speech_map.compressed_samples == len(compressed)
+    assert len(compressed) < len(audio) - 8 * SR
+    # Both speech regions survive; the gap between them is at most MAX_GAP + padding on each side
+    assert len(compressed) >= 4 * SR
+    assert len(compressed) <= (4.0 + MAX_GAP + 2 * 0.2 + 0.1) * SR
+
+
+def test_timestamps_round_trip():
+    audio = np.concatenate([silence(3.0), tone(2.0), silence(10.0), tone(2.0), silence(3.0)])
+    _, speech_map = compress_silence(audio, SR)
+    for original in [3.5, 4.5, 15.5, 16.5]:
+        assert speech_map.to_original(speech_map.to_compressed(original)) == pytest.approx(original, abs=1e-3)
+
+
+def test_remap_chunks_at_span_boundary():
+    speech_map = SpeechMap(
+        sample_rate=SR,
+        original_starts=np.array([0, 10 * SR]),
+        compressed_starts=np.array([0, 2 * SR]),
+        lengths=np.array([2 * SR, 2 * SR]),
+        total_samples=12 * SR,
+        speech_samples=4 * SR,
+    )
+    # A segment ending exactly at the boundary stays in the first span; one starting there moves to the second
+    chunks = speech_map.remap_chunks([{"start": 0.5, "end": 2.0, "text": "a"}, {"start": 2.0, "end": 3.0, "text": "b"}])
+    assert (chunks[0]["start"], chunks[0]["end"]) == (0.5, 2.0)
+    assert (chunks[1]["start"], chunks[1]["end"]) == (10.0, 11.0)
+    assert chunks[1]["text"] == "b"
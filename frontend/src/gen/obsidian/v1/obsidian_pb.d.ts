@@ -27,6 +27,13 @@ export declare class ChatRequest extends Message<ChatRequest> {
    */
   filePath?: string;
 
+  /**
+   * VLM profile for ingesting file_path (quality / balanced / fast)
+   *
+   * @generated from field: optional string vlm_profile = 4;
+   */
+  vlmProfile?: string;
+
   constructor(data?: PartialMessage<ChatRequest>);
 
   static readonly runtime: typeof proto3;
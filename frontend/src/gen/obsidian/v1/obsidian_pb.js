@@ -14,6 +14,7 @@ export const ChatRequest = /*@__PURE__*/ proto3.makeMessageType(
     { no: 1, name: "message", kind: "scalar", T: 9 /* ScalarType.STRING */ },
     { no: 2, name: "session_id", kind: "scalar", T: 9 /* ScalarType.STRING */ },
     { no: 3, name: "file_path", kind: "scalar", T: 9 /* ScalarType.STRING */, opt: true },
+    { no: 4, name: "vlm_profile", kind: "scalar", T: 9 /* ScalarType.STRING */, opt: true },
   ],
 );
 